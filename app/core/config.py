@@ -18,6 +18,16 @@ class Settings(BaseSettings):
     PROJECT_ROOT: Path = Path(__file__).parent.parent.parent
     OUTPUT_DIR: Path = PROJECT_ROOT / "output"
     LOG_FILE: Path = PROJECT_ROOT / "logs/scraper.log"
+    # Logging: rotación por tamaño (o por tiempo si LOG_ROTATE_WHEN, p.ej.
+    # "midnight"), archivos rotados comprimidos y formato JSON opcional
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = False
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 14
+    LOG_ROTATE_WHEN: str = ""
+    LOG_COMPRESS: bool = True
+    # Formato de salida: json, json-pretty, json.gz, ndjson o ndjson.gz
+    OUTPUT_FORMAT: str = "json"
     
     # Configuración del scraper
     CALLS_PER_SECOND: float = 0.2
@@ -27,13 +37,64 @@ class Settings(BaseSettings):
     MAX_PAGE_DELAY: float = 6.0
     MIN_DOMAIN_DELAY: float = 8.0
     MAX_DOMAIN_DELAY: float = 12.0
+    # Estado de los limitadores compartidos entre procesos del host
+    RATE_LIMIT_STATE_DIR: Path = OUTPUT_DIR / ".ratelimit"
     
     # Configuración HTTP y API
     API_TIMEOUT: int = 30
     HTTP_MAX_RETRIES: int = 3
     HTTP_MAX_CONNECTIONS: int = 10
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 4
     HTTP_SSL_VERIFY: bool = False
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP_READ_TIMEOUT: float = 20.0
+    # Timeouts por host: {"www.google.cl": {"connect": 5, "read": 15}}
+    HTTP_HOST_TIMEOUTS: Dict[str, Dict[str, float]] = {}
     SHORTENER_API_URL: str = "http://172.16.1.2:5000/shortener/"
+    # Consulta al shortener de las URLs que ya acortó (antes de enviar)
+    SHORTENER_EXISTS_BATCH_SIZE: int = 500
+    SHORTENER_EXISTS_TIMEOUT: float = 10.0
+    SHORTENER_KNOWN_CACHE_SIZE: int = 50000
+    
+    # Detección de noticias near-duplicadas entre medios (SimHash)
+    NEAR_DUP_MAX_DISTANCE: int = 3
+    NEAR_DUP_WINDOW_HOURS: int = 48
+    NEAR_DUP_MIN_TOKENS: int = 5
+    
+    # Caché HTTP persistente
+    HTTP_CACHE_DIR: Path = OUTPUT_DIR / "http_cache"
+    HTTP_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    HTTP_CACHE_MAX_ENTRY_BYTES: int = 10 * 1024 * 1024
+    
+    # Configuración del crawler de portadas por categoría
+    CRAWLER_MAX_CONCURRENCY: int = 8
+    CRAWLER_HOST_DELAY: float = 1.0
+    CRAWLER_MAX_PAGE_BYTES: int = 5 * 1024 * 1024
+    
+    # Configuración de la ingesta de sitemaps
+    SITEMAP_INITIAL_LOOKBACK_HOURS: int = 24
+    SITEMAP_MAX_DEPTH: int = 2
+    SITEMAP_CHUNK_SIZE: int = 64 * 1024
+    
+    # Enriquecimiento de artículos (content_length, keywords, popularity...)
+    ENRICH_MAX_CONCURRENCY: int = 8
+    ENRICH_HOST_DELAY: float = 1.0
+    ENRICH_MAX_PAGE_BYTES: int = 2 * 1024 * 1024
+    ENRICH_QUEUE_SIZE: int = 32
+    ENRICH_STATE_TTL_DAYS: int = 7
+    
+    # Ventanas de búsqueda incrementales por fuente (tbs=qdr:hN)
+    FRESHNESS_OVERLAP_MINUTES: float = 15.0
+    FRESHNESS_MAX_WINDOW_HOURS: int = 24
+    
+    # Puntuación de keywords y sentiment por lote (requiere numpy)
+    SCORING_TOP_KEYWORDS: int = 5
+    
+    # Configuración de la ingesta de feeds RSS/Atom
+    FEED_DISCOVERY_TTL_HOURS: int = 24 * 7
+    FEED_COMMON_PATHS: List[str] = ['/feed/', '/rss', '/rss.xml', '/feed', '/feeds/rss']
     
     # Estados y códigos
     SUCCESS_STATUS_CODES: Set[int] = {200, 202}
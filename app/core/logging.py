@@ -0,0 +1,148 @@
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from .config import settings
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+JSON_FORMAT = '%(asctime)s %(name)s %(levelname)s %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Comprime el archivo rotado (se ejecuta en el hilo del listener)."""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+def create_formatter(json_format: bool = False) -> logging.Formatter:
+    """
+    Crea el formateador de los registros.
+
+    Args:
+        json_format (bool): Un objeto JSON por línea (python-json-logger)
+
+    Returns:
+        logging.Formatter: Formateador de texto o JSON
+    """
+    if json_format:
+        try:
+            from pythonjsonlogger import jsonlogger
+        except ImportError:
+            logging.getLogger(__name__).warning(
+                "python-json-logger no está instalado; se usa el formato de texto"
+            )
+        else:
+            return jsonlogger.JsonFormatter(JSON_FORMAT)
+    return logging.Formatter(TEXT_FORMAT)
+
+def create_file_handler(
+    log_file: Path,
+    max_bytes: int = settings.LOG_MAX_BYTES,
+    backup_count: int = settings.LOG_BACKUP_COUNT,
+    rotate_when: str = settings.LOG_ROTATE_WHEN,
+    compress: bool = settings.LOG_COMPRESS
+) -> logging.Handler:
+    """
+    Crea el handler de archivo con rotación por tamaño o por tiempo.
+
+    Args:
+        log_file (Path): Archivo de log
+        max_bytes (int): Tamaño máximo antes de rotar (rotación por tamaño)
+        backup_count (int): Archivos rotados que se conservan
+        rotate_when (str): Intervalo de TimedRotatingFileHandler ('midnight',
+                           'H', ...); vacío para rotar por tamaño
+        compress (bool): Comprime con gzip los archivos rotados
+
+    Returns:
+        logging.Handler: Handler de archivo
+    """
+    log_file = Path(log_file)
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    if rotate_when:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when=rotate_when, backupCount=backup_count, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+    if compress:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
+def setup_logging(
+    level: str = settings.LOG_LEVEL,
+    json_format: bool = settings.LOG_JSON,
+    log_file: Optional[Path] = None,
+    console: bool = True
+) -> logging.handlers.QueueListener:
+    """
+    Configura el logging sin I/O bloqueante: el logger raíz solo encola los
+    registros (QueueHandler) y un QueueListener en un hilo aparte los
+    escribe en consola y en el archivo rotado. Las llamadas de log dentro
+    del event loop nunca esperan al disco.
+
+    Args:
+        level (str): Nivel mínimo del logger raíz
+        json_format (bool): Registros en JSON (uno por línea)
+        log_file (Path, optional): Archivo de log (por defecto settings.LOG_FILE)
+        console (bool): Escribe también en la salida de errores
+
+    Returns:
+        logging.handlers.QueueListener: Listener en ejecución (se detiene al salir)
+    """
+    global _listener
+    shutdown_logging()
+
+    if log_file is None:
+        settings.get_log_dir()
+        log_file = settings.LOG_FILE
+    formatter = create_formatter(json_format)
+    handlers = [create_file_handler(log_file)]
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level.upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def shutdown_logging() -> None:
+    """Escribe los registros pendientes y detiene el listener."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+atexit.register(shutdown_logging)
+
+# Ejemplo de uso:
+"""
+from app.core.logging import setup_logging
+
+setup_logging(level="INFO", json_format=True)
+logging.getLogger(__name__).info("Inicio de la ejecución")
+"""
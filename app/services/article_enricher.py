@@ -0,0 +1,335 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+from urllib.parse import urlparse
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from ..core.config import settings
+from ..utils.records import RecordBatch
+from .rate_limiter import HostRateLimiter
+
+ARTICLE_TYPES = {'NewsArticle', 'Article', 'ReportageNewsArticle', 'AnalysisNewsArticle', 'BlogPosting'}
+WORD_PATTERN = re.compile(r'\w+')
+CHUNK_SIZE = 64 * 1024
+# Campos de la consulta que completa el enriquecimiento
+ENRICHED_FIELDS = ('content_length', 'keywords', 'popularity', 'subcategory')
+
+def _as_list(value) -> List:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _iter_json_ld(soup: BeautifulSoup) -> Iterator[Dict]:
+    """Recorre los objetos JSON-LD de la página (incluyendo @graph)."""
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        pending = _as_list(data)
+        while pending:
+            item = pending.pop(0)
+            if not isinstance(item, dict):
+                continue
+            pending.extend(_as_list(item.get('@graph')))
+            yield item
+
+def _interaction_count(article: Dict) -> Optional[int]:
+    total = None
+    for statistic in _as_list(article.get('interactionStatistic')):
+        if isinstance(statistic, dict) and str(statistic.get('userInteractionCount', '')).isdigit():
+            total = (total or 0) + int(statistic['userInteractionCount'])
+    if total is None and str(article.get('commentCount', '')).isdigit():
+        total = int(article['commentCount'])
+    return total
+
+def extract_article_metadata(html: Union[str, bytes]) -> Dict:
+    """
+    Extrae los metadatos de un artículo: etiquetas og/article, JSON-LD
+    (NewsArticle) y cantidad de palabras del cuerpo.
+
+    Args:
+        html (str | bytes): Contenido del artículo
+
+    Returns:
+        Dict: title, description, content_length, keywords, popularity y
+              subcategory (solo los campos encontrados)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    metadata: Dict = {}
+    keywords: List[str] = []
+
+    meta = {}
+    for tag in soup.find_all('meta'):
+        key = (tag.get('property') or tag.get('name') or '').lower()
+        content = (tag.get('content') or '').strip()
+        if not key or not content:
+            continue
+        if key == 'article:tag':
+            keywords.append(content)
+        else:
+            meta.setdefault(key, content)
+
+    for article in _iter_json_ld(soup):
+        if not ARTICLE_TYPES & set(_as_list(article.get('@type'))):
+            continue
+        if str(article.get('wordCount', '')).isdigit():
+            metadata['content_length'] = int(article['wordCount'])
+        article_keywords = article.get('keywords')
+        if isinstance(article_keywords, str):
+            article_keywords = article_keywords.split(',')
+        keywords.extend(_as_list(article_keywords))
+        sections = _as_list(article.get('articleSection'))
+        if sections and isinstance(sections[0], str):
+            metadata.setdefault('subcategory', sections[0])
+        popularity = _interaction_count(article)
+        if popularity is not None:
+            metadata['popularity'] = popularity
+        if article.get('headline'):
+            metadata.setdefault('title', article['headline'])
+        break
+
+    if meta.get('og:title'):
+        metadata.setdefault('title', meta['og:title'])
+    if meta.get('og:description') or meta.get('description'):
+        metadata['description'] = meta.get('og:description') or meta['description']
+    if meta.get('article:section'):
+        metadata.setdefault('subcategory', meta['article:section'])
+    for key in ('news_keywords', 'keywords'):
+        if key in meta:
+            keywords.extend(meta[key].split(','))
+
+    if keywords:
+        unique = {}
+        for keyword in keywords:
+            keyword = str(keyword).strip()
+            if keyword:
+                unique.setdefault(keyword.lower(), keyword)
+        metadata['keywords'] = ', '.join(unique.values())
+
+    if 'content_length' not in metadata:
+        body = soup.find('article') or soup.body or soup
+        text = ' '.join(p.get_text(' ', strip=True) for p in body.find_all('p'))
+        metadata['content_length'] = len(WORD_PATTERN.findall(text))
+    return metadata
+
+class ArticleEnricher:
+    """
+    Etapa opcional que descarga los artículos descubiertos y completa los
+    campos content_length, keywords, popularity y subcategory de cada
+    registro. Las descargas se hacen en paralelo con un límite global y un
+    intervalo mínimo por host; una cola acotada aplica contrapresión para
+    que la memoria no crezca con el tamaño del lote. El límite global y las
+    descargas en curso son de la instancia, por lo que varios enrich()
+    simultáneos (p.ej. los workers del pipeline) no lo multiplican ni
+    descargan dos veces la misma URL. Los metadatos se guardan entre
+    ejecuciones para no descargar dos veces un artículo.
+    """
+    def __init__(
+        self,
+        state_path: Path,
+        max_concurrency: int = settings.ENRICH_MAX_CONCURRENCY,
+        host_delay: float = settings.ENRICH_HOST_DELAY,
+        max_bytes: int = settings.ENRICH_MAX_PAGE_BYTES,
+        queue_size: int = settings.ENRICH_QUEUE_SIZE,
+        ttl_days: int = settings.ENRICH_STATE_TTL_DAYS
+    ):
+        """
+        Args:
+            state_path (Path): Archivo JSON con los artículos ya procesados
+            max_concurrency (int): Máximo de artículos descargados en paralelo
+            host_delay (float): Segundos mínimos entre peticiones a un host
+            max_bytes (int): Máximo de bytes leídos por artículo
+            queue_size (int): Tamaño de la cola de artículos pendientes
+            ttl_days (int): Días que se recuerda un artículo procesado
+        """
+        self.logger = logging.getLogger(__name__)
+        self.state_path = Path(state_path)
+        self.max_concurrency = max_concurrency
+        self.host_limiter = HostRateLimiter(host_delay)
+        self.max_bytes = max_bytes
+        self.queue_size = queue_size
+        self.ttl_seconds = ttl_days * 86400
+        self.articles: Dict[str, Dict] = self._load()
+        self.fetched = 0
+        # Se crean en el event loop en uso (ver enrich)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                articles = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error al cargar {self.state_path}: {e}")
+            return {}
+        cutoff = time.time() - self.ttl_seconds
+        return {
+            url: article for url, article in articles.items()
+            if article.get('fetched_at', 0) >= cutoff
+        }
+
+    def save(self) -> None:
+        """Guarda de forma atómica los artículos ya procesados."""
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.articles, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error al guardar {self.state_path}: {e}")
+
+    def get_headers(self) -> Dict[str, str]:
+        """Genera headers para la petición con un User-Agent aleatorio."""
+        return {
+            **settings.DEFAULT_HEADERS,
+            'User-Agent': random.choice(settings.USER_AGENTS)
+        }
+
+    async def fetch_article(self, session: aiohttp.ClientSession, url: str) -> Optional[bytes]:
+        """
+        Descarga un artículo leyendo el cuerpo por bloques hasta max_bytes.
+
+        Returns:
+            Optional[bytes]: Contenido HTML, b'' si la respuesta no es un
+                             artículo, o None ante un error de red o un
+                             status distinto de 200 (no se recuerda: un 429
+                             o 5xx pasajero se reintenta en la próxima
+                             ejecución)
+        """
+        await self.host_limiter.wait(urlparse(url).netloc)
+        try:
+            async with session.get(url, headers=self.get_headers()) as response:
+                content_type = response.headers.get('Content-Type', 'text/html')
+                if response.status != 200:
+                    self.logger.warning(f"Status code {response.status} para {url}")
+                    return None
+                if 'html' not in content_type:
+                    self.logger.warning(f"Contenido {content_type} para {url}")
+                    return b''
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= self.max_bytes:
+                        break
+                return b''.join(chunks)
+        except Exception as e:
+            self.logger.error(f"Error al descargar el artículo {url}: {e}")
+            return None
+
+    def _release(self, url: str) -> None:
+        future = self._in_flight.pop(url, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def _apply(self, batch: RecordBatch, index: int, metadata: Dict) -> None:
+        fields = {key: metadata[key] for key in ENRICHED_FIELDS if metadata.get(key) not in (None, '')}
+        extra = batch.get_extra(index)
+        for key in ('title', 'description'):
+            if metadata.get(key) and not extra.get(key):
+                fields[key] = metadata[key]
+        if fields:
+            batch.set_extra(index, **fields)
+
+    async def _worker(
+        self,
+        session: aiohttp.ClientSession,
+        queue: asyncio.Queue
+    ) -> None:
+        while True:
+            url = await queue.get()
+            try:
+                if url is None:
+                    return
+                async with self._slots:
+                    body = await self.fetch_article(session, url)
+                if body is None:
+                    continue
+                metadata = await asyncio.to_thread(extract_article_metadata, body) if body else {}
+                self.articles[url] = {"fetched_at": time.time(), "metadata": metadata}
+                self.fetched += 1
+            except Exception as e:
+                self.logger.error(f"Error al procesar el artículo {url}: {e}")
+            finally:
+                if url is not None:
+                    self._release(url)
+                queue.task_done()
+
+    async def enrich(self, session: aiohttp.ClientSession, batch: RecordBatch) -> RecordBatch:
+        """
+        Completa los metadatos de los registros del lote. Los artículos
+        procesados en ejecuciones anteriores no se vuelven a descargar, y
+        los que otra llamada está descargando se esperan en lugar de
+        repetirse.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            batch (RecordBatch): Lote a enriquecer (se modifica en su lugar)
+
+        Returns:
+            RecordBatch: El mismo lote con los campos completados
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        missing = [url for url in dict.fromkeys(batch.urls) if url not in self.articles]
+        shared = [self._in_flight[url] for url in missing if url in self._in_flight]
+        pending = [url for url in missing if url not in self._in_flight]
+        loop = asyncio.get_running_loop()
+        for url in pending:
+            self._in_flight[url] = loop.create_future()
+
+        if pending:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            workers = [
+                asyncio.create_task(self._worker(session, queue))
+                for _ in range(min(self.max_concurrency, len(pending)))
+            ]
+            try:
+                for url in pending:
+                    await queue.put(url)
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                # Las URLs que no alcanzó a procesar no deben dejar esperando
+                # a otras llamadas
+                for url in pending:
+                    self._release(url)
+        if shared:
+            # wait (y no gather) para no cancelar la descarga de otra llamada
+            await asyncio.wait(shared)
+
+        enriched = 0
+        for index, url in enumerate(batch.urls):
+            article = self.articles.get(url)
+            if article and article["metadata"]:
+                self._apply(batch, index, article["metadata"])
+                enriched += 1
+        self.logger.info(
+            f"Enriquecidos {enriched}/{len(batch)} artículos "
+            f"({len(pending)} descargas nuevas)"
+        )
+        return batch
+
+# Ejemplo de uso:
+"""
+enricher = ArticleEnricher(Path("output/enriched_articles.json"))
+async with create_http_client() as session:
+    batch = await enricher.enrich(session, batch)
+enricher.save()
+"""
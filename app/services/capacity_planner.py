@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import math
+import random
+import selectors
+import statistics
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .http_cache import CachedResponse, _CachedRequest
+
+class _VirtualSelector(selectors.BaseSelector):
+    """
+    Selector sin I/O real: en lugar de bloquear durante timeout segundos
+    avanza el reloj virtual del loop hasta el próximo evento programado.
+    """
+    def __init__(self, loop: 'VirtualTimeLoop'):
+        self._loop = loop
+        self._map: Dict = {}
+
+    def register(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        fd = fileobj if isinstance(fileobj, int) else fileobj.fileno()
+        key = selectors.SelectorKey(fileobj, fd, events, data)
+        self._map[fileobj] = key
+        return key
+
+    def unregister(self, fileobj) -> selectors.SelectorKey:
+        return self._map.pop(fileobj)
+
+    def select(self, timeout: Optional[float] = None) -> List:
+        if timeout is None:
+            raise RuntimeError("Simulación detenida: ninguna tarea tiene un evento programado")
+        self._loop.advance(timeout)
+        return []
+
+    def get_map(self) -> Dict:
+        return self._map
+
+    def close(self) -> None:
+        self._map.clear()
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop con reloj virtual: los sleeps, timeouts y limitadores que usan
+    loop.time() transcurren al instante, por lo que una ejecución de una
+    hora se simula en milisegundos. Solo sirve para código que espera en el
+    loop (sin red real ni hilos).
+    """
+    def __init__(self):
+        self._now = 0.0
+        super().__init__(selector=_VirtualSelector(self))
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        if seconds > 0:
+            self._now += seconds
+
+def _serp_body(count: int, offset: int) -> bytes:
+    results = ''.join(
+        f'<div class="g"><div class="yuRUbf"><a href="https://simulado.cl/noticia-{offset + i}">'
+        f'<h3>Noticia {offset + i}</h3></a></div></div>'
+        for i in range(count)
+    )
+    return f'<html><body>{results}<div id="botstuff"></div></body></html>'.encode('utf-8')
+
+class SimulatedSession:
+    """
+    Sesión HTTP simulada para la planificación: cada búsqueda tarda una
+    latencia aleatoria y la primera página viene llena (10 resultados, lo que
+    dispara la segunda página) con la probabilidad indicada.
+    """
+    def __init__(
+        self,
+        rng: random.Random,
+        latency: Tuple[float, float] = (0.5, 1.5),
+        full_page_probability: float = 0.3
+    ):
+        self.rng = rng
+        self.latency = latency
+        self.full_page_probability = full_page_probability
+        self.requests = 0
+
+    async def _get(self, url: str) -> CachedResponse:
+        self.requests += 1
+        await asyncio.sleep(self.rng.uniform(*self.latency))
+        offset = 10 if '&start=10' in url else 0
+        if offset == 0 and self.rng.random() < self.full_page_probability:
+            count = 10
+        else:
+            count = self.rng.randint(0, 9)
+        return CachedResponse(
+            url, 200, {'Content-Type': 'text/html; charset=utf-8'}, _serp_body(count, offset)
+        )
+
+    def get(self, url, headers: Optional[Dict[str, str]] = None, **kwargs):
+        return _CachedRequest(self._get(str(url)))
+
+@dataclass
+class PlanResult:
+    """Resultado de la simulación de varias ejecuciones."""
+    sources: int
+    trials: int
+    window_seconds: float
+    mean_seconds: float
+    p95_seconds: float
+    max_seconds: float
+    mean_requests: float
+
+    @property
+    def headroom_seconds(self) -> float:
+        return self.window_seconds - self.p95_seconds
+
+    @property
+    def fits(self) -> bool:
+        return self.headroom_seconds >= 0
+
+def simulate_run(
+    scraper_factory: Callable[[], object],
+    queries: List[Dict],
+    seed: int = 0,
+    latency: Tuple[float, float] = (0.5, 1.5),
+    full_page_probability: float = 0.3
+) -> Tuple[float, int]:
+    """
+    Ejecuta process_sources del scraper real en tiempo virtual.
+
+    Args:
+        scraper_factory (Callable): Crea el scraper (dentro del loop virtual)
+        queries (List[Dict]): Consultas a simular
+        seed (int): Semilla de las esperas aleatorias y de la red simulada
+        latency (Tuple[float, float]): Latencia de cada búsqueda en segundos
+        full_page_probability (float): Probabilidad de que se pida la página 2
+
+    Returns:
+        Tuple[float, int]: Duración simulada en segundos y peticiones realizadas
+    """
+    # Las esperas del scraper usan el módulo random: se fija su estado
+    # durante la simulación y se restaura al terminar
+    state = random.getstate()
+    random.seed(seed)
+    session = SimulatedSession(random.Random(seed), latency, full_page_probability)
+    loop = VirtualTimeLoop()
+
+    async def run() -> float:
+        scraper = scraper_factory()
+
+        async def discard(batch) -> None:
+            return None
+
+        start = loop.time()
+        await scraper.process_sources(session, queries, discard)
+        return loop.time() - start
+
+    try:
+        elapsed = loop.run_until_complete(run())
+    finally:
+        loop.close()
+        random.setstate(state)
+    return elapsed, session.requests
+
+def plan(
+    scraper_factory: Callable[[], object],
+    queries: List[Dict],
+    window_seconds: float = 3600.0,
+    trials: int = 20,
+    latency: Tuple[float, float] = (0.5, 1.5),
+    full_page_probability: float = 0.3
+) -> PlanResult:
+    """
+    Simula varias ejecuciones y resume su duración frente a la ventana.
+
+    Returns:
+        PlanResult: Duración media, p95 y máxima, y peticiones por ejecución
+    """
+    durations = []
+    requests = []
+    previous = logging.root.manager.disable
+    # Los logs por fuente de cada simulación no aportan al reporte
+    logging.disable(logging.INFO)
+    try:
+        for trial in range(trials):
+            elapsed, count = simulate_run(scraper_factory, queries, trial, latency, full_page_probability)
+            durations.append(elapsed)
+            requests.append(count)
+    finally:
+        logging.disable(previous)
+    ordered = sorted(durations)
+    return PlanResult(
+        sources=len(queries),
+        trials=trials,
+        window_seconds=window_seconds,
+        mean_seconds=statistics.mean(durations),
+        p95_seconds=ordered[min(math.ceil(0.95 * len(ordered)) - 1, len(ordered) - 1)],
+        max_seconds=ordered[-1],
+        mean_requests=statistics.mean(requests)
+    )
+
+def max_sources(result: PlanResult) -> int:
+    """Fuentes que caben en la ventana con el costo p95 por fuente observado."""
+    if not result.sources or result.p95_seconds <= 0:
+        return result.sources
+    return int(result.window_seconds / (result.p95_seconds / result.sources))
+
+def required_rate(
+    plan_for_rate: Callable[[float], PlanResult],
+    low: float = 0.01,
+    high: float = 10.0,
+    iterations: int = 12
+) -> Optional[float]:
+    """
+    Busca (bisección) la menor tasa de peticiones con la que la ejecución
+    cabe en la ventana.
+
+    Args:
+        plan_for_rate (Callable[[float], PlanResult]): Planifica con una tasa dada
+
+    Returns:
+        Optional[float]: Peticiones por segundo necesarias, o None si ni
+                         siquiera la tasa máxima alcanza (dominan las esperas)
+    """
+    if not plan_for_rate(high).fits:
+        return None
+    if plan_for_rate(low).fits:
+        return low
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        if plan_for_rate(middle).fits:
+            high = middle
+        else:
+            low = middle
+    return high
+
+def format_report(
+    result: PlanResult,
+    calls_per_second: float,
+    rate: Optional[float] = None
+) -> str:
+    """Reporte legible de la planificación."""
+    lines = [
+        f"Fuentes: {result.sources} ({result.trials} simulaciones)",
+        f"Duración esperada: media {result.mean_seconds / 60:.1f} min, "
+        f"p95 {result.p95_seconds / 60:.1f} min, máx {result.max_seconds / 60:.1f} min",
+        f"Peticiones por ejecución: {result.mean_requests:.1f}",
+        f"Ventana: {result.window_seconds / 60:.0f} min - holgura p95 "
+        f"{result.headroom_seconds / 60:+.1f} min ({'cabe' if result.fits else 'NO cabe'})",
+        f"Máximo de fuentes con la configuración actual: {max_sources(result)}"
+    ]
+    if not result.fits:
+        if rate is None:
+            lines.append(
+                "Ninguna tasa de peticiones alcanza: las esperas entre páginas y "
+                "dominios dominan; reducir fuentes o esperas"
+            )
+        else:
+            lines.append(f"Tasa necesaria: {rate:.3f} peticiones/s (actual {calls_per_second})")
+    return '\n'.join(lines)
+
+# Ejemplo de uso:
+"""
+result = plan(lambda: GoogleScraper(config), CONSULTAS, window_seconds=config.run_deadline_seconds)
+print(format_report(result, config.calls_per_second))
+
+# Desde la línea de comandos, con la configuración actual:
+# python linkerer.py --plan
+"""
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import random
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from ..core.config import settings
+from ..utils.pattern_matcher import PatternMatcher
+from ..utils.records import RecordBatch
+from .conditional_fetch import ValidatorStore, conditional_get
+from .rate_limiter import HostRateLimiter
+
+class CategoryCrawler:
+    """
+    Backend de descubrimiento que lee directamente las portadas de categoría
+    de cada medio (base_url + category_path) en lugar de consultar Google.
+    Usa peticiones condicionales para no reprocesar portadas sin cambios y
+    respeta un intervalo mínimo entre peticiones al mismo host.
+    """
+    DEFAULT_LINK_SELECTOR = 'a[href]'
+
+    def __init__(
+        self,
+        media_outlets: Dict,
+        state_path: Path,
+        max_concurrency: int = settings.CRAWLER_MAX_CONCURRENCY,
+        host_delay: float = settings.CRAWLER_HOST_DELAY,
+        pattern_matcher: Optional[PatternMatcher] = None
+    ):
+        """
+        Args:
+            media_outlets (Dict): Medios configurados (MEDIA_OUTLETS)
+            state_path (Path): Archivo donde persistir ETag/Last-Modified
+            max_concurrency (int): Máximo de portadas descargadas en paralelo
+            host_delay (float): Segundos mínimos entre peticiones a un host
+            pattern_matcher (PatternMatcher, optional): Filtro de exclusión
+        """
+        self.logger = logging.getLogger(__name__)
+        self.outlets_by_url = {
+            outlet.base_url: outlet for outlet in media_outlets.values()
+        }
+        self.validators = ValidatorStore(state_path)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.host_limiter = HostRateLimiter(host_delay)
+        self.pattern_matcher = pattern_matcher or PatternMatcher()
+
+    def get_headers(self) -> Dict[str, str]:
+        """Genera headers para la petición con un User-Agent aleatorio."""
+        return {
+            **settings.DEFAULT_HEADERS,
+            'User-Agent': random.choice(settings.USER_AGENTS)
+        }
+
+    def _find_outlet(self, site: str):
+        for base_url, outlet in self.outlets_by_url.items():
+            if site.startswith(base_url):
+                return outlet
+        return None
+
+    def extract_links(self, html: bytes, listing_url: str, selector: str) -> List[str]:
+        """
+        Extrae los enlaces a artículos de una portada de categoría.
+        Solo se conservan enlaces bajo la ruta de la portada.
+
+        Args:
+            html (bytes): Contenido de la portada
+            listing_url (str): URL de la portada
+            selector (str): Selector CSS de los enlaces a artículos
+
+        Returns:
+            List[str]: Enlaces absolutos a artículos
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        prefix = listing_url.rstrip('/')
+        listing_host = urlparse(listing_url).netloc
+
+        links = []
+        for anchor in soup.select(selector):
+            href = anchor.get('href')
+            if not href:
+                continue
+            link = urljoin(listing_url, href)
+            if urlparse(link).netloc != listing_host:
+                continue
+            if link.startswith(prefix) and link.rstrip('/') != prefix:
+                links.append(link)
+        return links
+
+    async def crawl_source(
+        self,
+        session: aiohttp.ClientSession,
+        query: Dict[str, str]
+    ) -> RecordBatch:
+        """
+        Descarga la portada de una fuente y retorna sus artículos.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            query (Dict[str, str]): Consulta de la fuente (ver generate_consultas)
+
+        Returns:
+            RecordBatch: Resultados con la misma forma que process_source
+        """
+        results = RecordBatch()
+        listing_url = query['site']
+        outlet = self._find_outlet(listing_url)
+        selector = (outlet and outlet.link_selector) or self.DEFAULT_LINK_SELECTOR
+
+        async with self.semaphore:
+            await self.host_limiter.wait(urlparse(listing_url).netloc)
+            try:
+                status, body = await conditional_get(
+                    session,
+                    listing_url,
+                    self.get_headers(),
+                    self.validators,
+                    max_bytes=settings.CRAWLER_MAX_PAGE_BYTES
+                )
+            except Exception as e:
+                self.logger.error(f"Error al solicitar {listing_url}: {e}")
+                return results
+
+        if status == 304:
+            self.logger.info(f"Portada sin cambios para {query['source']}")
+            return results
+        if body is None:
+            self.logger.warning(f"Status code {status} para {listing_url}")
+            return results
+
+        links = self.pattern_matcher.filter_urls(
+            self.extract_links(body, listing_url, selector)
+        )
+        self.logger.info(
+            f"Encontrados {len(links)} enlaces para {query['source']} - "
+            f"Categoría: {query['category']} (portada)"
+        )
+
+        results.add_links(query, links)
+        return results
+
+    def save(self) -> None:
+        """
+        Guarda los validadores. Se llama después de confirmar los resultados:
+        si la ejecución falla antes, la próxima vuelve a descargar las portadas
+        en lugar de recibir un 304 y perder sus enlaces.
+        """
+        self.validators.save()
+
+    async def crawl(
+        self,
+        session: aiohttp.ClientSession,
+        queries: List[Dict],
+        on_results: Optional[Callable[[RecordBatch], Awaitable[None]]] = None
+    ) -> RecordBatch:
+        """
+        Descarga en paralelo las portadas de todas las fuentes.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            queries (List[Dict]): Consultas a procesar
+            on_results (Callable, optional): Recibe el lote de cada fuente
+                                             apenas termina, en lugar de
+                                             acumularlo (un corte por plazo
+                                             conserva lo ya entregado)
+
+        Returns:
+            RecordBatch: Resultados de todas las fuentes (vacío si se indicó
+                         on_results)
+        """
+        results = RecordBatch()
+
+        async def crawl_and_report(query: Dict) -> None:
+            batch = await self.crawl_source(session, query)
+            if on_results is not None:
+                if batch:
+                    await on_results(batch)
+            else:
+                results.extend(batch)
+
+        await asyncio.gather(*(crawl_and_report(query) for query in queries))
+        return results
+
+# Ejemplo de uso:
+"""
+from sourcesv1 import MEDIA_OUTLETS, CONSULTAS
+
+crawler = CategoryCrawler(MEDIA_OUTLETS, Path("output/crawler_validators.json"))
+
+async with aiohttp.ClientSession() as session:
+    results = await crawler.crawl(session, CONSULTAS)
+"""
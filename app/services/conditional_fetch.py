@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from .http_cache import uncached
+
+logger = logging.getLogger(__name__)
+
+class ValidatorStore:
+    """
+    Persiste los validadores HTTP (ETag / Last-Modified) de cada URL para
+    poder revalidar recursos con peticiones condicionales entre ejecuciones.
+    """
+    def __init__(self, path: Path):
+        """
+        Args:
+            path (Path): Archivo JSON donde se guardan los validadores
+        """
+        self.path = Path(path)
+        self.validators: Dict[str, Dict[str, str]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error al cargar validadores de {self.path}: {e}")
+            return {}
+
+    def headers_for(self, url: str) -> Dict[str, str]:
+        """
+        Retorna los headers condicionales conocidos para una URL.
+
+        Args:
+            url (str): URL del recurso
+
+        Returns:
+            Dict[str, str]: Headers If-None-Match / If-Modified-Since
+        """
+        validators = self.validators.get(url, {})
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def update(self, url: str, response_headers) -> None:
+        """
+        Registra los validadores entregados por el servidor.
+
+        Args:
+            url (str): URL del recurso
+            response_headers: Headers de la respuesta HTTP
+        """
+        validators = {}
+        if response_headers.get('ETag'):
+            validators['etag'] = response_headers['ETag']
+        if response_headers.get('Last-Modified'):
+            validators['last_modified'] = response_headers['Last-Modified']
+
+        if validators:
+            if self.validators.get(url) != validators:
+                self.validators[url] = validators
+                self._dirty = True
+        elif self.validators.pop(url, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Guarda los validadores de forma atómica si hubo cambios."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.validators, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Error al guardar validadores en {self.path}: {e}")
+
+async def read_limited(response, max_bytes: int, chunk_size: int = 65536) -> Tuple[bytes, bool]:
+    """
+    Lee el cuerpo de una respuesta hasta max_bytes.
+
+    response.content.read(n) solo entrega lo que ya llegó por la red (puede
+    ser mucho menos que n), por lo que se leen fragmentos hasta completar el
+    límite o el fin del cuerpo.
+
+    Args:
+        response: Respuesta de aiohttp (o compatible con content.iter_chunked)
+        max_bytes (int): Máximo de bytes a leer
+        chunk_size (int): Tamaño de cada lectura
+
+    Returns:
+        Tuple[bytes, bool]: Cuerpo (a lo más max_bytes) y si se leyó completo
+    """
+    chunks = []
+    size = 0
+    async for chunk in response.content.iter_chunked(chunk_size):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            return b''.join(chunks)[:max_bytes], False
+    return b''.join(chunks), True
+
+async def conditional_get(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: Dict[str, str],
+    store: ValidatorStore,
+    max_bytes: Optional[int] = None
+) -> Tuple[int, Optional[bytes]]:
+    """
+    Realiza un GET condicional usando los validadores almacenados.
+
+    Args:
+        session (aiohttp.ClientSession): Sesión HTTP
+        url (str): URL a solicitar
+        headers (Dict[str, str]): Headers base de la petición
+        store (ValidatorStore): Almacén de validadores
+        max_bytes (int, optional): Máximo de bytes a leer del cuerpo (un
+                                   cuerpo más largo se trunca)
+
+    Returns:
+        Tuple[int, Optional[bytes]]: Status HTTP y cuerpo. El cuerpo es None
+                                     si el recurso no cambió (304) o hubo error.
+    """
+    request_headers = {**headers, **store.headers_for(url)}
+    # Los validadores son del llamador: la caché HTTP no participa
+    async with uncached(session).get(url, headers=request_headers) as response:
+        if response.status == 304:
+            return 304, None
+        if response.status != 200:
+            return response.status, None
+
+        if max_bytes is None:
+            body, complete = await response.read(), True
+        else:
+            body, complete = await read_limited(response, max_bytes)
+
+        # Con el cuerpo truncado no se guardan los validadores: un 304 en la
+        # próxima ejecución ocultaría la parte que no se leyó
+        if complete:
+            store.update(url, response.headers)
+        return response.status, body
+
+# Ejemplo de uso:
+"""
+store = ValidatorStore(Path("output/validators.json"))
+
+async with aiohttp.ClientSession() as session:
+    status, body = await conditional_get(session, url, {}, store)
+    if status == 304:
+        print("Sin cambios desde la última ejecución")
+
+store.save()
+"""
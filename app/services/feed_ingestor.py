@@ -0,0 +1,388 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from ..core.config import settings
+from ..utils.pattern_matcher import PatternMatcher
+from ..utils.records import DATE_FORMAT, RecordBatch
+from .conditional_fetch import ValidatorStore, read_limited
+from .http_cache import uncached
+from .rate_limiter import HostRateLimiter
+from .sitemap_ingestor import parse_w3c_datetime
+
+FEED_TYPES = {'application/rss+xml', 'application/atom+xml'}
+FEED_MARKERS = (b'<rss', b'<feed', b'<rdf:rdf')
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    Convierte la fecha de un ítem (RFC 822 en RSS, W3C en Atom) a datetime.
+
+    Args:
+        value (str): Fecha del ítem
+
+    Returns:
+        Optional[datetime]: Fecha con zona horaria o None si no es válida
+    """
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value.strip())
+        return parsed if parsed.tzinfo else parsed.astimezone()
+    except (TypeError, ValueError):
+        return parse_w3c_datetime(value)
+
+class FeedIngestor:
+    """
+    Backend de descubrimiento basado en feeds RSS/Atom. Los feeds de cada
+    medio se autodescubren (<link rel="alternate"> o rutas habituales) y se
+    guardan en caché; luego se consultan en paralelo con revalidación ETag
+    y se procesan en streaming con un parser XML incremental.
+    """
+    ITEM_TAGS = {'item', 'entry'}
+
+    def __init__(
+        self,
+        media_outlets: Dict,
+        state_dir: Path,
+        max_concurrency: int = settings.CRAWLER_MAX_CONCURRENCY,
+        host_delay: float = settings.CRAWLER_HOST_DELAY,
+        pattern_matcher: Optional[PatternMatcher] = None
+    ):
+        """
+        Args:
+            media_outlets (Dict): Medios configurados (MEDIA_OUTLETS)
+            state_dir (Path): Directorio para la caché de feeds y validadores
+            max_concurrency (int): Máximo de feeds consultados en paralelo
+            host_delay (float): Segundos mínimos entre peticiones a un host
+            pattern_matcher (PatternMatcher, optional): Filtro de exclusión
+        """
+        self.logger = logging.getLogger(__name__)
+        self.outlets_by_url = {
+            outlet.base_url: outlet for outlet in media_outlets.values()
+        }
+        self.state_path = Path(state_dir) / 'feeds_state.json'
+        self.state = self._load_state()
+        self.validators = ValidatorStore(Path(state_dir) / 'feed_validators.json')
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.host_limiter = HostRateLimiter(host_delay)
+        self.pattern_matcher = pattern_matcher or PatternMatcher()
+
+    def _load_state(self) -> Dict:
+        state = {"feeds": {}, "high_water_marks": {}}
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state.update(json.load(f))
+            except Exception as e:
+                self.logger.error(f"Error al cargar {self.state_path}: {e}")
+        return state
+
+    def _save_state(self) -> None:
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error al guardar {self.state_path}: {e}")
+
+    def get_headers(self) -> Dict[str, str]:
+        """Genera headers para la petición con un User-Agent aleatorio."""
+        return {
+            **settings.DEFAULT_HEADERS,
+            'User-Agent': random.choice(settings.USER_AGENTS)
+        }
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, max_bytes: int) -> Optional[bytes]:
+        await self.host_limiter.wait(urlparse(url).netloc)
+        try:
+            async with session.get(url, headers=self.get_headers()) as response:
+                if response.status != 200:
+                    return None
+                body, _ = await read_limited(response, max_bytes)
+                return body
+        except Exception as e:
+            self.logger.debug(f"Error al solicitar {url}: {e}")
+            return None
+
+    async def discover_feeds(self, session: aiohttp.ClientSession, outlet) -> List[str]:
+        """
+        Obtiene los feeds de un medio. Usa los configurados, luego la caché
+        y, si está vencida, los descubre desde la portada o rutas habituales.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            outlet (MediaOutlet): Medio a consultar
+
+        Returns:
+            List[str]: URLs de feeds del medio
+        """
+        if outlet.feed_urls:
+            return list(outlet.feed_urls)
+
+        cached = self.state["feeds"].get(outlet.base_url)
+        if cached:
+            discovered_at = parse_w3c_datetime(cached.get("discovered_at"))
+            ttl = timedelta(hours=settings.FEED_DISCOVERY_TTL_HOURS)
+            if discovered_at and datetime.now(timezone.utc) - discovered_at < ttl:
+                return cached["feeds"]
+
+        feeds = []
+        pages = [outlet.base_url + '/'] + [
+            outlet.base_url + path for path in outlet.category_paths.values()
+        ]
+        for page_url in pages:
+            html = await self._get(session, page_url, settings.CRAWLER_MAX_PAGE_BYTES)
+            if not html:
+                continue
+            soup = BeautifulSoup(html, 'html.parser')
+            for link in soup.find_all('link', href=True):
+                rel = [value.lower() for value in (link.get('rel') or [])]
+                if 'alternate' in rel and (link.get('type') or '').lower() in FEED_TYPES:
+                    feed_url = urljoin(page_url, link['href'])
+                    if feed_url not in feeds:
+                        feeds.append(feed_url)
+
+        if not feeds:
+            for path in settings.FEED_COMMON_PATHS:
+                head = await self._get(session, outlet.base_url + path, 2048)
+                if head and any(marker in head.lower() for marker in FEED_MARKERS):
+                    feeds.append(outlet.base_url + path)
+                    break
+
+        self.state["feeds"][outlet.base_url] = {
+            "feeds": feeds,
+            "discovered_at": datetime.now(timezone.utc).isoformat()
+        }
+        self.logger.info(f"Descubiertos {len(feeds)} feeds para {outlet.name}")
+        return feeds
+
+    @staticmethod
+    def _read_item(elem) -> Dict[str, str]:
+        item = {}
+        for child in elem:
+            if not isinstance(child.tag, str):
+                continue
+            name = etree.QName(child).localname
+            if name == 'link':
+                # RSS usa texto; Atom usa el atributo href (rel=alternate)
+                href = child.get('href')
+                if href and child.get('rel', 'alternate') == 'alternate':
+                    item.setdefault('link', href.strip())
+                elif child.text and child.text.strip():
+                    item.setdefault('link', child.text.strip())
+            elif name in ('title', 'pubDate', 'published', 'updated', 'date') and child.text:
+                item.setdefault(name, child.text.strip())
+        return item
+
+    async def poll_feed(
+        self,
+        session: aiohttp.ClientSession,
+        feed_url: str
+    ) -> List[Dict[str, str]]:
+        """
+        Consulta un feed con revalidación condicional y lo procesa en
+        streaming, liberando cada ítem una vez leído.
+
+        Returns:
+            List[Dict[str, str]]: Ítems del feed (link, title, fechas)
+        """
+        headers = {**self.get_headers(), **self.validators.headers_for(feed_url)}
+        parser = etree.XMLPullParser(
+            events=('end',),
+            resolve_entities=False,
+            no_network=True,
+            recover=True
+        )
+        items = []
+
+        def drain() -> None:
+            for _, elem in parser.read_events():
+                if not isinstance(elem.tag, str):
+                    continue
+                if etree.QName(elem).localname not in self.ITEM_TAGS:
+                    continue
+                items.append(self._read_item(elem))
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+        await self.host_limiter.wait(urlparse(feed_url).netloc)
+        async with uncached(session).get(feed_url, headers=headers) as response:
+            if response.status == 304:
+                self.logger.info(f"Feed sin cambios: {feed_url}")
+                return []
+            if response.status != 200:
+                self.logger.warning(f"Status code {response.status} para {feed_url}")
+                return []
+
+            async for chunk in response.content.iter_chunked(settings.SITEMAP_CHUNK_SIZE):
+                parser.feed(chunk)
+                drain()
+            parser.close()
+            drain()
+            self.validators.update(feed_url, response.headers)
+
+        return items
+
+    async def ingest_outlet(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        queries: List[Dict]
+    ) -> RecordBatch:
+        """
+        Consulta los feeds de un medio y retorna los ítems nuevos que
+        pertenecen a alguna de sus categorías configuradas.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            base_url (str): URL base del medio
+            queries (List[Dict]): Consultas del medio (una por categoría)
+
+        Returns:
+            RecordBatch: Resultados con la forma de process_source más
+                         los campos title y published
+        """
+        results = RecordBatch()
+        outlet = self.outlets_by_url.get(base_url)
+        if outlet is None:
+            return results
+
+        async with self.semaphore:
+            feeds = await self.discover_feeds(session, outlet)
+
+        async def poll(feed_url: str) -> List[Dict[str, str]]:
+            async with self.semaphore:
+                try:
+                    return await self.poll_feed(session, feed_url)
+                except Exception as e:
+                    self.logger.error(f"Error al procesar feed {feed_url}: {e}")
+                    return []
+
+        feed_items = await asyncio.gather(*(poll(feed_url) for feed_url in feeds))
+
+        timestamp = time.time()
+        seen = set()
+        for feed_url, items in zip(feeds, feed_items):
+            high_water_mark = parse_w3c_datetime(
+                self.state["high_water_marks"].get(feed_url)
+            )
+            newest = high_water_mark
+
+            for item in items:
+                if not item.get('link'):
+                    continue
+                published = parse_feed_date(
+                    item.get('pubDate') or item.get('published')
+                    or item.get('date') or item.get('updated')
+                )
+                if published and high_water_mark and published <= high_water_mark:
+                    continue
+                if published and (newest is None or published > newest):
+                    newest = published
+
+                link = self.pattern_matcher.clean_url(item['link'])
+                if link in seen or self.pattern_matcher.matches(link):
+                    continue
+                query = max(
+                    (q for q in queries if link.startswith(q['site'])),
+                    key=lambda q: len(q['site']),
+                    default=None
+                )
+                if query is None:
+                    continue
+
+                seen.add(link)
+                results.append(
+                    results.registry.intern(query),
+                    link,
+                    timestamp,
+                    title=item.get('title', ''),
+                    published=(
+                        published.astimezone().strftime(DATE_FORMAT)
+                        if published else ''
+                    )
+                )
+
+            if newest is not None and newest != high_water_mark:
+                self.state["high_water_marks"][feed_url] = newest.isoformat()
+
+        self.logger.info(f"Encontrados {len(results)} enlaces en feeds de {outlet.name}")
+        return results
+
+    def save(self) -> None:
+        """
+        Guarda validadores, feeds descubiertos y marcas de agua. Se llama
+        después de confirmar los resultados: si la ejecución falla antes, la
+        próxima vuelve a emitir los mismos ítems en lugar de omitirlos.
+        """
+        self.validators.save()
+        self._save_state()
+
+    async def ingest(
+        self,
+        session: aiohttp.ClientSession,
+        queries: List[Dict],
+        on_results: Optional[Callable[[RecordBatch], Awaitable[None]]] = None
+    ) -> RecordBatch:
+        """
+        Consulta en paralelo los feeds de todos los medios.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            queries (List[Dict]): Consultas a procesar
+            on_results (Callable, optional): Recibe el lote de cada medio
+                                             apenas termina, en lugar de
+                                             acumularlo (un corte por plazo
+                                             conserva lo ya entregado)
+
+        Returns:
+            RecordBatch: Resultados de todos los medios (vacío si se indicó
+                         on_results)
+        """
+        by_outlet: Dict[str, List[Dict]] = {}
+        for query in queries:
+            parsed = urlparse(query['site'])
+            by_outlet.setdefault(f"{parsed.scheme}://{parsed.netloc}", []).append(query)
+
+        results = RecordBatch()
+
+        async def ingest_and_report(base_url: str, outlet_queries: List[Dict]) -> None:
+            batch = await self.ingest_outlet(session, base_url, outlet_queries)
+            if on_results is not None:
+                if batch:
+                    await on_results(batch)
+            else:
+                results.extend(batch)
+
+        await asyncio.gather(*(
+            ingest_and_report(base_url, outlet_queries)
+            for base_url, outlet_queries in by_outlet.items()
+        ))
+        return results
+
+# Ejemplo de uso:
+"""
+from sourcesv1 import MEDIA_OUTLETS, CONSULTAS
+
+ingestor = FeedIngestor(MEDIA_OUTLETS, Path("output"))
+
+async with aiohttp.ClientSession() as session:
+    results = await ingestor.ingest(session, CONSULTAS)
+# ... guardar los resultados ...
+ingestor.save()
+"""
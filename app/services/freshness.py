@@ -0,0 +1,102 @@
+import json
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..core.config import settings
+
+class FreshnessTracker:
+    """
+    Marca de agua por fuente: momento de inicio de la última búsqueda
+    exitosa. Con ella cada ejecución pide solo la ventana transcurrida desde
+    entonces (más un solapamiento) en lugar de todo el día, de modo que las
+    páginas solicitadas por ejecución no crecen a medida que avanza el día.
+    """
+    def __init__(
+        self,
+        state_path: Path,
+        overlap_minutes: float = settings.FRESHNESS_OVERLAP_MINUTES,
+        max_window_hours: int = settings.FRESHNESS_MAX_WINDOW_HOURS
+    ):
+        """
+        Args:
+            state_path (Path): Archivo JSON con las marcas de agua
+            overlap_minutes (float): Minutos que se agregan a la ventana para
+                                     cubrir la indexación tardía del buscador
+            max_window_hours (int): Sobre esta ventana se vuelve a la
+                                    búsqueda del día completo
+        """
+        self.logger = logging.getLogger(__name__)
+        self.state_path = Path(state_path)
+        self.overlap_seconds = overlap_minutes * 60
+        self.max_window_hours = max_window_hours
+        self.marks: Dict[str, float] = self._load()
+
+    def _load(self) -> Dict[str, float]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error al cargar {self.state_path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Guarda las marcas de agua de forma atómica."""
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.marks, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error al guardar {self.state_path}: {e}")
+
+    @staticmethod
+    def key_for(query: Dict[str, str]) -> str:
+        return f"{query['site']}|{query['category']}"
+
+    def window_hours(self, query: Dict[str, str], now: Optional[float] = None) -> Optional[int]:
+        """
+        Ventana de búsqueda de la fuente.
+
+        Args:
+            query (Dict[str, str]): Consulta de la fuente
+            now (float, optional): Timestamp de referencia
+
+        Returns:
+            Optional[int]: Horas a solicitar (qdr:hN), o None para buscar el
+                           día completo (sin marca o marca muy antigua)
+        """
+        mark = self.marks.get(self.key_for(query))
+        if mark is None:
+            return None
+        now = now if now is not None else time.time()
+        hours = max(math.ceil((now - mark + self.overlap_seconds) / 3600), 1)
+        return hours if hours < self.max_window_hours else None
+
+    def mark_success(self, query: Dict[str, str], started_at: float) -> None:
+        """
+        Registra una búsqueda completa de la fuente.
+
+        Args:
+            query (Dict[str, str]): Consulta de la fuente
+            started_at (float): Timestamp de inicio de la búsqueda (el
+                                inicio, para no dejar huecos entre ventanas)
+        """
+        key = self.key_for(query)
+        self.marks[key] = max(self.marks.get(key, 0.0), started_at)
+
+# Ejemplo de uso:
+"""
+tracker = FreshnessTracker(Path("output/freshness.json"))
+started = time.time()
+window = tracker.window_hours(query)  # p.ej. 2 -> tbs=qdr:h2, None -> día completo
+results = await router.search(session, query, window_hours=window)
+tracker.mark_success(query, started)
+tracker.save()
+"""
@@ -0,0 +1,513 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from ..core.config import settings
+
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+
+class BufferedStream:
+    """Emula aiohttp.StreamReader sobre un cuerpo ya descargado."""
+    def __init__(self, body: bytes):
+        self._body = body
+        self._offset = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        if n is None or n < 0:
+            n = len(self._body) - self._offset
+        chunk = self._body[self._offset:self._offset + n]
+        self._offset += len(chunk)
+        return chunk
+
+    async def iter_chunked(self, n: int):
+        while True:
+            chunk = await self.read(n)
+            if not chunk:
+                break
+            yield chunk
+
+class CachedResponse:
+    """
+    Respuesta con el cuerpo en memoria que expone la misma interfaz que
+    aiohttp.ClientResponse usada en el proyecto (status, headers, read,
+    text, json, content).
+    """
+    def __init__(
+        self,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        from_cache: bool = False
+    ):
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.from_cache = from_cache
+        self._body = body
+        self.content = BufferedStream(body)
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None, errors: str = 'strict') -> str:
+        if encoding is None:
+            content_type = self.headers.get('Content-Type', '')
+            encoding = 'utf-8'
+            if 'charset=' in content_type:
+                encoding = content_type.split('charset=', 1)[1].split(';')[0].strip()
+        return self._body.decode(encoding, errors=errors)
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(await self.text())
+
+    def release(self) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=self.status, message=f"HTTP {self.status}"
+            )
+
+    async def __aenter__(self) -> 'CachedResponse':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
+
+@dataclass
+class CacheStats:
+    """Contadores de uso de la caché."""
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stale_served: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parsea un header Cache-Control.
+
+    Args:
+        value (str): Valor del header
+
+    Returns:
+        Dict[str, Optional[str]]: Directivas en minúsculas y sus valores
+    """
+    directives = {}
+    for part in (value or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition('=')
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+class HttpCacheStore:
+    """
+    Almacén en disco de respuestas HTTP. Los cuerpos se guardan comprimidos
+    con zlib y un índice JSON registra metadatos y último acceso, usado para
+    desalojar las entradas menos recientes (LRU) al superar el tamaño máximo.
+    """
+    def __init__(
+        self,
+        directory: Path = settings.HTTP_CACHE_DIR,
+        max_bytes: int = settings.HTTP_CACHE_MAX_BYTES,
+        max_entry_bytes: int = settings.HTTP_CACHE_MAX_ENTRY_BYTES
+    ):
+        """
+        Args:
+            directory (Path): Directorio de la caché
+            max_bytes (int): Tamaño máximo (comprimido) de todos los cuerpos
+            max_entry_bytes (int): Tamaño máximo de un cuerpo individual
+        """
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / 'index.json'
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.entries: Dict[str, Dict] = self._load_index()
+        self.stats = CacheStats()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Índice de caché inválido, se descarta: {e}")
+            return {}
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.z"
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Retorna los metadatos de una URL y marca el acceso (LRU)."""
+        entry = self.entries.get(self.key_for(url))
+        if entry is not None:
+            entry['last_access'] = time.time()
+        return entry
+
+    def _read_file(self, key: str) -> bytes:
+        with open(self._body_path(key), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def _write_file(self, key: str, body: bytes) -> int:
+        compressed = zlib.compress(body, 6)
+        tmp_path = self._body_path(key).with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, self._body_path(key))
+        return len(compressed)
+
+    def _unlink_files(self, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                self._body_path(key).unlink()
+            except OSError:
+                pass
+
+    async def read_body(self, url: str) -> Optional[bytes]:
+        """Lee y descomprime (en un hilo) el cuerpo almacenado de una URL."""
+        key = self.key_for(url)
+        try:
+            return await asyncio.to_thread(self._read_file, key)
+        except (OSError, zlib.error):
+            self.entries.pop(key, None)
+            return None
+
+    async def put(self, url: str, metadata: Dict, body: bytes) -> None:
+        """
+        Guarda una respuesta. Los cuerpos demasiado grandes no se almacenan.
+        La compresión y la escritura corren en un hilo; el índice solo se
+        modifica desde el event loop.
+
+        Args:
+            url (str): URL de la respuesta
+            metadata (Dict): Status, headers y datos de frescura
+            body (bytes): Cuerpo de la respuesta
+        """
+        if len(body) > self.max_entry_bytes:
+            return
+        key = self.key_for(url)
+        size = await asyncio.to_thread(self._write_file, key, body)
+
+        self.entries[key] = {
+            **metadata,
+            'url': url,
+            'size': size,
+            'last_access': time.time()
+        }
+        self.stats.stores += 1
+        evicted = self._evict()
+        if evicted:
+            await asyncio.to_thread(self._unlink_files, evicted)
+
+    def touch(self, url: str, metadata: Dict) -> None:
+        """Actualiza los metadatos de una entrada revalidada (304)."""
+        entry = self.entries.get(self.key_for(url))
+        if entry is not None:
+            entry.update(metadata)
+            entry['last_access'] = time.time()
+
+    def _evict(self) -> List[str]:
+        """Quita del índice las entradas menos recientes y retorna sus claves."""
+        total = sum(entry['size'] for entry in self.entries.values())
+        evicted = []
+        if total <= self.max_bytes:
+            return evicted
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= entry['size']
+            self.entries.pop(key, None)
+            evicted.append(key)
+            self.stats.evictions += 1
+        return evicted
+
+    def save(self) -> None:
+        """Guarda el índice de forma atómica."""
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.index_path)
+
+class _CachedRequest:
+    """Permite usar CachedSession.get con 'async with' y con 'await'."""
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *exc) -> None:
+        self._response.release()
+
+class CachedSession:
+    """
+    Capa de caché delante de un aiohttp.ClientSession. Respeta
+    Cache-Control (max-age, no-store, no-cache, stale-while-revalidate),
+    Expires, ETag, Last-Modified y Vary. Las respuestas vencidas se
+    revalidan con peticiones condicionales, y dentro de la ventana
+    stale-while-revalidate se sirven desde la caché mientras se revalidan
+    en segundo plano.
+
+    La caché es dueña de los validadores de lo que almacena. Los recursos
+    que el llamador revalida con su propio ValidatorStore (portadas,
+    sitemaps, feeds) usan uncached() y no pasan por aquí; una petición que
+    igual trae headers condicionales se envía directo a la sesión.
+    """
+    def __init__(self, session: aiohttp.ClientSession, store: Optional[HttpCacheStore] = None):
+        """
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP subyacente
+            store (HttpCacheStore, optional): Almacén de respuestas
+        """
+        self.logger = logging.getLogger(__name__)
+        self.session = session
+        self.store = store or HttpCacheStore()
+        self._background: Set[asyncio.Task] = set()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.store.stats
+
+    def __getattr__(self, name: str):
+        # post, close, etc. se delegan en la sesión original
+        return getattr(self.session, name)
+
+    @staticmethod
+    def _freshness(headers, now: float) -> Optional[Dict]:
+        """Calcula los datos de frescura o None si no es cacheable."""
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-store' in directives:
+            return None
+
+        max_age = 0.0
+        if 'no-cache' not in directives:
+            value = directives.get('s-maxage') or directives.get('max-age')
+            if value is not None:
+                try:
+                    max_age = float(value)
+                except ValueError:
+                    max_age = 0.0
+            elif headers.get('Expires'):
+                try:
+                    expires = parsedate_to_datetime(headers['Expires']).timestamp()
+                    max_age = max(0.0, expires - now)
+                except (TypeError, ValueError):
+                    max_age = 0.0
+
+        swr = 0.0
+        if directives.get('stale-while-revalidate'):
+            try:
+                swr = float(directives['stale-while-revalidate'])
+            except ValueError:
+                swr = 0.0
+
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if max_age <= 0 and not etag and not last_modified:
+            return None
+
+        return {
+            'expires_at': now + max_age,
+            'stale_until': now + max_age + swr,
+            'etag': etag,
+            'last_modified': last_modified
+        }
+
+    @staticmethod
+    def _vary(response_headers, request_headers: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """
+        Valores de la petición para los headers listados en Vary, o None si
+        la respuesta no es reutilizable (Vary: *).
+        """
+        names = [
+            name.strip().lower()
+            for name in response_headers.get('Vary', '').split(',')
+            if name.strip()
+        ]
+        if '*' in names:
+            return None
+        sent = {name.lower(): value for name, value in request_headers.items()}
+        return {name: sent.get(name, '') for name in names}
+
+    @staticmethod
+    def _vary_matches(entry: Dict, request_headers: Dict[str, str]) -> bool:
+        sent = {name.lower(): value for name, value in request_headers.items()}
+        return all(
+            sent.get(name, '') == value
+            for name, value in (entry.get('vary') or {}).items()
+        )
+
+    async def _from_cache(self, url: str, entry: Dict) -> Optional[CachedResponse]:
+        body = await self.store.read_body(url)
+        if body is None:
+            return None
+        return CachedResponse(url, entry['status'], entry['headers'], body, from_cache=True)
+
+    async def _fetch(self, url: str, headers: Dict[str, str], entry: Optional[Dict], **kwargs) -> CachedResponse:
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        async with self.session.get(url, headers=request_headers, **kwargs) as response:
+            now = time.time()
+            if response.status == 304 and entry is not None:
+                cached = await self._from_cache(url, entry)
+                if cached is not None:
+                    freshness = self._freshness(response.headers, now) or {
+                        'expires_at': now, 'stale_until': now
+                    }
+                    self.store.touch(url, {
+                        key: value for key, value in freshness.items() if value is not None
+                    })
+                    self.store.stats.revalidated += 1
+                    return cached
+                body = None
+            else:
+                body = await response.read()
+
+            if body is not None:
+                return await self._store_response(url, headers, response, body, now)
+
+        # El cuerpo guardado desapareció: el 304 no sirve a un llamador que no
+        # envió validadores, así que se repite la petición sin ellos
+        return await self._fetch(url, headers, None, **kwargs)
+
+    async def _store_response(
+        self,
+        url: str,
+        request_headers: Dict[str, str],
+        response,
+        body: bytes,
+        now: float
+    ) -> CachedResponse:
+        response_headers = {
+            key: value for key, value in response.headers.items()
+            if key.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')
+        }
+        self.store.stats.misses += 1
+
+        if response.status == 200:
+            freshness = self._freshness(response.headers, now)
+            vary = self._vary(response.headers, request_headers)
+            if freshness is not None and vary is not None:
+                await self.store.put(url, {
+                    'status': response.status,
+                    'headers': response_headers,
+                    'vary': vary,
+                    **freshness
+                }, body)
+
+        return CachedResponse(url, response.status, response_headers, body)
+
+    async def _revalidate(self, url: str, headers: Dict[str, str], entry: Dict, **kwargs) -> None:
+        try:
+            await self._fetch(url, headers, entry, **kwargs)
+        except Exception as e:
+            self.logger.warning(f"Error al revalidar {url} en segundo plano: {e}")
+
+    async def _get(self, url: str, headers: Dict[str, str], **kwargs) -> CachedResponse:
+        url = str(url)
+        entry = self.store.get(url)
+        now = time.time()
+        if entry is not None and not self._vary_matches(entry, headers):
+            # Variante guardada para otros headers: se pide sin validadores
+            entry = None
+
+        if entry is not None:
+            if now < entry['expires_at']:
+                cached = await self._from_cache(url, entry)
+                if cached is not None:
+                    self.store.stats.hits += 1
+                    return cached
+            elif now < entry.get('stale_until', 0):
+                cached = await self._from_cache(url, entry)
+                if cached is not None:
+                    self.store.stats.stale_served += 1
+                    # Evita que otra petición lance la misma revalidación
+                    entry['stale_until'] = now
+                    task = asyncio.ensure_future(self._revalidate(url, headers, entry, **kwargs))
+                    self._background.add(task)
+                    task.add_done_callback(self._background.discard)
+                    return cached
+
+        return await self._fetch(url, headers, entry, **kwargs)
+
+    def get(self, url, headers: Optional[Dict[str, str]] = None, **kwargs):
+        """
+        Realiza un GET pasando por la caché.
+
+        Args:
+            url: URL a solicitar
+            headers (Dict[str, str], optional): Headers de la petición
+            **kwargs: Argumentos adicionales para aiohttp
+
+        Returns:
+            Contexto asíncrono que entrega la respuesta
+        """
+        headers = headers or {}
+        if any(name in headers for name in CONDITIONAL_HEADERS):
+            return self.session.get(url, headers=headers, **kwargs)
+        return _CachedRequest(self._get(url, headers, **kwargs))
+
+    async def close(self) -> None:
+        """Espera las revalidaciones pendientes y guarda el índice."""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        self.store.save()
+        self.logger.info(f"Caché HTTP: {asdict(self.stats)}")
+
+def uncached(session):
+    """
+    Sesión HTTP sin la capa de caché. La usan los recursos que se leen en
+    streaming o cuya revalidación administra el propio llamador.
+
+    Args:
+        session: CachedSession o sesión HTTP
+
+    Returns:
+        La sesión subyacente de una CachedSession, o la misma sesión
+    """
+    return session.session if isinstance(session, CachedSession) else session
+
+# Ejemplo de uso:
+"""
+async with aiohttp.ClientSession() as session:
+    cached_session = CachedSession(session, HttpCacheStore(Path("output/http_cache")))
+
+    async with cached_session.get("https://www.latercera.com/robots.txt") as response:
+        text = await response.text()
+
+    print(cached_session.stats)
+    await cached_session.close()
+"""
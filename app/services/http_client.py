@@ -0,0 +1,182 @@
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import aiohttp
+from yarl import URL
+
+from ..core.config import Settings, settings
+
+try:
+    import brotli  # noqa: F401  aiohttp decodifica 'br' si está instalado
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate'
+
+@dataclass
+class ConnectionStats:
+    """Estadísticas de conexiones y DNS de un cliente HTTP."""
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    new_by_host: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    reused_by_host: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.new_connections + self.reused_connections
+        return self.reused_connections / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} peticiones, {self.new_connections} conexiones nuevas, "
+            f"{self.reused_connections} reutilizadas ({self.reuse_ratio:.0%}), "
+            f"DNS {self.dns_cache_hits} hits / {self.dns_cache_misses} misses"
+        )
+
+class HttpClient:
+    """
+    Cliente HTTP compartido del proyecto. Envuelve un aiohttp.ClientSession
+    configurado con límites de conexiones globales y por host, caché DNS con
+    TTL, keep-alive, negociación gzip/brotli y timeouts de conexión/lectura
+    por host. Registra estadísticas de reutilización de conexiones.
+
+    Expone la interfaz de ClientSession (get, post, ...) y puede usarse con
+    'async with'.
+    """
+    def __init__(self, config: Settings = settings, **session_kwargs):
+        """
+        Args:
+            config (Settings): Configuración a usar
+            **session_kwargs: Argumentos adicionales para ClientSession
+        """
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+        self.stats = ConnectionStats()
+        self.default_timeout = aiohttp.ClientTimeout(
+            total=config.API_TIMEOUT,
+            connect=config.HTTP_CONNECT_TIMEOUT,
+            sock_read=config.HTTP_READ_TIMEOUT
+        )
+        self._host_timeouts = {
+            host: aiohttp.ClientTimeout(
+                total=config.API_TIMEOUT,
+                connect=values.get('connect', config.HTTP_CONNECT_TIMEOUT),
+                sock_read=values.get('read', config.HTTP_READ_TIMEOUT)
+            )
+            for host, values in config.HTTP_HOST_TIMEOUTS.items()
+        }
+
+        connector = aiohttp.TCPConnector(
+            limit=config.HTTP_MAX_CONNECTIONS,
+            limit_per_host=config.HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=config.HTTP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True,
+            ssl=None if config.HTTP_SSL_VERIFY else False
+        )
+        headers = {**session_kwargs.pop('headers', {}), 'Accept-Encoding': ACCEPT_ENCODING}
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.default_timeout,
+            headers=headers,
+            trace_configs=[self._trace_config()],
+            **session_kwargs
+        )
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        stats = self.stats
+
+        async def on_request_start(session, ctx: SimpleNamespace, params) -> None:
+            stats.requests += 1
+            ctx.host = params.url.host
+
+        async def on_connection_create_end(session, ctx: SimpleNamespace, params) -> None:
+            stats.new_connections += 1
+            stats.new_by_host[getattr(ctx, 'host', None)] += 1
+
+        async def on_connection_reuseconn(session, ctx: SimpleNamespace, params) -> None:
+            stats.reused_connections += 1
+            stats.reused_by_host[getattr(ctx, 'host', None)] += 1
+
+        async def on_dns_cache_hit(session, ctx, params) -> None:
+            stats.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, ctx, params) -> None:
+            stats.dns_cache_misses += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    def timeout_for(self, url) -> aiohttp.ClientTimeout:
+        """
+        Retorna el timeout configurado para el host de la URL.
+
+        Args:
+            url: URL de la petición
+
+        Returns:
+            aiohttp.ClientTimeout: Timeout del host o el timeout por defecto
+        """
+        return self._host_timeouts.get(URL(str(url)).host, self.default_timeout)
+
+    def request(self, method: str, url, **kwargs):
+        """Realiza una petición aplicando el timeout del host."""
+        kwargs.setdefault('timeout', self.timeout_for(url))
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    async def close(self) -> None:
+        """Cierra la sesión y registra las estadísticas de conexión."""
+        if not self.session.closed:
+            await self.session.close()
+            self.logger.info(f"Cliente HTTP: {self.stats.summary()}")
+
+    async def __aenter__(self) -> 'HttpClient':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+def create_http_client(config: Optional[Settings] = None, **session_kwargs) -> HttpClient:
+    """
+    Crea el cliente HTTP compartido. Es el único punto donde se configuran
+    conectores y timeouts del proyecto.
+
+    Args:
+        config (Settings, optional): Configuración; por defecto la global
+        **session_kwargs: Argumentos adicionales para ClientSession
+
+    Returns:
+        HttpClient: Cliente listo para usar con 'async with'
+    """
+    return HttpClient(config or settings, **session_kwargs)
+
+# Ejemplo de uso:
+"""
+async with create_http_client() as client:
+    async with client.get("https://www.google.cl/search?q=test") as response:
+        html = await response.text()
+
+    print(client.stats.summary())
+"""
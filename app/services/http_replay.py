@@ -0,0 +1,201 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict
+
+import aiohttp
+
+from .http_cache import CachedResponse, _CachedRequest
+
+# Las consultas incluyen la restricción de tiempo (after:AAAA-MM-DD o la
+# ventana tbs=qdr:hN, que dependen del día y de las marcas de agua); al
+# reproducir se ignoran para encontrar la respuesta grabada
+VOLATILE_PATTERNS = (
+    re.compile(r'(?:\+|%20|\s)after:\d{4}-\d{2}-\d{2}'),
+    re.compile(r'&tbs=qdr:h\d+'),
+)
+SKIPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+def request_key(method: str, url: str, json_body=None) -> str:
+    """
+    Clave con la que se empareja una petición grabada.
+
+    Args:
+        method (str): Método HTTP
+        url (str): URL de la petición
+        json_body: Cuerpo JSON de la petición (p.ej. la consulta al shortener)
+
+    Returns:
+        str: Método, URL sin partes volátiles y hash del cuerpo JSON
+    """
+    url = str(url)
+    for pattern in VOLATILE_PATTERNS:
+        url = pattern.sub('', url)
+    key = f"{method.upper()} {url}"
+    if json_body is not None:
+        digest = hashlib.sha1(json.dumps(json_body, sort_keys=True).encode('utf-8')).hexdigest()
+        key = f"{key} {digest[:16]}"
+    return key
+
+class RecordingSession:
+    """
+    Envuelve la sesión HTTP y graba cada petición y su respuesta (status,
+    headers, cuerpo y latencia) en un cassette .jsonl.gz. Las respuestas se
+    leen completas y se entregan como CachedResponse, por lo que el corte
+    anticipado de las descargas en streaming no aplica mientras se graba.
+    El cassette también guarda el estado local que condiciona las
+    peticiones (record_meta), para fijarlo al reproducir.
+    """
+    def __init__(self, session: aiohttp.ClientSession, path: Path):
+        """
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP real
+            path (Path): Cassette de salida (.jsonl.gz)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.session = session
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = gzip.open(self.path, 'wt', encoding='utf-8')
+        self._started = time.perf_counter()
+        self.recorded = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    async def _request(self, method: str, url, **kwargs) -> CachedResponse:
+        started = time.perf_counter()
+        async with self.session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            status = response.status
+            headers = {
+                key: value for key, value in response.headers.items()
+                if key.lower() not in SKIPPED_HEADERS
+            }
+        elapsed = time.perf_counter() - started
+        self._file.write(json.dumps({
+            "key": request_key(method, url, kwargs.get('json')),
+            "method": method.upper(),
+            "url": str(url),
+            "offset": round(started - self._started, 4),
+            "elapsed": round(elapsed, 4),
+            "status": status,
+            "headers": headers,
+            "body": base64.b64encode(body).decode('ascii')
+        }, ensure_ascii=False) + '\n')
+        self.recorded += 1
+        return CachedResponse(str(url), status, headers, body)
+
+    def request(self, method: str, url, **kwargs):
+        return _CachedRequest(self._request(method, url, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def record_meta(self, name: str, value: Any) -> None:
+        """
+        Graba estado de la ejecución (p.ej. URLs de la hora anterior o
+        marcas de agua) que la reproducción debe usar en lugar del local.
+
+        Args:
+            name (str): Nombre del estado
+            value: Valor serializable a JSON
+        """
+        self._file.write(json.dumps({"meta": name, "value": value}, ensure_ascii=False) + '\n')
+
+    async def close(self) -> None:
+        """Cierra el cassette (la sesión real la cierra su dueño)."""
+        if not self._file.closed:
+            self._file.close()
+            self.logger.info(f"Grabadas {self.recorded} respuestas en {self.path}")
+
+class ReplaySession:
+    """
+    Sirve las respuestas de un cassette con la interfaz de ClientSession,
+    sin acceso a la red. Cada petición recibe la siguiente respuesta grabada
+    con la misma clave, tras esperar su latencia original dividida por
+    speed (speed=0 responde sin esperar). Una petición sin respuesta
+    grabada falla como un error de conexión.
+    """
+    def __init__(self, path: Path, speed: float = 1.0):
+        """
+        Args:
+            path (Path): Cassette grabado con RecordingSession
+            speed (float): Factor de aceleración de las latencias
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.speed = speed
+        self.closed = False
+        self.replayed = 0
+        self.missing = 0
+        # Estado grabado con RecordingSession.record_meta
+        self.meta: Dict[str, Any] = {}
+        self._responses: Dict[str, Deque[Dict]] = defaultdict(deque)
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if 'meta' in entry:
+                        self.meta[entry['meta']] = entry['value']
+                    else:
+                        self._responses[entry['key']].append(entry)
+
+    async def _request(self, method: str, url, **kwargs) -> CachedResponse:
+        key = request_key(method, url, kwargs.get('json'))
+        pending = self._responses.get(key)
+        if not pending:
+            self.missing += 1
+            raise aiohttp.ClientConnectionError(f"Sin respuesta grabada para {method.upper()} {url}")
+        entry = pending.popleft()
+        if self.speed > 0:
+            await asyncio.sleep(entry['elapsed'] / self.speed)
+        self.replayed += 1
+        return CachedResponse(str(url), entry['status'], entry['headers'], base64.b64decode(entry['body']))
+
+    def request(self, method: str, url, **kwargs):
+        return _CachedRequest(self._request(method, url, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    async def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            unused = sum(len(pending) for pending in self._responses.values())
+            self.logger.info(
+                f"Reproducidas {self.replayed} respuestas de {self.path} "
+                f"({self.missing} sin grabación, {unused} sin usar)"
+            )
+
+    async def __aenter__(self) -> 'ReplaySession':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+# Ejemplo de uso:
+"""
+# Grabación de una ejecución real
+async with create_http_client() as client:
+    session = RecordingSession(client, Path("output/traffic_20240111_10.jsonl.gz"))
+    await scraper.process_sources(session, CONSULTAS)
+    await session.close()
+
+# Reproducción sin red, con las latencias aceleradas 10 veces
+async with ReplaySession(Path("output/traffic_20240111_10.jsonl.gz"), speed=10) as session:
+    await scraper.process_sources(session, CONSULTAS)
+"""
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from ..core.config import settings
+from ..utils.records import RecordBatch
+from ..utils.simhash import SimHashIndex, simhash, tokenize
+
+class NearDuplicateDetector:
+    """
+    Detecta la misma noticia publicada por distintos medios con URLs
+    diferentes (p.ej. notas de agencia). Calcula una huella SimHash del
+    título y snippet de cada resultado y la agrupa con un índice LSH de
+    ventana deslizante que se conserva entre ejecuciones.
+
+    En modo 'mark' los duplicados se marcan con el campo near_duplicate_of;
+    en modo 'collapse' se eliminan de la salida.
+    """
+    MODES = ('off', 'mark', 'collapse')
+
+    def __init__(
+        self,
+        state_path: Path,
+        mode: str = 'mark',
+        max_distance: int = settings.NEAR_DUP_MAX_DISTANCE,
+        window_hours: int = settings.NEAR_DUP_WINDOW_HOURS,
+        min_tokens: int = settings.NEAR_DUP_MIN_TOKENS
+    ):
+        """
+        Args:
+            state_path (Path): Archivo JSON con las huellas de la ventana
+            mode (str): 'off', 'mark' o 'collapse'
+            max_distance (int): Distancia de Hamming máxima entre duplicados
+            window_hours (int): Horas que una huella permanece en el índice
+            min_tokens (int): Tokens mínimos para calcular una huella fiable
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de near-duplicados desconocido: {mode}")
+        self.logger = logging.getLogger(__name__)
+        self.state_path = Path(state_path)
+        self.mode = mode
+        self.min_tokens = min_tokens
+        self.index = SimHashIndex(max_distance, window_hours * 3600)
+        self.duplicates = 0
+        self._load()
+
+    def _load(self) -> None:
+        if self.mode == 'off' or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error al cargar {self.state_path}: {e}")
+            return
+        for url, fingerprint, timestamp, cluster in sorted(items, key=lambda item: item[2]):
+            self.index.insert(url, int(fingerprint, 16), timestamp, cluster)
+        self.index.evict(time.time())
+
+    def save(self) -> None:
+        """Guarda de forma atómica las huellas vigentes de la ventana."""
+        if self.mode == 'off':
+            return
+        items = [
+            [url, format(fingerprint, '016x'), timestamp, cluster]
+            for url, (fingerprint, timestamp, cluster) in self.index.items.items()
+        ]
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(items, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error al guardar {self.state_path}: {e}")
+
+    def process(self, batch: RecordBatch) -> RecordBatch:
+        """
+        Marca o elimina los near-duplicados de un lote.
+
+        Args:
+            batch (RecordBatch): Resultados con title/snippet en sus extras
+
+        Returns:
+            RecordBatch: El mismo lote marcado, o uno sin duplicados en modo collapse
+        """
+        if self.mode == 'off' or not len(batch):
+            return batch
+
+        duplicates = set()
+        for index, url in enumerate(batch.urls):
+            extra = batch.get_extra(index)
+            tokens = tokenize(f"{extra.get('title', '')} {extra.get('snippet', '')}")
+            if len(tokens) < self.min_tokens:
+                continue
+            cluster = self.index.add(url, simhash(tokens), batch.timestamps[index])
+            if cluster != url:
+                duplicates.add(url)
+                batch.set_extra(index, near_duplicate_of=cluster)
+
+        if duplicates:
+            self.duplicates += len(duplicates)
+            self.logger.info(f"Detectados {len(duplicates)} near-duplicados entre medios")
+        if self.mode == 'collapse' and duplicates:
+            return batch.filter(lambda url: url not in duplicates)
+        return batch
+
+# Ejemplo de uso:
+"""
+detector = NearDuplicateDetector(Path("output/near_duplicates.json"), mode="mark")
+batch = detector.process(batch)
+detector.save()
+"""
@@ -0,0 +1,189 @@
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Marca de fin de flujo que recorre las etapas al cerrar el pipeline
+_END = object()
+
+Handler = Callable[[Any], Union[Any, Awaitable[Any]]]
+
+@dataclass
+class StageStats:
+    """Métricas de una etapa del pipeline."""
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    max_queue: int = 0
+
+class Stage:
+    """
+    Etapa del pipeline: workers concurrentes que toman elementos de una cola
+    acotada, los procesan con handler y entregan el resultado a la etapa
+    siguiente. Si handler retorna None (o un lote vacío) el elemento no
+    continúa. Las etapas con estado (p.ej. near-duplicados o la escritura
+    del archivo) deben usar un solo worker. Un error en handler no se
+    pierde: se guarda la primera excepción y el pipeline la relanza.
+    """
+    def __init__(self, name: str, handler: Handler, workers: int = 1, queue_size: int = 8):
+        """
+        Args:
+            name (str): Nombre de la etapa (para logs y métricas)
+            handler (Callable): Función o corrutina que procesa un elemento
+            workers (int): Elementos procesados en paralelo
+            queue_size (int): Capacidad de la cola de entrada
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(workers, 1)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = StageStats()
+        self.next: Optional['Stage'] = None
+        self.error: Optional[Exception] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def _process(self, item: Any) -> Any:
+        result = self.handler(item)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self.queue.get()
+            try:
+                if item is _END:
+                    return
+                self.stats.items_in += 1
+                started = time.perf_counter()
+                try:
+                    result = await self._process(item)
+                except Exception as e:
+                    self.stats.errors += 1
+                    logger.exception(f"Error en la etapa {self.name}")
+                    if self.error is None:
+                        self.error = e
+                    continue
+                finally:
+                    self.stats.busy_seconds += time.perf_counter() - started
+                # None o un lote vacío no continúan; len() es opcional
+                if result is None or (hasattr(result, '__len__') and not len(result)):
+                    continue
+                self.stats.items_out += 1
+                if self.next is not None:
+                    # put espera si la etapa siguiente está saturada: contrapresión
+                    await self.next.put(result)
+            finally:
+                self.queue.task_done()
+
+    async def put(self, item: Any) -> None:
+        await self.queue.put(item)
+        self.stats.max_queue = max(self.stats.max_queue, self.queue.qsize())
+
+    def start(self) -> None:
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def close(self) -> None:
+        """Espera a que se procesen los elementos pendientes y detiene los workers."""
+        for _ in self._tasks:
+            await self.queue.put(_END)
+        await asyncio.gather(*self._tasks)
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+class Pipeline:
+    """
+    Etapas concurrentes conectadas por colas asyncio acotadas. Cada lote
+    avanza a la etapa siguiente apenas termina la anterior, sin esperar al
+    resto de la ejecución; las colas acotadas frenan al productor cuando una
+    etapa se atrasa, de modo que la memoria se mantiene estable. Si una
+    etapa falla, put y close relanzan su primera excepción: el lote fallido
+    no se pierde en silencio mientras el resto de la ejecución se confirma.
+    """
+    def __init__(self, stages: List[Stage]):
+        """
+        Args:
+            stages (List[Stage]): Etapas en orden
+        """
+        if not stages:
+            raise ValueError("El pipeline necesita al menos una etapa")
+        self.stages = stages
+        for current, following in zip(stages, stages[1:]):
+            current.next = following
+        self._started = False
+
+    async def __aenter__(self) -> 'Pipeline':
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.close()
+        else:
+            self.cancel()
+
+    def start(self) -> None:
+        for stage in self.stages:
+            stage.start()
+        self._started = True
+
+    def _raise_error(self) -> None:
+        for stage in self.stages:
+            if stage.error is not None:
+                raise stage.error
+
+    async def put(self, item: Any) -> None:
+        """
+        Entrega un elemento a la primera etapa (espera si está saturada).
+
+        Raises:
+            Exception: El primer error de una etapa, para detener al productor
+        """
+        self._raise_error()
+        await self.stages[0].put(item)
+
+    async def close(self) -> None:
+        """
+        Cierra el pipeline en orden: cada etapa termina lo pendiente antes
+        de que se cierre la siguiente, por lo que no se pierden elementos.
+
+        Raises:
+            Exception: El primer error de una etapa, si lo hubo
+        """
+        if not self._started:
+            return
+        for stage in self.stages:
+            await stage.close()
+        self._started = False
+        for stage in self.stages:
+            logger.info(
+                f"Etapa {stage.name}: {stage.stats.items_in} lotes, "
+                f"{stage.stats.items_out} entregados, {stage.stats.errors} errores, "
+                f"ocupada {stage.stats.busy_seconds:.2f}s, "
+                f"cola máx {stage.stats.max_queue}/{stage.queue.maxsize} "
+                f"({stage.workers} workers)"
+            )
+        self._raise_error()
+
+    def cancel(self) -> None:
+        for stage in self.stages:
+            stage.cancel()
+        self._started = False
+
+# Ejemplo de uso:
+"""
+async with Pipeline([
+    Stage("dedupe", dedupe, workers=2),
+    Stage("near_duplicates", detector.process),
+    Stage("persist", persist),
+    Stage("deliver", deliver, workers=1),
+]) as pipeline:
+    await scraper.process_sources(session, CONSULTAS, on_results=pipeline.put)
+"""
@@ -1,7 +1,15 @@
 from datetime import datetime
 import asyncio
+import fcntl
+import mmap
+import multiprocessing
+import os
 import random
-from typing import Optional
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
 from ..core.config import settings
 
 class RateLimiter:
@@ -66,6 +74,160 @@ class RateLimiter:
         await self.wait()
         return await func(*args, **kwargs)
 
+class HostRateLimiter:
+    """
+    Mantiene un intervalo mínimo entre peticiones a un mismo host.
+    Hosts distintos no se bloquean entre sí, lo que permite consultar
+    varios medios en paralelo sin sobrecargar ninguno.
+    """
+    def __init__(self, min_interval: float = settings.CRAWLER_HOST_DELAY):
+        self.min_interval = min_interval
+        self.last_call_time: Dict[str, float] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    async def wait(self, host: str) -> None:
+        """
+        Espera hasta que se pueda realizar una nueva petición al host.
+        
+        Args:
+            host (str): Host de destino (p.ej. www.latercera.com)
+        """
+        lock = self.locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            elapsed = loop.time() - self.last_call_time.get(host, float('-inf'))
+            if elapsed < self.min_interval:
+                await asyncio.sleep(self.min_interval - elapsed)
+            self.last_call_time[host] = loop.time()
+
+class SharedRateLimiter:
+    """
+    Presupuesto de peticiones compartido por todos los procesos del host
+    (cron superpuestos, API y script). El estado, el próximo turno libre y
+    la cantidad de turnos entregados, vive en un archivo mapeado en memoria;
+    cada reserva lo actualiza bajo un lock fcntl.flock exclusivo que se
+    mantiene solo unos microsegundos. La espera posterior ocurre fuera del
+    lock y en el event loop, sin bloquearlo.
+    """
+    STATE = struct.Struct('<dQ')
+    # Un turno reservado más allá de este margen indica un cambio del reloj
+    MAX_AHEAD_SECONDS = 3600.0
+
+    def __init__(self, path: Path, calls_per_second: float = settings.CALLS_PER_SECOND):
+        """
+        Args:
+            path (Path): Archivo de estado (uno por presupuesto, p.ej. por motor)
+            calls_per_second (float): Tasa máxima conjunta de todos los procesos
+        """
+        self.path = Path(path)
+        self.calls_per_second = calls_per_second
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < self.STATE.size:
+            # Varios procesos pueden extenderlo a la vez: queda en ceros igual
+            os.ftruncate(self._fd, self.STATE.size)
+        self._map = mmap.mmap(self._fd, self.STATE.size)
+
+    def reserve(self) -> float:
+        """
+        Reserva el próximo turno del presupuesto compartido.
+
+        Returns:
+            float: Segundos que hay que esperar hasta el turno reservado
+        """
+        interval = 1.0 / self.calls_per_second
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            next_allowed, grants = self.STATE.unpack_from(self._map)
+            now = time.time()
+            if next_allowed - now > self.MAX_AHEAD_SECONDS:
+                next_allowed = now
+            slot = max(now, next_allowed)
+            self.STATE.pack_into(self._map, 0, slot + interval, grants + 1)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return slot - now
+
+    async def wait(self) -> None:
+        """Espera el turno reservado en el presupuesto compartido."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def available_in(self) -> float:
+        """Segundos hasta el próximo turno libre (lectura sin lock)."""
+        next_allowed, _ = self.STATE.unpack_from(self._map)
+        return max(next_allowed - time.time(), 0.0)
+
+    @property
+    def grants(self) -> int:
+        """Turnos entregados por todos los procesos desde que existe el archivo."""
+        return self.STATE.unpack_from(self._map)[1]
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self._map.close()
+            os.close(self._fd)
+            self._fd = None
+
+def _contention_worker(path: str, calls: int, barrier, results) -> None:
+    limiter = SharedRateLimiter(Path(path), calls_per_second=1e9)
+    barrier.wait()
+    start = time.perf_counter()
+    for _ in range(calls):
+        limiter.reserve()
+    results.put(time.perf_counter() - start)
+    limiter.close()
+
+def benchmark_contention(
+    path: Path,
+    processes: tuple = (1, 2, 4, 8),
+    calls: int = 20000
+) -> List[Dict]:
+    """
+    Mide el costo de una reserva en el limitador compartido con varios
+    procesos compitiendo por el lock (tasa ilimitada: solo se mide el lock
+    y el acceso al estado mapeado).
+
+    Args:
+        path (Path): Archivo de estado temporal
+        processes (tuple): Cantidades de procesos a probar
+        calls (int): Reservas por proceso
+
+    Returns:
+        List[Dict]: Reservas por segundo y microsegundos por reserva
+    """
+    context = multiprocessing.get_context('fork')
+    rows = []
+    for count in processes:
+        barrier = context.Barrier(count)
+        results = context.Queue()
+        workers = [
+            context.Process(target=_contention_worker, args=(str(path), calls, barrier, results))
+            for _ in range(count)
+        ]
+        for worker in workers:
+            worker.start()
+        elapsed = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        wall = max(elapsed)
+        rows.append({
+            "processes": count,
+            "reservations_per_second": int(count * calls / wall),
+            "us_per_reservation": round(sum(elapsed) / (count * calls) * 1e6, 2)
+        })
+    return rows
+
+if __name__ == "__main__":
+    import tempfile
+
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"{'procesos':>10}{'reservas/s':>14}{'µs/reserva':>14}")
+        for row in benchmark_contention(Path(tmp_dir) / 'bench.rl', calls=calls):
+            print(f"{row['processes']:>10}{row['reservations_per_second']:>14}{row['us_per_reservation']:>14}")
+
 # Ejemplo de uso:
 """
 limiter = RateLimiter()
@@ -85,4 +247,14 @@ async def make_request():
     pass
 
 result = await limiter.with_rate_limit(make_request)
+
+# Politeness por host
+host_limiter = HostRateLimiter(min_interval=1.0)
+await host_limiter.wait("www.latercera.com")
+
+# Presupuesto compartido por todos los procesos del host
+shared = SharedRateLimiter(settings.RATE_LIMIT_STATE_DIR / "google.rl", calls_per_second=0.2)
+await shared.wait()
+
+# Benchmark de contención: python -m app.services.rate_limiter 20000
 """
\ No newline at end of file
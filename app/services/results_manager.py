@@ -1,25 +1,29 @@
-import aiofiles
-import json
+import asyncio
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from datetime import datetime, timedelta
 import logging
 from ..core.config import settings
+from ..utils.records import RecordBatch
+from .serializers import SERIALIZERS, ResultWriter, get_serializer, load_records
 
 class ResultsManager:
     """
     Maneja el almacenamiento y recuperación de resultados del scraper,
     incluyendo la lógica para cargar resultados previos y filtrar duplicados.
     """
-    def __init__(self, output_path: Optional[Path] = None):
+    def __init__(self, output_path: Optional[Path] = None, output_format: Optional[str] = None):
         """
         Inicializa el gestor de resultados.
         
         Args:
             output_path (Path, optional): Ruta del directorio de salida.
                                         Si no se proporciona, usa la del settings.
+            output_format (str, optional): Formato de salida (ver serializers).
+                                         Si no se proporciona, usa el del settings.
         """
         self.output_path = Path(output_path or settings.OUTPUT_DIR)
+        self.serializer = get_serializer(output_format or settings.OUTPUT_FORMAT)
         self.logger = logging.getLogger(__name__)
         self._ensure_output_dir()
 
@@ -27,17 +31,27 @@ class ResultsManager:
         """Asegura que el directorio de salida existe."""
         self.output_path.mkdir(parents=True, exist_ok=True)
 
-    def _get_filename(self, timestamp: datetime) -> str:
+    def _get_filename(self, timestamp: datetime, extension: Optional[str] = None) -> str:
         """
         Genera el nombre del archivo basado en timestamp.
         
         Args:
             timestamp (datetime): Marca de tiempo para el nombre del archivo
+            extension (str, optional): Extensión; por defecto la del formato
             
         Returns:
-            str: Nombre del archivo en formato linkerer_YYYYMMDD_HH.json
+            str: Nombre del archivo en formato linkerer_YYYYMMDD_HH.<ext>
         """
-        return f'linkerer_{timestamp.strftime("%Y%m%d_%H")}.json'
+        return f'linkerer_{timestamp.strftime("%Y%m%d_%H")}{extension or self.serializer.extension}'
+
+    async def _try_load_hour(self, timestamp: datetime) -> Optional[List[Dict]]:
+        """Intenta cargar la salida de una hora en cualquiera de los formatos."""
+        extensions = [self.serializer.extension] + [s.extension for s in SERIALIZERS.values()]
+        for extension in dict.fromkeys(extensions):
+            result = await self._try_load_file(self._get_filename(timestamp, extension))
+            if result:
+                return result
+        return None
 
     async def load_previous_results(self) -> List[Dict]:
         """
@@ -50,8 +64,7 @@ class ResultsManager:
         previous_hour = current_hour - timedelta(hours=1)
         
         # Intentar archivo de hora anterior
-        filename = self._get_filename(previous_hour)
-        result = await self._try_load_file(filename)
+        result = await self._try_load_hour(previous_hour)
         if result:
             self.logger.info(f"Cargados {len(result)} resultados de la hora anterior")
             return result
@@ -59,8 +72,7 @@ class ResultsManager:
         # Si es madrugada (0-6h), intentar archivo de 23h del día anterior
         if 0 <= current_hour.hour <= 6:
             yesterday_23 = current_hour.replace(hour=23) - timedelta(days=1)
-            filename = self._get_filename(yesterday_23)
-            result = await self._try_load_file(filename)
+            result = await self._try_load_hour(yesterday_23)
             if result:
                 self.logger.info(f"Cargados {len(result)} resultados del día anterior")
                 return result
@@ -83,30 +95,31 @@ class ResultsManager:
             return None
         
         try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                return json.loads(content)
+            return await asyncio.to_thread(load_records, file_path)
         except Exception as e:
             self.logger.error(f"Error al cargar {file_path}: {e}")
             return None
 
     @staticmethod
     def filter_new_results(
-        new_results: List[Dict],
+        new_results: Union[RecordBatch, List[Dict]],
         previous_results: List[Dict]
-    ) -> List[Dict]:
+    ) -> Union[RecordBatch, List[Dict]]:
         """
         Filtra los resultados nuevos que no están en los resultados previos.
         
         Args:
-            new_results (List[Dict]): Nuevos resultados a filtrar
+            new_results (RecordBatch | List[Dict]): Nuevos resultados a filtrar
             previous_results (List[Dict]): Resultados previos para comparar
             
         Returns:
-            List[Dict]: Lista de resultados únicos
+            RecordBatch | List[Dict]: Resultados únicos, del mismo tipo recibido
         """
         previous_urls = {r['url'] for r in previous_results}
-        filtered_results = [r for r in new_results if r['url'] not in previous_urls]
+        if isinstance(new_results, RecordBatch):
+            filtered_results = new_results.filter(lambda url: url not in previous_urls)
+        else:
+            filtered_results = [r for r in new_results if r['url'] not in previous_urls]
         
         duplicate_count = len(new_results) - len(filtered_results)
         if duplicate_count > 0:
@@ -114,12 +127,12 @@ class ResultsManager:
             
         return filtered_results
 
-    async def save_results(self, results: List[Dict]) -> Optional[Path]:
+    async def save_results(self, results: Union[RecordBatch, List[Dict]]) -> Optional[Path]:
         """
-        Guarda los resultados en un archivo JSON.
+        Guarda los resultados en el formato configurado, de forma atómica.
         
         Args:
-            results (List[Dict]): Resultados a guardar
+            results (RecordBatch | List[Dict]): Resultados a guardar
             
         Returns:
             Optional[Path]: Ruta del archivo guardado o None si hay error
@@ -132,12 +145,12 @@ class ResultsManager:
         file_path = self.output_path / self._get_filename(timestamp)
         
         try:
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(
-                    results,
-                    indent=2,
-                    ensure_ascii=False
-                ))
+            if isinstance(results, RecordBatch):
+                writer = ResultWriter(file_path, self.serializer)
+                await writer.append(results)
+                await writer.commit()
+            else:
+                await asyncio.to_thread(self.serializer.dump, results, file_path)
             self.logger.info(f"Guardados {len(results)} resultados en {file_path}")
             return file_path
         except Exception as e:
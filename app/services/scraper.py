@@ -1,5 +1,6 @@
 # app/services/scraper.py
 from typing import List, Dict, Optional, Literal
+import asyncio
 import logging
 import re
 from datetime import datetime
@@ -8,14 +9,16 @@ from bs4 import BeautifulSoup
 import aiohttp
 from aiohttp import ClientSession
 
-from ..core.config import GOOGLE_ERROR_TERMS, USER_AGENTS
-from ..services.rate_limiter import RateLimiter
+from ..core.config import GOOGLE_ERROR_TERMS, USER_AGENTS, settings
+from ..services.rate_limiter import SharedRateLimiter
 
 logger = logging.getLogger(__name__)
 
 class GoogleScraper:
     def __init__(self, calls_per_second: float = 0.2):
-        self.rate_limiter = RateLimiter(calls_per_second)
+        # El mismo presupuesto que usa linkerer.py: la API y el script
+        # comparten el límite de Google en el host
+        self.rate_limiter = SharedRateLimiter(settings.RATE_LIMIT_STATE_DIR / 'google.rl', calls_per_second)
 
     def get_headers(self) -> Dict[str, str]:
         """Genera headers aleatorios para las peticiones."""
@@ -35,6 +38,7 @@ class GoogleScraper:
         """Realiza la petición HTTP y maneja errores."""
         try:
             await self.rate_limiter.wait()
+            await asyncio.sleep(random.uniform(settings.MIN_DELAY, settings.MAX_DELAY))
             async with session.get(url, headers=headers) as response:
                 if response.status == 429:
                     logger.warning(f"Google bloqueó el acceso (429) para {url}")
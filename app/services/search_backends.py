@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import random
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Dict, List, Literal, Optional, Sequence, Tuple, Union
+from urllib.parse import quote_plus
+
+from ..utils.profiling import NULL_PROFILER
+from .serp_parser import (
+    BLOCK_MARKERS, RESULTS_END_MARKERS, SerpPage, SerpResult,
+    parse_duckduckgo, parse_serp, read_serp
+)
+
+logger = logging.getLogger(__name__)
+
+ERROR_429 = "ERROR_429"
+
+class SearchBlocked(Exception):
+    """El motor de búsqueda respondió con un bloqueo (429, captcha, ...)."""
+
+class SearchFailed(Exception):
+    """
+    La búsqueda no se completó (status distinto de 200, error de red, o un
+    bloqueo al pedir la página 2 o siguientes). Se distingue de una
+    búsqueda sin resultados para no avanzar las marcas de agua de frescura
+    sobre un periodo que no se consultó.
+    """
+
+class SearchBackend(ABC):
+    """
+    Motor de búsqueda usado para descubrir enlaces. Cada implementación
+    define cómo construir la consulta, cómo detectar un bloqueo y cómo
+    extraer los resultados; la descarga en streaming y el presupuesto de
+    peticiones propio son comunes.
+    """
+    name = ''
+    default_base_url = ''
+    block_markers: Tuple[bytes, ...] = BLOCK_MARKERS
+    end_markers: Tuple[bytes, ...] = RESULTS_END_MARKERS
+    results_per_page = 10
+    max_pages = 2
+
+    def __init__(
+        self,
+        rate_limiter,
+        base_url: Optional[str] = None,
+        delay_range: Tuple[float, float] = (0.0, 0.0),
+        profiler=None
+    ):
+        """
+        Args:
+            rate_limiter: Presupuesto de peticiones propio del motor
+                          (objeto con wait() y available_in())
+            base_url (str, optional): URL base (p.ej. un servidor de prueba local)
+            delay_range (Tuple[float, float]): Espera aleatoria antes de cada petición
+            profiler (StageProfiler, optional): Perfila la extracción como 'extract_links'
+        """
+        self.rate_limiter = rate_limiter
+        self.base_url = (base_url or self.default_base_url).rstrip('/')
+        self.delay_range = delay_range
+        self.profiler = profiler or NULL_PROFILER
+
+    @abstractmethod
+    def build_url(self, query: Dict[str, str], page: int = 0, window_hours: Optional[int] = None) -> str:
+        """
+        Construye la URL de búsqueda.
+
+        Args:
+            query (Dict[str, str]): Consulta de la fuente (site, category)
+            page (int): Página de resultados
+            window_hours (int, optional): Solo resultados de las últimas N
+                                          horas; None para el día completo
+        """
+
+    @abstractmethod
+    def extract(self, page: SerpPage, offset: int = 0) -> List[SerpResult]:
+        """Extrae los resultados de la página leída."""
+
+    def is_blocked_status(self, status: int) -> bool:
+        return status == 429
+
+    async def search(
+        self,
+        session,
+        query: Dict[str, str],
+        page: int = 0,
+        headers: Optional[Dict[str, str]] = None,
+        window_hours: Optional[int] = None
+    ) -> List[SerpResult]:
+        """
+        Ejecuta una búsqueda respetando el presupuesto del motor.
+
+        Returns:
+            List[SerpResult]: Resultados (vacío si la página no tiene)
+
+        Raises:
+            SearchBlocked: Si el motor bloqueó la petición
+            SearchFailed: Ante un status distinto de 200 o un error de red
+        """
+        await self.rate_limiter.wait()
+        url = self.build_url(query, page, window_hours)
+        await asyncio.sleep(random.uniform(*self.delay_range))
+        try:
+            async with session.get(url, headers=headers) as response:
+                if self.is_blocked_status(response.status):
+                    raise SearchBlocked(f"{self.name} bloqueó el acceso ({response.status}) para {url}")
+                if response.status != 200:
+                    logger.warning(f"Status code {response.status} para {url}")
+                    raise SearchFailed(f"{self.name} respondió {response.status} para {url}")
+                serp = await read_serp(response, self.block_markers, self.end_markers)
+        except (SearchBlocked, SearchFailed):
+            raise
+        except Exception as err:
+            logger.error(f"Error al solicitar {url}: {err}")
+            raise SearchFailed(f"Error al solicitar {url}: {err}") from err
+
+        if serp.blocked:
+            raise SearchBlocked(
+                f"{self.name} detectó tráfico inusual para {url} "
+                f"(abortado tras {serp.bytes_read} bytes)"
+            )
+        with self.profiler.stage('extract_links'):
+            results = self.extract(serp, page * self.results_per_page)
+        for result in results:
+            result.engine = self.name
+        return results
+
+class GoogleBackend(SearchBackend):
+    """
+    Búsqueda en google.cl restringida al sitio y al día actual, o a las
+    últimas N horas (tbs=qdr:hN) si se indica una ventana.
+    """
+    name = 'google'
+    default_base_url = 'https://www.google.cl'
+
+    def build_url(self, query: Dict[str, str], page: int = 0, window_hours: Optional[int] = None) -> str:
+        start = page * self.results_per_page
+        if window_hours:
+            terms = f"site:{query['site']}+{query['category'].lower()}&tbs=qdr:h{window_hours}"
+        else:
+            terms = (
+                f"site:{query['site']}"
+                f"+after:{datetime.now().strftime('%Y-%m-%d')}"
+                f"+{query['category'].lower()}"
+            )
+        return f"{self.base_url}/search?q={terms}{'&start=' + str(start) if start > 0 else ''}"
+
+    def extract(self, page: SerpPage, offset: int = 0) -> List[SerpResult]:
+        return parse_serp(page.body, offset=offset, encoding=page.encoding)
+
+class DuckDuckGoBackend(SearchBackend):
+    """Versión HTML de DuckDuckGo (sin JavaScript), filtrada al último día."""
+    name = 'duckduckgo'
+    default_base_url = 'https://html.duckduckgo.com'
+    block_markers = (b'anomaly-modal', b'captcha', b'unusual traffic')
+    end_markers = (b'class="nav-link"',)
+    max_pages = 1
+
+    def is_blocked_status(self, status: int) -> bool:
+        # DuckDuckGo responde 202 con un desafío cuando limita el tráfico
+        return status in (202, 403, 429)
+
+    def build_url(self, query: Dict[str, str], page: int = 0, window_hours: Optional[int] = None) -> str:
+        # df solo admite día/semana/mes: la ventana horaria no se aplica
+        terms = quote_plus(f"site:{query['site']} {query['category'].lower()}")
+        return f"{self.base_url}/html/?q={terms}&df=d&kl=cl-es"
+
+    def extract(self, page: SerpPage, offset: int = 0) -> List[SerpResult]:
+        return parse_duckduckgo(page.body, offset=offset, encoding=page.encoding)
+
+SEARCH_BACKENDS = {
+    backend.name: backend for backend in (GoogleBackend, DuckDuckGoBackend)
+}
+
+class SearchRouter:
+    """
+    Failover entre motores de búsqueda en orden de preferencia. Cada
+    búsqueda va al primer motor que no está en pausa, aunque su presupuesto
+    obligue a esperar; solo cuando un motor bloquea (429, captcha) queda en
+    pausa durante cooldown segundos y la búsqueda se reintenta en el
+    siguiente.
+    """
+    def __init__(self, backends: Sequence[SearchBackend], cooldown: float = 900.0):
+        """
+        Args:
+            backends (Sequence[SearchBackend]): Motores en orden de preferencia
+            cooldown (float): Segundos de pausa de un motor tras un bloqueo
+        """
+        self.backends = list(backends)
+        self.cooldown = cooldown
+        self.blocked_until: Dict[str, float] = {}
+        self.stats: Dict[str, Dict[str, int]] = {
+            backend.name: {"searches": 0, "blocked": 0, "failed": 0} for backend in self.backends
+        }
+
+    def available(self, page: int = 0, backend: Optional[str] = None) -> List[SearchBackend]:
+        """
+        Motores no bloqueados que soportan la página, en orden de preferencia.
+
+        Args:
+            page (int): Página de resultados
+            backend (str, optional): Solo considera este motor
+        """
+        now = asyncio.get_running_loop().time()
+        return [
+            candidate for candidate in self.backends
+            if page < candidate.max_pages
+            and self.blocked_until.get(candidate.name, 0.0) <= now
+            and (backend is None or candidate.name == backend)
+        ]
+
+    async def search(
+        self,
+        session,
+        query: Dict[str, str],
+        page: int = 0,
+        headers_factory: Optional[Callable[[], Dict[str, str]]] = None,
+        window_hours: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> Union[List[SerpResult], Literal["ERROR_429"]]:
+        """
+        Busca en el primer motor disponible, pasando al siguiente si está bloqueado.
+
+        Args:
+            backend (str, optional): Fija el motor (p.ej. la página 2 va al
+                                     motor que entregó la página 1)
+
+        Returns:
+            List[SerpResult] | "ERROR_429": Resultados, o ERROR_429 si todos
+                                            los motores están bloqueados en
+                                            la primera página
+
+        Raises:
+            SearchFailed: Si el motor no completó la búsqueda (no se
+                          cambia de motor: no es un bloqueo), o si la página
+                          2 o siguientes quedó bloqueada: las páginas ya
+                          obtenidas se conservan y la ejecución sigue
+        """
+        candidates = self.available(page, backend)
+        if not candidates:
+            if page == 0:
+                return ERROR_429
+            if any(
+                page < candidate.max_pages and (backend is None or candidate.name == backend)
+                for candidate in self.backends
+            ):
+                raise SearchFailed(f"Página {page + 1} no disponible: motor en pausa")
+            return []
+
+        for candidate in candidates:
+            headers = headers_factory() if headers_factory else None
+            try:
+                results = await candidate.search(session, query, page, headers, window_hours)
+            except SearchBlocked as e:
+                logger.warning(f"{e}; se pausa {candidate.name} por {self.cooldown:.0f}s")
+                self.stats[candidate.name]["blocked"] += 1
+                self.blocked_until[candidate.name] = asyncio.get_running_loop().time() + self.cooldown
+                continue
+            except SearchFailed:
+                self.stats[candidate.name]["failed"] += 1
+                raise
+            self.stats[candidate.name]["searches"] += 1
+            if results:
+                logger.info(
+                    f"Encontrados {len(results)} enlaces para {query['source']} - "
+                    f"Categoría: {query['category']} (página {page + 1}, {candidate.name})"
+                )
+            return results
+        if page > 0:
+            raise SearchFailed(f"Página {page + 1} bloqueada en todos los motores")
+        return ERROR_429
+
+# Ejemplo de uso:
+"""
+router = SearchRouter([
+    GoogleBackend(RateLimiter(0.2)),
+    DuckDuckGoBackend(RateLimiter(0.2)),
+    # Servidor local de prueba:
+    # GoogleBackend(RateLimiter(10), base_url="http://127.0.0.1:8080"),
+])
+results = await router.search(session, query)
+if results == ERROR_429:
+    print("Todos los motores están bloqueados")
+"""
@@ -0,0 +1,370 @@
+import base64
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .serializers import get_serializer, load_records
+
+HOURLY_FILE_PATTERN = re.compile(r'^linkerer_(\d{8})_(\d{2})\.')
+SEGMENT_FORMAT = 'ndjson.gz'
+
+def slugify(value: str) -> str:
+    """Normaliza un valor para usarlo como nombre de partición."""
+    slug = re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-')
+    return slug or 'sin-valor'
+
+class BloomFilter:
+    """
+    Filtro de Bloom para resumir las URLs de un segmento. Permite descartar
+    segmentos sin leerlos; los positivos deben confirmarse leyendo el segmento.
+    """
+    def __init__(self, bits: int, hashes: int, data: Optional[bytearray] = None):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = data if data is not None else bytearray((bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.01) -> 'BloomFilter':
+        capacity = max(capacity, 1)
+        bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes)
+
+    def _positions(self, value: str) -> Iterator[int]:
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def to_dict(self) -> Dict:
+        return {
+            "bits": self.bits,
+            "hashes": self.hashes,
+            "data": base64.b64encode(bytes(self.data)).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, value: Dict) -> 'BloomFilter':
+        return cls(value["bits"], value["hashes"], bytearray(base64.b64decode(value["data"])))
+
+class SegmentStore:
+    """
+    Almacén particionado de resultados históricos. Los archivos horarios
+    (linkerer_YYYYMMDD_HH.*) se compactan en segmentos diarios comprimidos
+    particionados por fecha/categoría/holding:
+
+        store/date=2024-01-11/category=nacional/holding=copesa/segment-000.ndjson.gz
+
+    Un manifiesto registra por segmento su rango de fechas, fuentes, cantidad
+    de registros y un filtro de Bloom de sus URLs, de modo que las consultas
+    solo abren los segmentos relevantes.
+    """
+    def __init__(self, output_path: Path, delete_hourly: bool = True):
+        """
+        Args:
+            output_path (Path): Directorio de salida (donde están los horarios)
+            delete_hourly (bool): Si se eliminan los horarios ya compactados
+        """
+        self.logger = logging.getLogger(__name__)
+        self.output_path = Path(output_path)
+        self.root = self.output_path / 'store'
+        self.manifest_path = self.root / 'manifest.json'
+        self.delete_hourly = delete_hourly
+        self.serializer = get_serializer(SEGMENT_FORMAT)
+        self.manifest = self._load_manifest()
+        self._blooms: Dict[str, BloomFilter] = {}
+
+    def _load_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {"version": 1, "segments": []}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def pending_hourly_files(self, cutoff: date) -> Dict[date, List[Path]]:
+        """
+        Agrupa por día los archivos horarios anteriores a cutoff.
+
+        Args:
+            cutoff (date): Solo se consideran días estrictamente anteriores
+
+        Returns:
+            Dict[date, List[Path]]: Archivos horarios por día
+        """
+        pending = defaultdict(list)
+        for path in sorted(self.output_path.iterdir()):
+            match = HOURLY_FILE_PATTERN.match(path.name)
+            if not match or path.name.endswith('.tmp'):
+                continue
+            day = datetime.strptime(match.group(1), '%Y%m%d').date()
+            if day < cutoff:
+                pending[day].append(path)
+        return pending
+
+    def _segment_path(self, day: date, category: str, holding: str) -> Path:
+        partition = (
+            self.root / f"date={day.isoformat()}"
+            / f"category={slugify(category)}" / f"holding={slugify(holding)}"
+        )
+        index = len(list(partition.glob('segment-*'))) if partition.exists() else 0
+        return partition / f"segment-{index:03d}{self.serializer.extension}"
+
+    def _compacted_files(self, day: date) -> Set[str]:
+        """Archivos horarios del día que ya están en algún segmento del manifiesto."""
+        return {
+            name
+            for segment in self.manifest["segments"] if segment["date"] == day.isoformat()
+            for name in segment.get("source_files", [])
+        }
+
+    def _remove_orphans(self, day: date) -> None:
+        """
+        Borra los segmentos del día que no están en el manifiesto: quedan
+        cuando una compactación se interrumpe antes de publicarlo.
+        """
+        day_dir = self.root / f"date={day.isoformat()}"
+        if not day_dir.exists():
+            return
+        known = {
+            segment["path"] for segment in self.manifest["segments"]
+            if segment["date"] == day.isoformat()
+        }
+        for path in day_dir.glob('category=*/holding=*/segment-*'):
+            if path.relative_to(self.root).as_posix() not in known:
+                self.logger.warning(f"Se elimina el segmento huérfano {path}")
+                path.unlink(missing_ok=True)
+
+    def compact_day(self, day: date, files: List[Path]) -> int:
+        """
+        Compacta los archivos horarios de un día en segmentos por partición.
+        Es idempotente: los archivos que el manifiesto ya registra (una
+        compactación interrumpida antes de borrarlos, o delete_hourly=False)
+        no se vuelven a agregar.
+
+        Args:
+            day (date): Día a compactar
+            files (List[Path]): Archivos horarios del día
+
+        Returns:
+            int: Cantidad de registros compactados
+        """
+        compacted = self._compacted_files(day)
+        done = [file_path for file_path in files if file_path.name in compacted]
+        files = [file_path for file_path in files if file_path.name not in compacted]
+        if done:
+            self.logger.info(f"{len(done)} archivos horarios del {day} ya estaban compactados")
+        self._remove_orphans(day)
+
+        partitions: Dict[tuple, Dict] = {}
+        writers = {}
+        try:
+            for file_path in files:
+                try:
+                    records = load_records(file_path)
+                except Exception as e:
+                    self.logger.error(f"No se pudo leer {file_path}, se omite: {e}")
+                    continue
+                for record in records:
+                    key = (record.get('category', ''), record.get('holding', ''))
+                    if key not in partitions:
+                        path = self._segment_path(day, *key)
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        tmp_path = path.with_name(path.name + '.tmp')
+                        writers[key] = self.serializer.open_file(tmp_path, 'wb')
+                        partitions[key] = {
+                            "path": path,
+                            "tmp_path": tmp_path,
+                            "urls": [],
+                            "sources": set(),
+                            "min_date": None,
+                            "max_date": None
+                        }
+                    partition = partitions[key]
+                    self.serializer.write_records(writers[key], [record])
+                    partition["urls"].append(record.get('url', ''))
+                    partition["sources"].add(record.get('source', ''))
+                    record_date = record.get('date', '')
+                    if record_date:
+                        if partition["min_date"] is None or record_date < partition["min_date"]:
+                            partition["min_date"] = record_date
+                        if partition["max_date"] is None or record_date > partition["max_date"]:
+                            partition["max_date"] = record_date
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        total = 0
+        for (category, holding), partition in partitions.items():
+            os.replace(partition["tmp_path"], partition["path"])
+            bloom = BloomFilter.for_capacity(len(partition["urls"]))
+            for url in partition["urls"]:
+                bloom.add(url)
+            total += len(partition["urls"])
+            self.manifest["segments"].append({
+                "path": partition["path"].relative_to(self.root).as_posix(),
+                "date": day.isoformat(),
+                "category": category,
+                "holding": holding,
+                "min_date": partition["min_date"],
+                "max_date": partition["max_date"],
+                "sources": sorted(partition["sources"]),
+                "record_count": len(partition["urls"]),
+                "url_bloom": bloom.to_dict(),
+                "source_files": [file_path.name for file_path in files]
+            })
+
+        # El manifiesto se publica antes de borrar los horarios
+        if files:
+            self._save_manifest()
+        if self.delete_hourly:
+            for file_path in done + files:
+                file_path.unlink(missing_ok=True)
+        return total
+
+    def compact(self, min_age_hours: int = 24) -> int:
+        """
+        Compacta todos los días completos cuyos archivos horarios tienen al
+        menos min_age_hours de antigüedad. El día anterior se conserva
+        mientras se use como referencia para la deduplicación de madrugada.
+
+        Args:
+            min_age_hours (int): Antigüedad mínima para compactar un día
+
+        Returns:
+            int: Cantidad de registros compactados
+        """
+        if not self.output_path.exists():
+            return 0
+        cutoff = (datetime.now() - timedelta(hours=min_age_hours)).date()
+        total = 0
+        for day, files in sorted(self.pending_hourly_files(cutoff).items()):
+            count = self.compact_day(day, files)
+            self.logger.info(
+                f"Compactados {len(files)} archivos horarios del {day} ({count} registros)"
+            )
+            total += count
+        return total
+
+    def segments_for(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        category: Optional[str] = None,
+        holding: Optional[str] = None,
+        source: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Retorna los segmentos del manifiesto que cumplen los filtros.
+
+        Args:
+            start (datetime, optional): Inicio del rango de fechas
+            end (datetime, optional): Fin del rango de fechas
+            category (str, optional): Categoría (p.ej. Nacional)
+            holding (str, optional): Holding del medio
+            source (str, optional): Nombre de la fuente
+
+        Returns:
+            List[Dict]: Entradas del manifiesto
+        """
+        start_text = start.strftime('%Y-%m-%d %H:%M:%S') if start else None
+        end_text = end.strftime('%Y-%m-%d %H:%M:%S') if end else None
+        segments = []
+        for segment in self.manifest["segments"]:
+            if category and slugify(segment["category"]) != slugify(category):
+                continue
+            if holding and slugify(segment["holding"]) != slugify(holding):
+                continue
+            if source and source not in segment["sources"]:
+                continue
+            if start_text and segment["max_date"] and segment["max_date"] < start_text:
+                continue
+            if end_text and segment["min_date"] and segment["min_date"] > end_text:
+                continue
+            segments.append(segment)
+        return segments
+
+    def _bloom(self, segment: Dict) -> BloomFilter:
+        bloom = self._blooms.get(segment["path"])
+        if bloom is None:
+            bloom = BloomFilter.from_dict(segment["url_bloom"])
+            self._blooms[segment["path"]] = bloom
+        return bloom
+
+    def read_segment(self, segment: Dict) -> List[Dict]:
+        """Lee los registros de un segmento."""
+        return self.serializer.load(self.root / segment["path"])
+
+    def iter_records(self, **filters) -> Iterator[Dict]:
+        """Recorre los registros de los segmentos que cumplen los filtros."""
+        for segment in self.segments_for(**filters):
+            yield from self.read_segment(segment)
+
+    def find_url(self, url: str, **filters) -> List[Dict]:
+        """
+        Busca los registros de una URL leyendo solo los segmentos cuyo
+        filtro de Bloom indica que podrían contenerla.
+        """
+        matches = []
+        for segment in self.segments_for(**filters):
+            if url in self._bloom(segment):
+                matches.extend(r for r in self.read_segment(segment) if r.get('url') == url)
+        return matches
+
+    def known_urls(self, urls: Iterable[str], **filters) -> Set[str]:
+        """
+        Retorna cuáles de las URLs ya están en el almacén.
+
+        Args:
+            urls (Iterable[str]): URLs a verificar
+            **filters: Filtros de segmentos (ver segments_for)
+
+        Returns:
+            Set[str]: URLs presentes en algún segmento
+        """
+        pending = set(urls)
+        known = set()
+        for segment in self.segments_for(**filters):
+            bloom = self._bloom(segment)
+            candidates = {url for url in pending if url in bloom}
+            if not candidates:
+                continue
+            segment_urls = {r.get('url') for r in self.read_segment(segment)}
+            found = candidates & segment_urls
+            known |= found
+            pending -= found
+            if not pending:
+                break
+        return known
+
+# Ejemplo de uso:
+"""
+store = SegmentStore(Path(RUTA_SALIDA))
+store.compact()
+
+# Segmentos de una categoría en un rango
+segments = store.segments_for(start=datetime(2024, 1, 1), category="Nacional")
+
+# ¿Cuándo apareció una URL?
+records = store.find_url("https://www.latercera.com/nacional/noticia/...")
+"""
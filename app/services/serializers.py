@@ -0,0 +1,344 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sys
+import textwrap
+import threading
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Optional
+
+from ..utils.records import RecordBatch
+
+logger = logging.getLogger(__name__)
+
+class ResultSerializer(ABC):
+    """
+    Serializador base de resultados. Cada formato define su extensión y
+    cómo escribir y leer una secuencia de registros; la escritura siempre se
+    hace sobre un archivo temporal que luego se renombra (escritura atómica).
+    """
+    name = ''
+    extension = ''
+    compressed = False
+    # Los formatos streaming pueden agregarse a medida que llegan los lotes
+    streaming = False
+
+    def open_file(self, path: Path, mode: str) -> IO[bytes]:
+        if self.compressed:
+            return gzip.open(path, mode, compresslevel=6)
+        return open(path, mode)
+
+    def write_header(self, f: IO[bytes]) -> None:
+        pass
+
+    @abstractmethod
+    def write_records(self, f: IO[bytes], records: Iterable[Dict], first: bool = True) -> int:
+        """Escribe los registros y retorna cuántos escribió."""
+
+    def write_footer(self, f: IO[bytes]) -> None:
+        pass
+
+    def dump(self, records: Iterable[Dict], path: Path) -> int:
+        """
+        Escribe los registros de forma atómica en path.
+
+        Args:
+            records (Iterable[Dict]): Registros a escribir
+            path (Path): Archivo de destino
+
+        Returns:
+            int: Cantidad de registros escritos
+        """
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            with self.open_file(tmp_path, 'wb') as f:
+                self.write_header(f)
+                count = self.write_records(f, records)
+                self.write_footer(f)
+            os.replace(tmp_path, path)
+            return count
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @abstractmethod
+    def load(self, path: Path) -> List[Dict]:
+        """Lee un archivo escrito con este serializador."""
+
+class JSONSerializer(ResultSerializer):
+    """Arreglo JSON (compacto por defecto), compatible con el formato legado."""
+    name = 'json'
+    extension = '.json'
+
+    def __init__(self, indent: Optional[int] = None):
+        self.indent = indent
+
+    def write_header(self, f: IO[bytes]) -> None:
+        f.write(b'[')
+
+    def write_records(self, f: IO[bytes], records: Iterable[Dict], first: bool = True) -> int:
+        count = 0
+        prefix = b'\n' if self.indent else b''
+        for record in records:
+            if not first:
+                f.write(b',')
+            first = False
+            if self.indent:
+                # Mismo resultado que json.dumps(results, indent=...) del formato legado
+                encoded = textwrap.indent(
+                    json.dumps(record, ensure_ascii=False, indent=self.indent),
+                    ' ' * self.indent
+                )
+            else:
+                encoded = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+            f.write(prefix + encoded.encode('utf-8'))
+            count += 1
+        return count
+
+    def write_footer(self, f: IO[bytes]) -> None:
+        f.write(b'\n]' if self.indent else b']')
+
+    def load(self, path: Path) -> List[Dict]:
+        with self.open_file(path, 'rb') as f:
+            return json.load(f)
+
+class GzipJSONSerializer(JSONSerializer):
+    name = 'json.gz'
+    extension = '.json.gz'
+    compressed = True
+
+class NDJSONSerializer(ResultSerializer):
+    """Un registro JSON por línea; permite agregar lotes incrementalmente."""
+    name = 'ndjson'
+    extension = '.ndjson'
+    streaming = True
+
+    def write_records(self, f: IO[bytes], records: Iterable[Dict], first: bool = True) -> int:
+        count = 0
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            f.write(b'\n')
+            count += 1
+        return count
+
+    def load(self, path: Path) -> List[Dict]:
+        with self.open_file(path, 'rb') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+class GzipNDJSONSerializer(NDJSONSerializer):
+    name = 'ndjson.gz'
+    extension = '.ndjson.gz'
+    compressed = True
+
+SERIALIZERS: Dict[str, ResultSerializer] = {
+    'json': JSONSerializer(),
+    'json-pretty': JSONSerializer(indent=2),
+    'json.gz': GzipJSONSerializer(),
+    'ndjson': NDJSONSerializer(),
+    'ndjson.gz': GzipNDJSONSerializer(),
+}
+
+def get_serializer(name: str) -> ResultSerializer:
+    """
+    Retorna el serializador registrado con ese nombre.
+
+    Args:
+        name (str): json, json-pretty, json.gz, ndjson o ndjson.gz
+
+    Returns:
+        ResultSerializer: Serializador del formato
+
+    Raises:
+        ValueError: Si el formato no existe
+    """
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(f"Formato de salida desconocido: {name}") from None
+
+def serializer_for_path(path: Path) -> ResultSerializer:
+    """Retorna el serializador que corresponde a la extensión del archivo."""
+    name = Path(path).name
+    for serializer in sorted(SERIALIZERS.values(), key=lambda s: -len(s.extension)):
+        if name.endswith(serializer.extension):
+            return serializer
+    raise ValueError(f"Extensión no reconocida: {path}")
+
+def load_records(path: Path) -> List[Dict]:
+    """Lee un archivo de resultados en cualquiera de los formatos soportados."""
+    return serializer_for_path(path).load(Path(path))
+
+class ResultWriter:
+    """
+    Escritor de una salida por ejecución. Con formatos streaming (NDJSON)
+    cada lote se agrega al archivo temporal apenas termina una fuente; con
+    los demás los lotes se acumulan en formato compacto y se escriben al
+    confirmar. En ambos casos el archivo final aparece con un rename atómico.
+    Las escrituras en hilos se serializan: una escritura cuya corrutina se
+    canceló termina antes de confirmar o descartar el archivo.
+    """
+    def __init__(self, path: Path, serializer: ResultSerializer):
+        """
+        Args:
+            path (Path): Archivo final
+            serializer (ResultSerializer): Formato de salida
+        """
+        self.path = Path(path)
+        self.serializer = serializer
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.count = 0
+        self._pending = RecordBatch()
+        self._file: Optional[IO[bytes]] = None
+        self._lock = threading.Lock()
+
+    def _append_sync(self, batch: RecordBatch) -> None:
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.serializer.open_file(self.tmp_path, 'wb')
+            self.serializer.write_records(self._file, batch.iter_dicts())
+            self._file.flush()
+
+    async def append(self, batch: RecordBatch) -> None:
+        """
+        Agrega un lote de resultados a la salida.
+
+        Args:
+            batch (RecordBatch): Resultados a agregar
+        """
+        if not len(batch):
+            return
+        self.count += len(batch)
+        if self.serializer.streaming:
+            await asyncio.to_thread(self._append_sync, batch)
+        else:
+            self._pending.extend(batch)
+
+    def _commit_sync(self) -> Optional[Path]:
+        with self._lock:
+            return self._commit_locked()
+
+    def _commit_locked(self) -> Optional[Path]:
+        if self.serializer.streaming:
+            if self._file is None:
+                return None
+            self._file.close()
+            self._file = None
+            os.replace(self.tmp_path, self.path)
+            return self.path
+
+        if not len(self._pending):
+            return None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.serializer.dump(self._pending.iter_dicts(), self.path)
+        self._pending = RecordBatch()
+        return self.path
+
+    async def commit(self) -> Optional[Path]:
+        """
+        Cierra la salida y la publica con un rename atómico.
+
+        Returns:
+            Optional[Path]: Archivo final o None si no hubo resultados
+        """
+        return await asyncio.to_thread(self._commit_sync)
+
+    def abort(self) -> None:
+        """Descarta la salida parcial."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.tmp_path.unlink(missing_ok=True)
+            self._pending = RecordBatch()
+
+def benchmark(n_records: int = 10000, directory: Optional[Path] = None) -> List[Dict]:
+    """
+    Compara tamaño, tiempo de escritura y memoria pico de cada formato,
+    incluyendo el formato legado (json.dumps con indent=2 en un solo string).
+
+    Args:
+        n_records (int): Cantidad de registros sintéticos
+        directory (Path, optional): Directorio de trabajo
+
+    Returns:
+        List[Dict]: Una fila de métricas por formato
+    """
+    import tempfile
+
+    directory = Path(directory or tempfile.mkdtemp(prefix='linkerer_bench_'))
+    source = {
+        "category": "Nacional",
+        "site": "https://www.latercera.com/nacional/noticia/",
+        "source": "La Tercera",
+        "diminutive": "LT",
+        "content_length": "",
+        "sentiment": "",
+        "keywords": "",
+        "popularity": "",
+        "subcategory": "",
+        "holding": "COPESA",
+        "update_frequency": "hourly",
+        "content_type": "article"
+    }
+    batch = RecordBatch()
+    source_id = batch.registry.intern(source)
+    now = time.time()
+    for i in range(n_records):
+        batch.append(source_id, f"{source['site']}articulo-de-prueba-{i}/", now + i % 3600)
+
+    def legacy(path: Path) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(batch.to_dicts(), indent=2, ensure_ascii=False))
+
+    candidates = [('legacy (indent=2)', '.legacy.json', legacy)]
+    for name, serializer in SERIALIZERS.items():
+        candidates.append((
+            name,
+            serializer.extension,
+            lambda path, s=serializer: s.dump(batch.iter_dicts(), path)
+        ))
+
+    rows = []
+    for name, extension, write in candidates:
+        path = directory / f"bench{extension}"
+        tracemalloc.start()
+        start = time.perf_counter()
+        write(path)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append({
+            "format": name,
+            "bytes": path.stat().st_size,
+            "write_seconds": round(elapsed, 4),
+            "peak_memory_bytes": peak
+        })
+        path.unlink()
+    return rows
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"{'formato':<20}{'bytes':>14}{'seg':>10}{'mem pico':>14}")
+    for row in benchmark(n):
+        print(
+            f"{row['format']:<20}{row['bytes']:>14}"
+            f"{row['write_seconds']:>10}{row['peak_memory_bytes']:>14}"
+        )
+
+# Ejemplo de uso:
+"""
+serializer = get_serializer("ndjson.gz")
+writer = ResultWriter(Path("output/linkerer_20240111_10.ndjson.gz"), serializer)
+
+await writer.append(batch_fuente_1)
+await writer.append(batch_fuente_2)
+output_file = await writer.commit()
+
+# Benchmark: python -m app.services.serializers 100000
+"""
@@ -0,0 +1,298 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+# Contenedores de un resultado orgánico y de su snippet en la SERP de Google
+RESULT_LINK_CLASS = 'yuRUbf'
+RESULT_CONTAINER_CLASSES = ('g', 'MjjYud', 'tF2Cxc')
+SNIPPET_CLASSES = ('VwiC3b', 'IsZvec', 'aCOpRe')
+# Lectura en streaming: los marcadores de bloqueo se buscan solo al inicio
+# de la respuesta y la lectura termina al llegar al pie de los resultados
+SERP_CHUNK_SIZE = 16 * 1024
+SERP_BLOCK_SCAN_BYTES = 64 * 1024
+# Marcadores estructurales de la página de bloqueo de Google (/sorry/index
+# y su formulario de captcha): un texto como "tráfico inusual" puede
+# aparecer en el título o snippet de una noticia real
+BLOCK_MARKERS = (b'/sorry/index', b'id="captcha-form"', b'class="g-recaptcha"')
+RESULTS_END_MARKERS = (b'id="botstuff"', b'id="bottomads"', b'id="foot"')
+
+# Fecha mostrada al inicio del snippet ("hace 2 horas — ...")
+DATE_CLASSES = ('LEwnzc', 'MUxGbd', 'f')
+DATE_SEPARATOR = re.compile(r'^(?P<date>.{3,40}?)\s+[—–-]\s+(?P<rest>.*)$', re.S)
+
+MONTHS = {
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'sep': 9, 'set': 9, 'oct': 10, 'nov': 11, 'dic': 12,
+    'jan': 1, 'apr': 4, 'aug': 8, 'dec': 12
+}
+RELATIVE_UNITS = {
+    'segundo': 'seconds', 'second': 'seconds', 'seg': 'seconds',
+    'minuto': 'minutes', 'minute': 'minutes', 'min': 'minutes',
+    'hora': 'hours', 'hour': 'hours', 'h': 'hours',
+    'dia': 'days', 'day': 'days', 'd': 'days',
+    'semana': 'weeks', 'week': 'weeks'
+}
+RELATIVE_PATTERN = re.compile(
+    r'(?:hace\s+)?(?P<amount>\d+|un|una|an|a)\s*(?P<unit>[a-z]+?)s?(?:\s+ago)?$'
+)
+ABSOLUTE_PATTERN = re.compile(
+    r'(?P<day>\d{1,2})\s+(?:de\s+)?(?P<month>[a-z]{3})[a-z]*\.?\s+(?:de\s+)?(?P<year>\d{4})$'
+)
+
+@dataclass
+class SerpResult:
+    """Resultado orgánico extraído de una página de resultados."""
+    url: str
+    title: str = ''
+    snippet: str = ''
+    # Posición en la SERP (1 = primer resultado de la primera página)
+    position: int = 0
+    # Fecha tal como la muestra Google y su normalización
+    displayed_date: str = ''
+    published: Optional[datetime] = None
+    # Motor de búsqueda que entregó el resultado
+    engine: str = ''
+
+@dataclass
+class SerpPage:
+    """Cuerpo leído de una página de resultados."""
+    body: bytes
+    encoding: str = 'utf-8'
+    # Google respondió con una página de bloqueo (captcha / tráfico inusual)
+    blocked: bool = False
+    # Se alcanzó el fin del bloque de resultados antes del fin de la respuesta
+    complete: bool = False
+    bytes_read: int = 0
+
+async def read_serp(
+    response,
+    block_markers: Iterable[bytes] = BLOCK_MARKERS,
+    end_markers: Iterable[bytes] = RESULTS_END_MARKERS,
+    chunk_size: int = SERP_CHUNK_SIZE,
+    scan_limit: int = SERP_BLOCK_SCAN_BYTES
+) -> SerpPage:
+    """
+    Lee una página de resultados por bloques, sin decodificarla. Aborta al
+    detectar un marcador de bloqueo en los primeros bloques y deja de leer
+    en cuanto termina el bloque de resultados.
+
+    Args:
+        response: Respuesta de aiohttp (o compatible con content.iter_chunked)
+        block_markers (Iterable[bytes]): Marcadores de bloqueo (en minúsculas)
+        end_markers (Iterable[bytes]): Marcadores del fin de los resultados
+        chunk_size (int): Tamaño de cada bloque leído
+        scan_limit (int): Bytes iniciales donde se buscan los marcadores de bloqueo
+
+    Returns:
+        SerpPage: Cuerpo leído y cómo terminó la lectura
+    """
+    block_markers = tuple(block_markers)
+    end_markers = tuple(end_markers)
+    overlap = max(len(marker) for marker in block_markers + end_markers) - 1
+    encoding = getattr(response, 'charset', None) or 'utf-8'
+    chunks = []
+    size = 0
+    tail = b''
+    async for chunk in response.content.iter_chunked(chunk_size):
+        # Se conserva el final del bloque anterior para no perder marcadores partidos
+        window = tail + chunk.lower()
+        if size < scan_limit and any(marker in window for marker in block_markers):
+            return SerpPage(b'', encoding, blocked=True, bytes_read=size + len(chunk))
+        chunks.append(chunk)
+        size += len(chunk)
+        if any(marker in window for marker in end_markers):
+            return SerpPage(b''.join(chunks), encoding, complete=True, bytes_read=size)
+        tail = window[-overlap:]
+    return SerpPage(b''.join(chunks), encoding, bytes_read=size)
+
+def parse_displayed_date(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Normaliza la fecha que Google muestra en un resultado. Acepta fechas
+    relativas ("hace 2 horas", "hace 1 día", "ayer", "3 hours ago") y
+    absolutas ("11 ene 2024", "11 de enero de 2024").
+
+    Args:
+        text (str): Fecha mostrada
+        now (datetime, optional): Referencia para las fechas relativas
+
+    Returns:
+        Optional[datetime]: Fecha normalizada o None si no se reconoce
+    """
+    if not text:
+        return None
+    now = now or datetime.now()
+    normalized = unicodedata.normalize('NFKD', text.lower().strip())
+    normalized = ''.join(char for char in normalized if not unicodedata.combining(char))
+    normalized = normalized.rstrip('. ')
+
+    if normalized in ('ayer', 'yesterday'):
+        return now - timedelta(days=1)
+    if normalized in ('hoy', 'today', 'ahora', 'just now'):
+        return now
+
+    match = RELATIVE_PATTERN.match(normalized)
+    if match and match.group('unit') in RELATIVE_UNITS:
+        amount = match.group('amount')
+        amount = int(amount) if amount.isdigit() else 1
+        return now - timedelta(**{RELATIVE_UNITS[match.group('unit')]: amount})
+
+    match = ABSOLUTE_PATTERN.match(normalized)
+    if match and match.group('month') in MONTHS:
+        try:
+            return datetime(
+                int(match.group('year')),
+                MONTHS[match.group('month')],
+                int(match.group('day'))
+            )
+        except ValueError:
+            return None
+    return None
+
+def _find_container(link_div):
+    for parent in link_div.parents:
+        classes = parent.get('class') or []
+        if any(name in classes for name in RESULT_CONTAINER_CLASSES):
+            return parent
+    return link_div.parent
+
+def _find_snippet(container) -> Tuple[str, str]:
+    """Retorna (snippet, fecha mostrada) del contenedor de un resultado."""
+    if container is None:
+        return '', ''
+    for class_name in SNIPPET_CLASSES:
+        node = container.find(class_=class_name)
+        if node is None:
+            continue
+        displayed_date = ''
+        date_node = node.find('span', class_=DATE_CLASSES)
+        if date_node is not None:
+            displayed_date = date_node.get_text(' ', strip=True).rstrip(' —–-')
+            date_node.extract()
+        snippet = node.get_text(' ', strip=True)
+        if not displayed_date:
+            match = DATE_SEPARATOR.match(snippet)
+            if match and parse_displayed_date(match.group('date')):
+                displayed_date, snippet = match.group('date'), match.group('rest')
+        return snippet.lstrip(' —–-'), displayed_date
+    return '', ''
+
+def _make_soup(html: Union[str, bytes], encoding: Optional[str] = None):
+    # bs4 se importa en el primer análisis para no encarecer el arranque
+    from bs4 import BeautifulSoup
+
+    if isinstance(html, bytes) and encoding:
+        return BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+    return BeautifulSoup(html, 'html.parser')
+
+def parse_serp(
+    html: Union[str, bytes],
+    offset: int = 0,
+    now: Optional[datetime] = None,
+    encoding: Optional[str] = None
+) -> List[SerpResult]:
+    """
+    Extrae URL, título, snippet, posición y fecha mostrada de cada
+    resultado orgánico en una sola pasada sobre la página.
+
+    Args:
+        html (str | bytes): Contenido de la página de resultados
+        offset (int): Resultados de las páginas anteriores (p.ej. 10 en la segunda)
+        now (datetime, optional): Referencia para normalizar fechas relativas
+        encoding (str, optional): Codificación de html si se entrega en bytes
+
+    Returns:
+        List[SerpResult]: Resultados en el orden de la página
+    """
+    soup = _make_soup(html, encoding)
+    now = now or datetime.now()
+    results = []
+    for link_div in soup.find_all('div', class_=RESULT_LINK_CLASS):
+        anchor = link_div.find('a')
+        if anchor is None or not anchor.get('href'):
+            continue
+        title_node = anchor.find('h3')
+        snippet, displayed_date = _find_snippet(_find_container(link_div))
+        results.append(SerpResult(
+            url=anchor['href'],
+            title=title_node.get_text(' ', strip=True) if title_node else '',
+            snippet=snippet,
+            position=offset + len(results) + 1,
+            displayed_date=displayed_date,
+            published=parse_displayed_date(displayed_date, now)
+        ))
+    return results
+
+def _duckduckgo_target(href: str) -> str:
+    """Resuelve el enlace de redirección de DuckDuckGo (/l/?uddg=...)."""
+    parsed = urlparse(href)
+    if parsed.path.startswith('/l/'):
+        target = parse_qs(parsed.query).get('uddg')
+        if target:
+            return target[0]
+    return href
+
+def parse_duckduckgo(
+    html: Union[str, bytes],
+    offset: int = 0,
+    encoding: Optional[str] = None
+) -> List[SerpResult]:
+    """
+    Extrae URL, título, snippet y posición de la versión HTML de
+    DuckDuckGo, omitiendo los anuncios.
+
+    Args:
+        html (str | bytes): Contenido de la página de resultados
+        offset (int): Resultados de las páginas anteriores
+        encoding (str, optional): Codificación de html si se entrega en bytes
+
+    Returns:
+        List[SerpResult]: Resultados en el orden de la página
+    """
+    soup = _make_soup(html, encoding)
+    results = []
+    for container in soup.find_all('div', class_='result'):
+        if 'result--ad' in (container.get('class') or []):
+            continue
+        anchor = container.find('a', class_='result__a')
+        if anchor is None or not anchor.get('href'):
+            continue
+        snippet = container.find(class_='result__snippet')
+        results.append(SerpResult(
+            url=_duckduckgo_target(anchor['href']),
+            title=anchor.get_text(' ', strip=True),
+            snippet=snippet.get_text(' ', strip=True) if snippet else '',
+            position=offset + len(results) + 1
+        ))
+    return results
+
+def filter_stale(
+    results: List[SerpResult],
+    max_age: timedelta,
+    now: Optional[datetime] = None
+) -> List[SerpResult]:
+    """
+    Descarta los resultados con fecha conocida más antigua que max_age.
+    Los resultados sin fecha se conservan.
+    """
+    cutoff = (now or datetime.now()) - max_age
+    return [
+        result for result in results
+        if result.published is None or result.published >= cutoff
+    ]
+
+# Ejemplo de uso:
+"""
+for result in parse_serp(html):
+    print(result.position, result.url, result.title, result.published)
+
+fresh = filter_stale(parse_serp(html, offset=10), timedelta(hours=48))
+
+# Lectura en streaming de la respuesta
+async with session.get(url) as response:
+    page = await read_serp(response)
+if not page.blocked:
+    results = parse_serp(page.body, encoding=page.encoding)
+"""
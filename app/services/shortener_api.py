@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Optional, Dict
 import logging
 from ..core.config import settings
+from .http_client import create_http_client
 
 class ShortenerAPIService:
     """
@@ -12,7 +13,16 @@ class ShortenerAPIService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.api_url = settings.SHORTENER_API_URL
-        self.timeout = settings.API_TIMEOUT
+        self.timeout = aiohttp.ClientTimeout(total=settings.API_TIMEOUT)
+
+    def create_session(self):
+        """
+        Crea un cliente HTTP compartido para hablar con el shortener.
+        
+        Returns:
+            HttpClient: Cliente listo para usar con 'async with'
+        """
+        return create_http_client()
 
     async def send_file(
         self,
@@ -116,7 +126,10 @@ class ShortenerAPIService:
         """
         try:
             health_url = f"{self.api_url.rstrip('/')}/health"
-            async with session.get(health_url, timeout=5) as response:
+            async with session.get(
+                health_url,
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
                 return response.status == 200
         except Exception as e:
             self.logger.error(f"Error en health check: {str(e)}")
@@ -127,7 +140,7 @@ class ShortenerAPIService:
 async def main():
     shortener = ShortenerAPIService()
     
-    async with aiohttp.ClientSession() as session:
+    async with shortener.create_session() as session:
         # Verificar si el servicio está disponible
         if not await shortener.health_check(session):
             print("Servicio no disponible")
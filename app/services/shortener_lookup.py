@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+import aiohttp
+
+from ..core.config import settings
+from ..utils.records import RecordBatch
+
+class KnownUrlCache:
+    """
+    LRU de URLs que el shortener confirmó conocer. Solo se guardan las
+    respuestas positivas: una URL desconocida puede acortarse en cualquier
+    momento, pero una ya acortada no deja de estarlo. Se persiste entre
+    ejecuciones para no volver a consultar las mismas URLs cada hora.
+    """
+    def __init__(self, path: Optional[Path] = None, max_size: int = settings.SHORTENER_KNOWN_CACHE_SIZE):
+        """
+        Args:
+            path (Path, optional): Archivo JSON donde se persiste la caché
+            max_size (int): Máximo de URLs recordadas
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else None
+        self.max_size = max_size
+        self._urls: 'OrderedDict[str, None]' = OrderedDict()
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                urls = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error al cargar {self.path}: {e}")
+            return
+        # El archivo se guarda del menos al más reciente
+        for url in urls[-self.max_size:]:
+            self._urls[url] = None
+
+    def save(self) -> None:
+        """Guarda la caché de forma atómica."""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._urls), f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"Error al guardar {self.path}: {e}")
+
+    def __contains__(self, url: str) -> bool:
+        if url in self._urls:
+            self._urls.move_to_end(url)
+            return True
+        return False
+
+    def add(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self._urls[url] = None
+            self._urls.move_to_end(url)
+        while len(self._urls) > self.max_size:
+            self._urls.popitem(last=False)
+
+    def urls(self) -> List[str]:
+        """URLs recordadas, de la menos a la más reciente."""
+        return list(self._urls)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+class ShortenerLookup:
+    """
+    Consulta al shortener, en lotes, cuáles URLs ya acortó, para no
+    enviárselas de nuevo. La consulta es POST {"urls": [...]} a
+    <SHORTENER_API_URL>/exists y la respuesta {"known": [...]}.
+    Ante cualquier error se asume que las URLs son nuevas: el filtro solo
+    reduce el envío y nunca debe perder resultados.
+    """
+    def __init__(
+        self,
+        api_url: str = settings.SHORTENER_API_URL,
+        cache: Optional[KnownUrlCache] = None,
+        batch_size: int = settings.SHORTENER_EXISTS_BATCH_SIZE,
+        timeout: float = settings.SHORTENER_EXISTS_TIMEOUT
+    ):
+        """
+        Args:
+            api_url (str): URL del API del shortener
+            cache (KnownUrlCache, optional): LRU de URLs conocidas
+            batch_size (int): Máximo de URLs por consulta
+            timeout (float): Timeout total de cada consulta en segundos
+        """
+        self.logger = logging.getLogger(__name__)
+        self.exists_url = f"{api_url.rstrip('/')}/exists"
+        self.cache = cache if cache is not None else KnownUrlCache()
+        self.batch_size = batch_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        # Se desactiva en la ejecución si el shortener no expone la consulta
+        self.enabled = True
+        self.queried = 0
+        self.dropped = 0
+
+    async def _query(self, session: aiohttp.ClientSession, urls: List[str]) -> Set[str]:
+        async with session.post(self.exists_url, json={"urls": urls}, timeout=self.timeout) as response:
+            if response.status in (404, 405, 501):
+                self.enabled = False
+                self.logger.warning(
+                    f"El shortener no soporta la consulta de URLs conocidas ({response.status}); "
+                    "se omite en esta ejecución"
+                )
+                return set()
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=response.status
+                )
+            data = await response.json()
+        requested = set(urls)
+        return {url for url in data.get('known', []) if url in requested}
+
+    async def known_urls(self, session: aiohttp.ClientSession, urls: Iterable[str]) -> Set[str]:
+        """
+        Retorna las URLs que el shortener ya conoce.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            urls (Iterable[str]): URLs candidatas
+
+        Returns:
+            Set[str]: Subconjunto de URLs ya acortadas
+        """
+        known = set()
+        pending = []
+        for url in dict.fromkeys(urls):
+            if url in self.cache:
+                known.add(url)
+            else:
+                pending.append(url)
+
+        for start in range(0, len(pending), self.batch_size):
+            if not self.enabled:
+                break
+            chunk = pending[start:start + self.batch_size]
+            try:
+                found = await self._query(session, chunk)
+            except Exception as e:
+                self.logger.warning(f"Error al consultar URLs conocidas en el shortener: {e}")
+                break
+            self.queried += len(chunk)
+            self.cache.add(found)
+            known |= found
+        return known
+
+    async def filter(self, session: aiohttp.ClientSession, batch: RecordBatch) -> RecordBatch:
+        """
+        Descarta del lote las URLs que el shortener ya tiene.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            batch (RecordBatch): Lote a filtrar
+
+        Returns:
+            RecordBatch: Lote solo con URLs desconocidas para el shortener
+        """
+        if not batch:
+            return batch
+        known = await self.known_urls(session, batch.urls)
+        if not known:
+            return batch
+        filtered = batch.filter(lambda url: url not in known)
+        self.dropped += len(batch) - len(filtered)
+        self.logger.info(f"Descartadas {len(batch) - len(filtered)} URLs ya acortadas por el shortener")
+        return filtered
+
+    def save(self) -> None:
+        self.cache.save()
+
+# Ejemplo de uso:
+"""
+lookup = ShortenerLookup(cache=KnownUrlCache(Path("output/shortener_known.json")))
+async with create_http_client() as session:
+    batch = await lookup.filter(session, batch)
+lookup.save()
+
+# Servidor local de prueba: python -m app.services.shortener_stub --port 5055
+"""
@@ -0,0 +1,88 @@
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+from aiohttp import web
+
+from .serializers import load_records
+
+class ShortenerStub:
+    """
+    Servidor local que imita el API del shortener para pruebas: recibe los
+    archivos de resultados (POST /shortener/), responde la consulta de URLs
+    conocidas (POST /shortener/exists) y el health check.
+    """
+    def __init__(self, known_urls: Optional[Iterable[str]] = None, prefix: str = '/shortener'):
+        """
+        Args:
+            known_urls (Iterable[str], optional): URLs acortadas de antemano
+            prefix (str): Ruta base del API
+        """
+        self.logger = logging.getLogger(__name__)
+        self.known: Set[str] = set(known_urls or ())
+        self.prefix = prefix.rstrip('/')
+        self.uploads = []
+        self.exists_requests = 0
+
+    async def upload(self, request: web.Request) -> web.Response:
+        reader = await request.multipart()
+        part = await reader.next()
+        if part is None or part.name != 'file':
+            return web.json_response({"message": "Falta el campo file"}, status=400)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # La extensión del nombre indica el formato del archivo
+            path = Path(tmp_dir) / Path(part.filename or 'results.json').name
+            path.write_bytes(await part.read())
+            records = load_records(path)
+        urls = [record['url'] for record in records]
+        self.uploads.append(urls)
+        new_urls = set(urls) - self.known
+        self.known |= new_urls
+        return web.json_response(
+            {"message": f"{len(new_urls)} URLs nuevas de {len(urls)}"},
+            status=202
+        )
+
+    async def exists(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self.exists_requests += 1
+        return web.json_response({"known": [url for url in data.get('urls', []) if url in self.known]})
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    def create_app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post(f'{self.prefix}/', self.upload)
+        app.router.add_post(f'{self.prefix}/exists', self.exists)
+        app.router.add_get(f'{self.prefix}/health', self.health)
+        return app
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor local que imita el API del shortener")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument(
+        '--known',
+        type=Path,
+        default=None,
+        help="Archivo de resultados cuyas URLs se consideran ya acortadas"
+    )
+    args = parser.parse_args()
+
+    known = [record['url'] for record in load_records(args.known)] if args.known else []
+    web.run_app(ShortenerStub(known).create_app(), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
+
+# Ejemplo de uso:
+"""
+# Servidor de prueba con las URLs de un archivo anterior ya acortadas
+python -m app.services.shortener_stub --port 5055 --known output/linkerer_20240111_10.json
+
+# Ejecución de linkerer contra el servidor de prueba
+ScraperConfig(api_endpoint='http://127.0.0.1:5055/shortener/')
+"""
@@ -0,0 +1,398 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from lxml import etree
+
+from ..core.config import settings
+from ..utils.pattern_matcher import PatternMatcher
+from ..utils.records import RecordBatch
+from .conditional_fetch import ValidatorStore
+from .http_cache import uncached
+from .rate_limiter import HostRateLimiter
+
+def parse_w3c_datetime(value: Optional[str]) -> Optional[datetime]:
+    """
+    Convierte una fecha W3C (lastmod / publication_date) a datetime con zona.
+    Las fechas sin zona horaria se interpretan como hora local.
+
+    Args:
+        value (str): Fecha en formato W3C (p.ej. 2024-01-11T10:00:00-03:00)
+
+    Returns:
+        Optional[datetime]: Fecha con zona horaria o None si no es válida
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()
+    return parsed
+
+class SitemapIngestor:
+    """
+    Backend de descubrimiento basado en los sitemaps (y news sitemaps) de
+    cada medio. Los sitemaps se procesan en streaming con un parser XML
+    incremental, por lo que la memoria no depende del tamaño del sitemap.
+    Cada medio mantiene una marca de agua (high-water mark) con la fecha
+    más reciente ya emitida; solo se emiten URLs posteriores a ella.
+    """
+    ENTRY_TAGS = {'url', 'sitemap'}
+    FIELD_TAGS = {'loc', 'lastmod', 'publication_date'}
+
+    def __init__(
+        self,
+        media_outlets: Dict,
+        state_dir: Path,
+        max_concurrency: int = settings.CRAWLER_MAX_CONCURRENCY,
+        host_delay: float = settings.CRAWLER_HOST_DELAY,
+        pattern_matcher: Optional[PatternMatcher] = None
+    ):
+        """
+        Args:
+            media_outlets (Dict): Medios configurados (MEDIA_OUTLETS)
+            state_dir (Path): Directorio para marcas de agua y validadores
+            max_concurrency (int): Máximo de medios procesados en paralelo
+            host_delay (float): Segundos mínimos entre peticiones a un host
+            pattern_matcher (PatternMatcher, optional): Filtro de exclusión
+        """
+        self.logger = logging.getLogger(__name__)
+        self.outlets_by_url = {
+            outlet.base_url: outlet for outlet in media_outlets.values()
+        }
+        self.state_path = Path(state_dir) / 'sitemap_state.json'
+        self.high_water_marks: Dict[str, str] = self._load_state()
+        self.validators = ValidatorStore(Path(state_dir) / 'sitemap_validators.json')
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.host_limiter = HostRateLimiter(host_delay)
+        self.pattern_matcher = pattern_matcher or PatternMatcher()
+
+    def _load_state(self) -> Dict[str, str]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error al cargar {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self) -> None:
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.high_water_marks, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error al guardar {self.state_path}: {e}")
+
+    def get_high_water_mark(self, base_url: str) -> datetime:
+        """
+        Retorna la marca de agua del medio. Si no existe, se usa una ventana
+        inicial para no emitir todo el archivo histórico del sitemap.
+        """
+        stored = parse_w3c_datetime(self.high_water_marks.get(base_url))
+        if stored is not None:
+            return stored
+        return datetime.now(timezone.utc) - timedelta(
+            hours=settings.SITEMAP_INITIAL_LOOKBACK_HOURS
+        )
+
+    def get_headers(self) -> Dict[str, str]:
+        """Genera headers para la petición con un User-Agent aleatorio."""
+        return {
+            **settings.DEFAULT_HEADERS,
+            'Accept': 'application/xml,text/xml;q=0.9,*/*;q=0.8',
+            'User-Agent': random.choice(settings.USER_AGENTS)
+        }
+
+    async def discover_sitemaps(
+        self,
+        session: aiohttp.ClientSession,
+        outlet
+    ) -> List[str]:
+        """
+        Obtiene los sitemaps de un medio: los configurados, los declarados
+        en robots.txt o, en su defecto, /sitemap.xml.
+        """
+        if outlet.sitemap_urls:
+            return list(outlet.sitemap_urls)
+
+        robots_url = f"{outlet.base_url}/robots.txt"
+        try:
+            await self.host_limiter.wait(urlparse(robots_url).netloc)
+            async with session.get(robots_url, headers=self.get_headers()) as response:
+                if response.status == 200:
+                    sitemaps = [
+                        line.split(':', 1)[1].strip()
+                        for line in (await response.text()).splitlines()
+                        if line.lower().startswith('sitemap:')
+                    ]
+                    if sitemaps:
+                        return sitemaps
+        except Exception as e:
+            self.logger.warning(f"No se pudo leer {robots_url}: {e}")
+
+        return [f"{outlet.base_url}/sitemap.xml"]
+
+    def _read_entry(self, elem) -> Tuple[str, Dict[str, str]]:
+        fields = {}
+        for child in elem.iter():
+            if not isinstance(child.tag, str):
+                continue
+            name = etree.QName(child).localname
+            if name in self.FIELD_TAGS and child.text:
+                fields.setdefault(name, child.text.strip())
+        return etree.QName(elem).localname, fields
+
+    async def stream_sitemap(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        on_entry: Callable[[str, Dict[str, str]], None]
+    ):
+        """
+        Descarga un sitemap en streaming (con o sin gzip) y entrega cada
+        entrada a on_entry apenas se lee. Los elementos procesados se liberan
+        de inmediato y no se acumulan, de modo que la memoria solo depende de
+        lo que on_entry decida conservar. La petición no pasa por la caché
+        HTTP (que lee el cuerpo completo): la revalidación la hacen los
+        validadores propios del ingestor, que el llamador registra solo si
+        todos los sitemaps del medio se leyeron.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            url (str): URL del sitemap
+            on_entry (Callable): Recibe el tipo de entrada ('url' o
+                                 'sitemap') y sus campos
+
+        Returns:
+            Headers de la respuesta si el sitemap se leyó completo, o None
+            si no cambió (304)
+
+        Raises:
+            aiohttp.ClientError: Si el sitemap no se pudo leer
+        """
+        headers = {**self.get_headers(), **self.validators.headers_for(url)}
+        parser = etree.XMLPullParser(
+            events=('end',),
+            resolve_entities=False,
+            no_network=True,
+            recover=True
+        )
+
+        def drain() -> None:
+            for _, elem in parser.read_events():
+                if not isinstance(elem.tag, str):
+                    continue
+                if etree.QName(elem).localname not in self.ENTRY_TAGS:
+                    continue
+                on_entry(*self._read_entry(elem))
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+        await self.host_limiter.wait(urlparse(url).netloc)
+        async with uncached(session).get(url, headers=headers) as response:
+            if response.status == 304:
+                self.logger.info(f"Sitemap sin cambios: {url}")
+                return None
+            if response.status != 200:
+                raise aiohttp.ClientError(f"Status code {response.status} para {url}")
+
+            decompressor = None
+            first_chunk = True
+            async for chunk in response.content.iter_chunked(settings.SITEMAP_CHUNK_SIZE):
+                if first_chunk:
+                    first_chunk = False
+                    if chunk[:2] == b'\x1f\x8b':
+                        decompressor = zlib.decompressobj(wbits=31)
+                if decompressor is not None:
+                    chunk = decompressor.decompress(chunk)
+                parser.feed(chunk)
+                drain()
+
+            parser.close()
+            drain()
+            return response.headers
+
+    def _match_category(self, link: str, queries: List[Dict]) -> Optional[Dict]:
+        best = None
+        for query in queries:
+            if link.startswith(query['site']):
+                if best is None or len(query['site']) > len(best['site']):
+                    best = query
+        return best
+
+    async def ingest_outlet(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        queries: List[Dict]
+    ) -> RecordBatch:
+        """
+        Procesa los sitemaps de un medio y retorna las URLs nuevas que
+        pertenecen a alguna de sus categorías configuradas.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            base_url (str): URL base del medio
+            queries (List[Dict]): Consultas del medio (una por categoría)
+
+        Returns:
+            RecordBatch: Resultados con la misma forma que process_source
+        """
+        results = RecordBatch()
+        outlet = self.outlets_by_url.get(base_url)
+        if outlet is None:
+            return results
+
+        high_water_mark = self.get_high_water_mark(base_url)
+        newest = high_water_mark
+        timestamp = time.time()
+        seen = set()
+        pending: List[Tuple[str, int]] = []
+        depth = 0
+
+        def on_entry(kind: str, fields: Dict[str, str]) -> None:
+            # Se filtra durante el streaming: solo se conservan las entradas
+            # nuevas, no el sitemap completo
+            nonlocal newest
+            loc = fields.get('loc')
+            if not loc:
+                return
+            modified = parse_w3c_datetime(
+                fields.get('publication_date') or fields.get('lastmod')
+            )
+
+            if kind == 'sitemap':
+                # Los sitemaps hijos sin cambios desde la marca se omiten
+                if depth < settings.SITEMAP_MAX_DEPTH and (
+                    modified is None or modified > high_water_mark
+                ):
+                    pending.append((loc, depth + 1))
+                return
+
+            if modified is None or modified <= high_water_mark:
+                return
+
+            link = self.pattern_matcher.clean_url(loc)
+            if link in seen or self.pattern_matcher.matches(link):
+                return
+            query = self._match_category(link, queries)
+            if query is None:
+                return
+
+            seen.add(link)
+            newest = max(newest, modified)
+            results.append(results.registry.intern(query), link, timestamp)
+
+        read = []
+        failed = False
+        async with self.semaphore:
+            pending.extend((url, 0) for url in await self.discover_sitemaps(session, outlet))
+            while pending:
+                sitemap_url, depth = pending.pop(0)
+                try:
+                    headers = await self.stream_sitemap(session, sitemap_url, on_entry)
+                except Exception as e:
+                    self.logger.error(f"Error al procesar sitemap {sitemap_url}: {e}")
+                    failed = True
+                    continue
+                if headers is not None:
+                    read.append((sitemap_url, headers))
+
+        # Con un sitemap sin leer, la marca de agua y los validadores no
+        # avanzan: las entradas del que falló no deben quedar bajo la marca
+        # ni tras un 304 del índice
+        if failed:
+            self.logger.warning(
+                f"Sitemaps de {outlet.name} incompletos; la marca de agua no avanza"
+            )
+        else:
+            for sitemap_url, headers in read:
+                self.validators.update(sitemap_url, headers)
+            if newest > high_water_mark:
+                self.high_water_marks[base_url] = newest.isoformat()
+
+        self.logger.info(f"Encontrados {len(results)} enlaces en sitemaps de {outlet.name}")
+        return results
+
+    def save(self) -> None:
+        """
+        Guarda validadores y marcas de agua. Se llama después de confirmar
+        los resultados: si la ejecución falla antes, la próxima vuelve a
+        emitir las mismas URLs en lugar de omitirlas.
+        """
+        self.validators.save()
+        self._save_state()
+
+    async def ingest(
+        self,
+        session: aiohttp.ClientSession,
+        queries: List[Dict],
+        on_results: Optional[Callable[[RecordBatch], Awaitable[None]]] = None
+    ) -> RecordBatch:
+        """
+        Procesa en paralelo los sitemaps de todos los medios.
+
+        Args:
+            session (aiohttp.ClientSession): Sesión HTTP
+            queries (List[Dict]): Consultas a procesar
+            on_results (Callable, optional): Recibe el lote de cada medio
+                                             apenas termina, en lugar de
+                                             acumularlo (un corte por plazo
+                                             conserva lo ya entregado)
+
+        Returns:
+            RecordBatch: Resultados de todos los medios (vacío si se indicó
+                         on_results)
+        """
+        by_outlet: Dict[str, List[Dict]] = {}
+        for query in queries:
+            parsed = urlparse(query['site'])
+            by_outlet.setdefault(f"{parsed.scheme}://{parsed.netloc}", []).append(query)
+
+        results = RecordBatch()
+
+        async def ingest_and_report(base_url: str, outlet_queries: List[Dict]) -> None:
+            batch = await self.ingest_outlet(session, base_url, outlet_queries)
+            if on_results is not None:
+                if batch:
+                    await on_results(batch)
+            else:
+                results.extend(batch)
+
+        await asyncio.gather(*(
+            ingest_and_report(base_url, outlet_queries)
+            for base_url, outlet_queries in by_outlet.items()
+        ))
+        return results
+
+# Ejemplo de uso:
+"""
+from sourcesv1 import MEDIA_OUTLETS, CONSULTAS
+
+ingestor = SitemapIngestor(MEDIA_OUTLETS, Path("output"))
+
+async with aiohttp.ClientSession() as session:
+    results = await ingestor.ingest(session, CONSULTAS)
+# ... guardar los resultados ...
+ingestor.save()
+"""
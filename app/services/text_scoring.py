@@ -0,0 +1,217 @@
+import logging
+import math
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..utils.records import RecordBatch
+from ..utils.simhash import tokenize
+
+# Léxico de polaridad en español (sin tildes, como los tokens de tokenize)
+SENTIMENT_LEXICON: Dict[str, float] = {
+    # Positivas
+    'acuerdo': 1.0, 'aprueba': 1.0, 'aprobado': 1.0, 'aumento': 0.5, 'avance': 1.0,
+    'beneficio': 1.0, 'celebra': 1.5, 'crecimiento': 1.0, 'destaca': 0.5, 'exito': 2.0,
+    'exitoso': 2.0, 'favorable': 1.0, 'gana': 1.5, 'ganador': 1.5, 'historico': 0.5,
+    'logra': 1.5, 'logro': 1.5, 'mejor': 1.0, 'mejora': 1.5,
+    'optimismo': 1.5, 'positivo': 1.5, 'premio': 1.5, 'recuperacion': 1.0,
+    'rescate': 1.0, 'solidaridad': 1.5, 'triunfo': 2.0, 'victoria': 2.0,
+    'alivio': 1.0, 'apoyo': 1.0, 'inaugura': 1.0, 'record': 1.0, 'salva': 1.5,
+    # Negativas
+    'accidente': -1.5, 'acusa': -1.0, 'alerta': -1.0, 'asesinato': -2.5, 'ataque': -2.0,
+    'baja': -0.5, 'caida': -1.0, 'catastrofe': -2.5, 'colapso': -2.0, 'conflicto': -1.5,
+    'corrupcion': -2.0, 'crimen': -2.0, 'crisis': -2.0, 'critica': -1.0, 'delito': -1.5,
+    'denuncia': -1.0, 'derrota': -1.5, 'detenido': -1.0, 'emergencia': -1.5,
+    'escandalo': -2.0, 'fallece': -2.0, 'fallecido': -2.0, 'fraude': -2.0, 'grave': -1.5,
+    'herido': -1.5, 'heridos': -1.5, 'homicidio': -2.5, 'incendio': -2.0, 'inflacion': -1.0,
+    'muerte': -2.5, 'muerto': -2.5, 'muertos': -2.5, 'pierde': -1.0, 'polemica': -1.0,
+    'preocupacion': -1.0, 'protesta': -1.0, 'rechaza': -1.0, 'rechazo': -1.0,
+    'riesgo': -1.0, 'robo': -1.5, 'tragedia': -2.5, 'violencia': -2.0, 'victima': -2.0,
+    'victimas': -2.0, 'balacera': -2.5, 'terremoto': -2.0, 'despidos': -1.5
+}
+# Normalización tipo VADER: score / sqrt(score^2 + alpha) queda en [-1, 1]
+SENTIMENT_ALPHA = 15.0
+
+def _numpy():
+    # numpy se importa solo cuando la etapa se usa, para no encarecer el arranque
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError(
+            "La etapa de puntuación de texto requiere numpy (pip install numpy)"
+        ) from e
+    return numpy
+
+class BatchTextScorer:
+    """
+    Calcula keywords y sentiment para todo el lote horario de una vez.
+    Los textos (title, snippet y description de cada registro) se tokenizan
+    en una matriz dispersa de términos (formato COO en arrays de NumPy); el
+    TF-IDF sobre el corpus de la ejecución, la selección de las mejores
+    keywords por documento y el puntaje del léxico se calculan con
+    operaciones vectorizadas, sin bucles por registro.
+    """
+    TEXT_FIELDS = ('title', 'snippet', 'description')
+
+    def __init__(
+        self,
+        top_keywords: int = settings.SCORING_TOP_KEYWORDS,
+        lexicon: Optional[Dict[str, float]] = None,
+        overwrite_keywords: bool = False
+    ):
+        """
+        Args:
+            top_keywords (int): Keywords por registro
+            lexicon (Dict[str, float], optional): Léxico de polaridad
+            overwrite_keywords (bool): Si se reemplazan las keywords ya
+                                       obtenidas del propio artículo
+        """
+        self.logger = logging.getLogger(__name__)
+        self.top_keywords = top_keywords
+        self.lexicon = lexicon if lexicon is not None else SENTIMENT_LEXICON
+        self.overwrite_keywords = overwrite_keywords
+
+    def _matrix(self, documents: List[List[str]]):
+        """
+        Construye la matriz dispersa documento-término.
+
+        Returns:
+            Tuple: (rows, cols, counts, vocabulario) con una entrada por par
+                   (documento, término) distinto
+        """
+        np = _numpy()
+        vocabulary: Dict[str, int] = {}
+        doc_ids: List[int] = []
+        term_ids: List[int] = []
+        for doc_id, tokens in enumerate(documents):
+            for token in tokens:
+                term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+            doc_ids.extend([doc_id] * len(tokens))
+
+        size = max(len(vocabulary), 1)
+        keys = np.asarray(doc_ids, dtype=np.int64) * size + np.asarray(term_ids, dtype=np.int64)
+        keys, counts = np.unique(keys, return_counts=True)
+        return keys // size, keys % size, counts.astype(np.float64), vocabulary
+
+    def score_texts(self, texts: List[str]) -> Tuple[List[List[str]], List[float]]:
+        """
+        Calcula keywords y sentiment de una lista de textos.
+
+        Args:
+            texts (List[str]): Textos del lote
+
+        Returns:
+            Tuple[List[List[str]], List[float]]: Keywords y sentiment por texto
+        """
+        np = _numpy()
+        n_docs = len(texts)
+        if not n_docs:
+            return [], []
+        rows, cols, counts, vocabulary = self._matrix([tokenize(text) for text in texts])
+        if not len(rows):
+            return [[] for _ in texts], [0.0] * n_docs
+        terms = np.array(list(vocabulary), dtype=object)
+
+        # TF-IDF suavizado y normalizado (L2) por documento
+        document_frequency = np.bincount(cols, minlength=len(vocabulary))
+        idf = np.log((1 + n_docs) / (1 + document_frequency)) + 1.0
+        weights = counts * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+        weights = weights / norms[rows]
+
+        # Las mejores keywords de cada documento: orden por (documento, -peso)
+        order = np.lexsort((-weights, rows))
+        sorted_rows = rows[order]
+        starts = np.searchsorted(sorted_rows, np.arange(n_docs))
+        rank = np.arange(len(order)) - starts[sorted_rows]
+        selected = order[rank < self.top_keywords]
+        keywords: List[List[str]] = [[] for _ in range(n_docs)]
+        for doc_id, term in zip(rows[selected].tolist(), terms[cols[selected]].tolist()):
+            keywords[doc_id].append(term)
+
+        # Sentiment: suma de polaridades del léxico, normalizada a [-1, 1]
+        polarity = np.zeros(len(vocabulary))
+        for term, value in self.lexicon.items():
+            term_id = vocabulary.get(term)
+            if term_id is not None:
+                polarity[term_id] = value
+        raw = np.bincount(rows, weights=counts * polarity[cols], minlength=n_docs)
+        sentiment = raw / np.sqrt(raw ** 2 + SENTIMENT_ALPHA)
+        return keywords, np.round(sentiment, 3).tolist()
+
+    def score(self, batch: RecordBatch) -> RecordBatch:
+        """
+        Completa keywords y sentiment de todos los registros del lote.
+
+        Args:
+            batch (RecordBatch): Lote horario (se modifica en su lugar)
+
+        Returns:
+            RecordBatch: El mismo lote con los campos completados
+        """
+        extras = [batch.get_extra(index) for index in range(len(batch))]
+        texts = [
+            ' '.join(str(extra.get(field, '')) for field in self.TEXT_FIELDS)
+            for extra in extras
+        ]
+        start = time.perf_counter()
+        keywords, sentiment = self.score_texts(texts)
+        for index, extra in enumerate(extras):
+            fields = {}
+            if texts[index].strip():
+                fields['sentiment'] = sentiment[index]
+            if keywords[index] and (self.overwrite_keywords or not extra.get('keywords')):
+                fields['keywords'] = ', '.join(keywords[index])
+            if fields:
+                batch.set_extra(index, **fields)
+        self.logger.info(
+            f"Puntuados {len(batch)} registros en {time.perf_counter() - start:.2f}s"
+        )
+        return batch
+
+def benchmark(sizes: Tuple[int, ...] = (100, 1000, 10000, 100000)) -> List[Dict]:
+    """
+    Mide registros por segundo de la etapa para distintos tamaños de lote,
+    con títulos y snippets sintéticos.
+
+    Args:
+        sizes (Tuple[int, ...]): Tamaños de lote
+
+    Returns:
+        List[Dict]: Una fila de métricas por tamaño
+    """
+    rng = random.Random(42)
+    vocabulary = [f"termino{i}" for i in range(5000)] + list(SENTIMENT_LEXICON)
+    scorer = BatchTextScorer()
+    scorer.score_texts(["calentamiento de numpy"])
+    rows = []
+    for size in sizes:
+        texts = [
+            ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(15, 40)))
+            for _ in range(size)
+        ]
+        start = time.perf_counter()
+        scorer.score_texts(texts)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "records": size,
+            "seconds": round(elapsed, 4),
+            "records_per_second": int(size / elapsed) if elapsed else math.inf
+        })
+    return rows
+
+if __name__ == "__main__":
+    sizes = tuple(int(arg) for arg in sys.argv[1:]) or (100, 1000, 10000, 100000)
+    print(f"{'registros':>12}{'seg':>10}{'registros/s':>14}")
+    for row in benchmark(sizes):
+        print(f"{row['records']:>12}{row['seconds']:>10}{row['records_per_second']:>14}")
+
+# Ejemplo de uso:
+"""
+scorer = BatchTextScorer(top_keywords=5)
+scorer.score(batch)  # completa keywords y sentiment de todo el lote
+
+# Benchmark: python -m app.services.text_scoring 100 1000 10000 100000
+"""
@@ -0,0 +1,131 @@
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+# Presupuesto de arranque en frío de "import linkerer" (milisegundos)
+DEFAULT_STARTUP_BUDGET_MS = 150.0
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+@dataclass
+class ImportTiming:
+    """Costo de importación de un módulo según python -X importtime."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+def profile_imports(statement: str = 'import linkerer', python: str = sys.executable) -> List[ImportTiming]:
+    """
+    Ejecuta la sentencia en un intérprete nuevo con -X importtime y retorna
+    el costo de cada módulo importado.
+
+    Args:
+        statement (str): Código a ejecutar (p.ej. "import linkerer")
+        python (str): Intérprete a utilizar
+
+    Returns:
+        List[ImportTiming]: Módulos en el orden en que terminaron de importarse
+    """
+    completed = subprocess.run(
+        [python, '-X', 'importtime', '-c', statement],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Falló '{statement}': {completed.stderr.strip()[-500:]}")
+
+    timings = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            timings.append(ImportTiming(
+                module=match.group(4),
+                self_us=int(match.group(1)),
+                cumulative_us=int(match.group(2)),
+                depth=(len(match.group(3)) - 1) // 2
+            ))
+    return timings
+
+def total_ms(timings: List[ImportTiming]) -> float:
+    """Tiempo total de importación (suma de los costos propios)."""
+    return sum(timing.self_us for timing in timings) / 1000
+
+def measure_startup(statement: str = 'import linkerer', runs: int = 3) -> float:
+    """
+    Mide el tiempo de importación en intérpretes nuevos.
+
+    Args:
+        statement (str): Código a medir
+        runs (int): Repeticiones (se usa la mediana)
+
+    Returns:
+        float: Mediana del tiempo total de importación en milisegundos
+    """
+    return statistics.median(total_ms(profile_imports(statement)) for _ in range(runs))
+
+def report(timings: List[ImportTiming], top: int = 20) -> str:
+    """Tabla con los módulos de mayor costo acumulado."""
+    lines = [f"{'módulo':<50}{'propio ms':>12}{'acumulado ms':>14}"]
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        lines.append(
+            f"{timing.module:<50}{timing.self_us / 1000:>12.1f}{timing.cumulative_us / 1000:>14.1f}"
+        )
+    lines.append(f"{'total':<50}{total_ms(timings):>12.1f}")
+    return '\n'.join(lines)
+
+def check_budget(
+    budget_ms: float = DEFAULT_STARTUP_BUDGET_MS,
+    statement: str = 'import linkerer',
+    runs: int = 3
+) -> bool:
+    """
+    Verifica que el arranque en frío no supere el presupuesto.
+
+    Returns:
+        bool: True si la mediana está dentro del presupuesto
+    """
+    elapsed = measure_startup(statement, runs)
+    within = elapsed <= budget_ms
+    print(
+        f"Arranque de '{statement}': {elapsed:.1f} ms "
+        f"(presupuesto {budget_ms:.0f} ms) - {'OK' if within else 'EXCEDIDO'}"
+    )
+    return within
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Perfil de importaciones del arranque")
+    parser.add_argument('--statement', default='import linkerer', help="Código a medir")
+    parser.add_argument('--top', type=int, default=20, help="Módulos a mostrar")
+    parser.add_argument('--runs', type=int, default=3, help="Repeticiones para el presupuesto")
+    parser.add_argument(
+        '--budget-ms',
+        type=float,
+        default=None,
+        help="Falla (código de salida 1) si la mediana supera este presupuesto"
+    )
+    args = parser.parse_args(argv)
+
+    print(report(profile_imports(args.statement), args.top))
+    if args.budget_ms is not None and not check_budget(args.budget_ms, args.statement, args.runs):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# Ejemplo de uso:
+"""
+# Módulos más costosos al importar linkerer
+python -m app.utils.import_profile --top 15
+
+# Verificación para CI/cron: sale con código 1 si se excede el presupuesto
+python -m app.utils.import_profile --budget-ms 150
+"""
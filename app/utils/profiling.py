@@ -0,0 +1,219 @@
+import asyncio
+import contextlib
+import cProfile
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por el método del rango más cercano (values no vacío)."""
+    ordered = sorted(values)
+    index = min(max(int(round(fraction * len(ordered) + 0.5)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+class LoopLagMonitor:
+    """
+    Mide el retraso de planificación del event loop: una tarea despierta
+    cada interval segundos y registra cuánto tarde llegó respecto de lo
+    pedido. Un retraso alto indica trabajo de CPU (parsing, serialización)
+    bloqueando el loop; las esperas de red o los sleeps no lo producen.
+    """
+    def __init__(self, interval: float = 0.1, max_samples: int = 100_000):
+        """
+        Args:
+            interval (float): Segundos entre muestras
+            max_samples (int): Muestras conservadas (las más recientes)
+        """
+        self.interval = interval
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._sample())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def summary(self) -> Dict[str, float]:
+        """Máximo y percentiles del retraso en milisegundos."""
+        samples = list(self.samples)
+        if not samples:
+            return {"samples": 0, "max_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        return {
+            "samples": len(samples),
+            "max_ms": round(self.max_lag * 1000, 2),
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2)
+        }
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        return (
+            f"Latencia del event loop: máx {summary['max_ms']} ms, "
+            f"p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, "
+            f"p99 {summary['p99_ms']} ms ({summary['samples']} muestras)"
+        )
+
+@dataclass
+class StageStats:
+    """Métricas acumuladas de una etapa perfilada."""
+    calls: int = 0
+    seconds: float = 0.0
+    peak_memory_bytes: int = 0
+
+class StageProfiler:
+    """
+    Perfil de CPU (cProfile) y pico de memoria (tracemalloc) por etapa de
+    la ejecución. Una etapa puede ejecutarse muchas veces y anidarse en
+    otra: el tiempo de CPU se atribuye a la etapa más interna activa,
+    mientras que el pico de memoria de la etapa externa incluye el de las
+    internas. Como cProfile mide el hilo completo, el perfil de una etapa
+    incluye también las corrutinas que corren en el loop mientras está activa.
+    """
+    def __init__(self, output_dir: Path, top_allocations: int = 15):
+        """
+        Args:
+            output_dir (Path): Carpeta de los artefactos
+            top_allocations (int): Líneas con más memoria en el snapshot final
+        """
+        self.output_dir = Path(output_dir)
+        self.top_allocations = top_allocations
+        self.stats: Dict[str, StageStats] = {}
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._stack: List[List] = []
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _update_peak(self) -> None:
+        # El pico actual corresponde a todas las etapas abiertas
+        peak = tracemalloc.get_traced_memory()[1]
+        for name, _ in self._stack:
+            stats = self.stats[name]
+            stats.peak_memory_bytes = max(stats.peak_memory_bytes, peak)
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Perfila el bloque como parte de la etapa name."""
+        stats = self.stats.setdefault(name, StageStats())
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        if self._stack:
+            self._update_peak()
+            self._profiles[self._stack[-1][0]].disable()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        entry = [name, time.perf_counter()]
+        self._stack.append(entry)
+        profile.enable()
+        try:
+            yield
+        finally:
+            # Con etapas en corrutinas concurrentes (p.ej. una etapa del
+            # pipeline) una etapa puede cerrarse sin estar en el tope
+            top = self._stack[-1] is entry
+            if top:
+                profile.disable()
+            if tracemalloc.is_tracing():
+                self._update_peak()
+                tracemalloc.reset_peak()
+            del self._stack[next(i for i, open_entry in enumerate(self._stack) if open_entry is entry)]
+            stats.calls += 1
+            stats.seconds += time.perf_counter() - entry[1]
+            if top and self._stack:
+                self._profiles[self._stack[-1][0]].enable()
+
+    def write(self, loop_lag: Optional[Dict[str, float]] = None) -> Path:
+        """
+        Escribe un archivo .prof (pstats) por etapa y un resumen JSON con
+        duración, pico de memoria, latencia del loop y las líneas que más
+        memoria retienen al final.
+
+        Returns:
+            Path: Ruta del resumen
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for name, profile in self._profiles.items():
+            profile.dump_stats(str(self.output_dir / f"{name}.prof"))
+
+        summary: Dict = {
+            "stages": {name: asdict(stats) for name, stats in self.stats.items()},
+            "loop_lag": loop_lag or {}
+        }
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            summary["top_allocations"] = [
+                {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics('lineno')[:self.top_allocations]
+            ]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+        summary_path = self.output_dir / "profile_summary.json"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        for name, stats in self.stats.items():
+            logger.info(
+                f"Etapa {name}: {stats.calls} llamadas, {stats.seconds:.2f}s, "
+                f"pico de memoria {stats.peak_memory_bytes / 1024 / 1024:.1f} MB"
+            )
+        logger.info(f"Perfil de la ejecución guardado en {self.output_dir}")
+        return summary_path
+
+    @staticmethod
+    def top_functions(profile_path: Path, limit: int = 20) -> str:
+        """Funciones con más tiempo acumulado de un archivo .prof."""
+        import io
+
+        stream = io.StringIO()
+        pstats.Stats(str(profile_path), stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+class NullProfiler:
+    """Perfilador inactivo: las etapas no tienen costo fuera del modo --profile."""
+    def stage(self, name: str):
+        return contextlib.nullcontext()
+
+NULL_PROFILER = NullProfiler()
+
+# Ejemplo de uso:
+"""
+monitor = LoopLagMonitor(interval=0.1)
+monitor.start()
+profiler = StageProfiler(Path("output/profile_20240111_10"))
+profiler.start()
+with profiler.stage("process_sources"):
+    await scraper.process_sources(session, CONSULTAS)
+await monitor.stop()
+profiler.write(monitor.summary())
+
+# Análisis: python -m pstats output/profile_20240111_10/process_sources.prof
+"""
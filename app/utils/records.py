@@ -0,0 +1,173 @@
+import time
+from array import array
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+class SourceRegistry:
+    """
+    Registro de descriptores de fuente (las consultas de generate_consultas).
+    Cada descriptor se guarda una sola vez y los registros lo referencian
+    por un identificador entero.
+    """
+    __slots__ = ('_sources', '_ids')
+
+    def __init__(self):
+        self._sources: List[Dict] = []
+        self._ids: Dict[tuple, int] = {}
+
+    def intern(self, source: Dict) -> int:
+        """
+        Registra un descriptor de fuente y retorna su identificador.
+
+        Args:
+            source (Dict): Metadatos de la fuente
+
+        Returns:
+            int: Identificador del descriptor (el mismo para fuentes iguales)
+        """
+        key = tuple(source.items())
+        source_id = self._ids.get(key)
+        if source_id is None:
+            source_id = len(self._sources)
+            self._sources.append(dict(source))
+            self._ids[key] = source_id
+        return source_id
+
+    def get(self, source_id: int) -> Dict:
+        return self._sources[source_id]
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+# Registro compartido por defecto dentro del proceso
+SOURCE_REGISTRY = SourceRegistry()
+
+class RecordBatch:
+    """
+    Conjunto compacto de resultados. Por cada enlace solo se guarda la URL,
+    el identificador de la fuente y el timestamp (en arrays); los campos
+    opcionales (title, published, ...) se guardan aparte solo para los
+    registros que los tienen. El formato de diccionario legado
+    ({**fuente, "url", "date"}) se genera únicamente al serializar.
+    """
+    __slots__ = ('registry', 'urls', 'source_ids', 'timestamps', 'extras')
+
+    def __init__(self, registry: Optional[SourceRegistry] = None):
+        self.registry = registry or SOURCE_REGISTRY
+        self.urls: List[str] = []
+        self.source_ids = array('I')
+        self.timestamps = array('d')
+        self.extras: Dict[int, Dict] = {}
+
+    def append(self, source_id: int, url: str, timestamp: Optional[float] = None, **extra) -> None:
+        """
+        Agrega un enlace al lote.
+
+        Args:
+            source_id (int): Identificador de la fuente (ver SourceRegistry)
+            url (str): URL del enlace
+            timestamp (float, optional): Momento del descubrimiento (epoch)
+            **extra: Campos adicionales del registro (p.ej. title)
+        """
+        if extra:
+            self.extras[len(self.urls)] = extra
+        self.urls.append(url)
+        self.source_ids.append(source_id)
+        self.timestamps.append(time.time() if timestamp is None else timestamp)
+
+    def add_links(self, source: Dict, links: Iterable[str], timestamp: Optional[float] = None) -> None:
+        """Agrega varios enlaces de una misma fuente con un único timestamp."""
+        source_id = self.registry.intern(source)
+        timestamp = time.time() if timestamp is None else timestamp
+        for url in links:
+            self.append(source_id, url, timestamp)
+
+    def extend(self, other: 'RecordBatch') -> None:
+        """Agrega los registros de otro lote."""
+        if other.registry is self.registry:
+            source_ids = other.source_ids
+        else:
+            source_ids = array('I', (
+                self.registry.intern(other.registry.get(source_id))
+                for source_id in other.source_ids
+            ))
+        offset = len(self.urls)
+        for index, extra in other.extras.items():
+            self.extras[offset + index] = extra
+        self.urls.extend(other.urls)
+        self.source_ids.extend(source_ids)
+        self.timestamps.extend(other.timestamps)
+
+    def filter(self, predicate: Callable[[str], bool]) -> 'RecordBatch':
+        """
+        Retorna un nuevo lote con los registros cuya URL cumple el predicado.
+
+        Args:
+            predicate (Callable[[str], bool]): Función que recibe la URL
+
+        Returns:
+            RecordBatch: Lote filtrado que comparte el mismo registro de fuentes
+        """
+        filtered = RecordBatch(self.registry)
+        for index, url in enumerate(self.urls):
+            if predicate(url):
+                extra = self.extras.get(index)
+                if extra:
+                    filtered.extras[len(filtered.urls)] = extra
+                filtered.urls.append(url)
+                filtered.source_ids.append(self.source_ids[index])
+                filtered.timestamps.append(self.timestamps[index])
+        return filtered
+
+    def get_extra(self, index: int) -> Dict:
+        """Retorna los campos adicionales del registro indicado."""
+        return self.extras.get(index, {})
+
+    def set_extra(self, index: int, **fields) -> None:
+        """Agrega o actualiza campos adicionales del registro indicado."""
+        self.extras[index] = {**self.extras.get(index, {}), **fields}
+
+    def source_of(self, index: int) -> Dict:
+        """Retorna el descriptor de fuente del registro indicado."""
+        return self.registry.get(self.source_ids[index])
+
+    def iter_dicts(self) -> Iterator[Dict]:
+        """
+        Genera los registros en el formato de diccionario legado.
+        Las fechas se formatean una sola vez por segundo distinto.
+        """
+        date_cache: Dict[int, str] = {}
+        for index, url in enumerate(self.urls):
+            second = int(self.timestamps[index])
+            date = date_cache.get(second)
+            if date is None:
+                date = datetime.fromtimestamp(second).strftime(DATE_FORMAT)
+                date_cache[second] = date
+            record = {**self.registry.get(self.source_ids[index]), "url": url, "date": date}
+            extra = self.extras.get(index)
+            if extra:
+                record.update(extra)
+            yield record
+
+    def to_dicts(self) -> List[Dict]:
+        """Expande todo el lote al formato de diccionario legado."""
+        return list(self.iter_dicts())
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.iter_dicts()
+
+# Ejemplo de uso:
+"""
+batch = RecordBatch()
+batch.add_links(query, ["https://www.latercera.com/nacional/noticia/a/"])
+
+for record in batch:  # formato legado {**query, "url": ..., "date": ...}
+    print(record["url"], record["date"])
+
+json.dumps(batch.to_dicts())
+"""
@@ -0,0 +1,113 @@
+import asyncio
+import fcntl
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class RunDeadline:
+    """
+    Plazo total de una ejecución. Reparte el tiempo restante entre las
+    fuentes pendientes y acota las esperas para que la ejecución termine
+    (y entregue lo obtenido) antes de que comience la siguiente.
+    Usa el reloj monotónico del event loop.
+    """
+    def __init__(self, seconds: float, reserve: float = 0.0):
+        """
+        Args:
+            seconds (float): Duración máxima de la ejecución
+            reserve (float): Segundos reservados al final para guardar y entregar
+        """
+        self.loop = asyncio.get_running_loop()
+        self.started = self.loop.time()
+        self.deadline = self.started + max(seconds - reserve, 0.0)
+        self.end = self.started + max(seconds, 0.0)
+
+    def remaining(self) -> float:
+        """Segundos disponibles hasta el plazo."""
+        return max(self.deadline - self.loop.time(), 0.0)
+
+    def remaining_with_reserve(self) -> float:
+        """Segundos hasta el final de la ejecución, incluida la reserva."""
+        return max(self.end - self.loop.time(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return self.loop.time() - self.started
+
+    def share(self, pending: int) -> float:
+        """
+        Tiempo asignable a la próxima fuente.
+
+        Args:
+            pending (int): Fuentes que faltan por procesar (incluida la próxima)
+
+        Returns:
+            float: Parte equitativa del tiempo restante
+        """
+        return self.remaining() / max(pending, 1)
+
+    async def sleep(self, delay: float) -> None:
+        """Espera delay segundos sin sobrepasar el plazo."""
+        await asyncio.sleep(min(delay, self.remaining()))
+
+class RunLockError(RuntimeError):
+    """Otra ejecución mantiene el lock."""
+
+class RunLock:
+    """
+    Lock de ejecución basado en fcntl.flock sobre un archivo. Evita que dos
+    ejecuciones (p.ej. una lenta y la del siguiente cron) se superpongan y
+    compitan por el mismo archivo horario. El sistema operativo libera el
+    lock si el proceso termina abruptamente.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        """
+        Toma el lock sin bloquear.
+
+        Raises:
+            RunLockError: Si otra ejecución lo mantiene
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            holder = os.read(fd, 32).decode(errors='replace').strip()
+            os.close(fd)
+            raise RunLockError(f"Ejecución en curso (pid {holder or '?'}) mantiene {self.path}")
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self) -> 'RunLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+# Ejemplo de uso:
+"""
+with RunLock(Path(RUTA_SALIDA) / ".linkerer.lock"):
+    deadline = RunDeadline(50 * 60, reserve=60)
+    for index, query in enumerate(queries):
+        timeout = deadline.share(len(queries) - index)
+        await asyncio.wait_for(process_source(query), timeout=timeout)
+"""
@@ -0,0 +1,164 @@
+import hashlib
+import re
+import unicodedata
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+FINGERPRINT_BITS = 64
+
+STOPWORDS = frozenset("""
+a al algo ante antes como con contra cual cuando de del desde donde durante e el
+ella ellas ellos en entre era es esa ese eso esta este esto fue ha han hasta hay la
+las le les lo los mas me mi muy no nos o os para pero por que quien se sea segun
+ser si sin sino sobre su sus tambien te tras tu un una uno unos y ya
+""".split())
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def tokenize(text: str) -> List[str]:
+    """
+    Normaliza un texto (minúsculas, sin tildes) y retorna sus palabras
+    significativas, sin stopwords en español.
+
+    Args:
+        text (str): Texto a tokenizar
+
+    Returns:
+        List[str]: Tokens normalizados
+    """
+    normalized = unicodedata.normalize('NFKD', text.lower())
+    normalized = ''.join(char for char in normalized if not unicodedata.combining(char))
+    return [
+        token for token in TOKEN_PATTERN.findall(normalized)
+        if len(token) > 2 and token not in STOPWORDS
+    ]
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(),
+        'little'
+    )
+
+def simhash(tokens: List[str]) -> int:
+    """
+    Calcula el SimHash de 64 bits de una lista de tokens. Usa unigramas y
+    bigramas como features, de modo que el orden de las palabras también
+    aporta a la huella.
+
+    Args:
+        tokens (List[str]): Tokens del texto
+
+    Returns:
+        int: Huella de 64 bits
+    """
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    weights = [0] * FINGERPRINT_BITS
+    for feature in features:
+        value = _hash64(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+class SimHashIndex:
+    """
+    Índice LSH por bandas sobre huellas SimHash con una ventana de tiempo
+    deslizante. La huella se divide en bands bandas; dos huellas a distancia
+    de Hamming menor que bands comparten al menos una banda exacta, por lo
+    que basta comparar contra los elementos de las mismas cubetas.
+    """
+    def __init__(self, max_distance: int = 3, window_seconds: float = 48 * 3600):
+        """
+        Args:
+            max_distance (int): Distancia de Hamming máxima para near-duplicados
+            window_seconds (float): Antigüedad máxima de los elementos del índice
+        """
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self.window_seconds = window_seconds
+        self.buckets: Dict[Tuple[int, int], List[str]] = {}
+        self.items: Dict[str, Tuple[int, float, str]] = {}
+        self.order: Deque[str] = deque()
+
+    def _band_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        mask = (1 << self.band_bits) - 1
+        return [
+            (band, fingerprint >> (band * self.band_bits) & mask)
+            for band in range(self.bands)
+        ]
+
+    def evict(self, now: float) -> None:
+        """Elimina los elementos fuera de la ventana de tiempo."""
+        while self.order:
+            item_id = self.order[0]
+            fingerprint, timestamp, _ = self.items[item_id]
+            if now - timestamp <= self.window_seconds:
+                break
+            self.order.popleft()
+            del self.items[item_id]
+            for key in self._band_keys(fingerprint):
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    bucket.remove(item_id)
+                    if not bucket:
+                        del self.buckets[key]
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """
+        Busca un elemento near-duplicado de la huella.
+
+        Returns:
+            Optional[str]: Identificador canónico del clúster encontrado
+        """
+        best = None
+        for key in self._band_keys(fingerprint):
+            for item_id in self.buckets.get(key, ()):
+                candidate, _, cluster = self.items[item_id]
+                distance = hamming_distance(fingerprint, candidate)
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, cluster)
+        return best[1] if best else None
+
+    def add(self, item_id: str, fingerprint: int, timestamp: float) -> str:
+        """
+        Agrega un elemento y retorna el identificador de su clúster, que es
+        el del primer elemento visto de la noticia dentro de la ventana.
+
+        Args:
+            item_id (str): Identificador del elemento (p.ej. su URL)
+            fingerprint (int): Huella SimHash
+            timestamp (float): Momento del elemento (epoch)
+
+        Returns:
+            str: Identificador canónico del clúster
+        """
+        self.evict(timestamp)
+        if item_id in self.items:
+            return self.items[item_id][2]
+
+        cluster = self.find(fingerprint) or item_id
+        self.insert(item_id, fingerprint, timestamp, cluster)
+        return cluster
+
+    def insert(self, item_id: str, fingerprint: int, timestamp: float, cluster: str) -> None:
+        """Inserta un elemento con su clúster ya conocido (p.ej. al restaurar)."""
+        self.items[item_id] = (fingerprint, timestamp, cluster)
+        self.order.append(item_id)
+        for key in self._band_keys(fingerprint):
+            self.buckets.setdefault(key, []).append(item_id)
+
+# Ejemplo de uso:
+"""
+index = SimHashIndex(max_distance=3)
+cluster = index.add(url, simhash(tokenize(title + " " + snippet)), time.time())
+if cluster != url:
+    print(f"{url} es near-duplicado de {cluster}")
+"""
@@ -1,30 +1,36 @@
 # Mejoras en las importaciones y organización
 from __future__ import annotations  # Para anotaciones de tipo más modernas
-import aiohttp
-import aiofiles
+import argparse
 import asyncio
-import json
 import logging
 import os
 import random
 import re
-from bs4 import BeautifulSoup
+import tempfile
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Literal
-from aiohttp import ClientSession
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Dict, Optional, Literal, Set
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from sourcesv1 import CONSULTAS, RUTA_SALIDA, USER_AGENTS
-
-# Configuración de logging mejorada
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('scraper.log')
-    ]
+import sourcesv1
+from sourcesv1 import RUTA_SALIDA, USER_AGENTS
+from app.services.pipeline import Pipeline, Stage
+from app.services.segment_store import SegmentStore
+from app.services.serializers import (
+    SERIALIZERS, ResultSerializer, ResultWriter, get_serializer, load_records
 )
+from app.services.search_backends import ERROR_429, SEARCH_BACKENDS, SearchFailed, SearchRouter
+from app.services.serp_parser import SerpResult, filter_stale
+from app.utils.records import DATE_FORMAT, RecordBatch
+from app.utils.profiling import NULL_PROFILER, LoopLagMonitor
+from app.utils.run_control import RunDeadline, RunLock, RunLockError
+
+# aiohttp, pydantic-settings y los backends se importan al usarse: el
+# arranque de cada ejecución horaria solo paga lo que realmente utiliza
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
 logger = logging.getLogger(__name__)
 
 # Usando dataclasses para mejor estructura
@@ -39,11 +45,71 @@ class ScraperConfig:
     max_domain_delay: float = 12.0
     api_timeout: int = 30
     api_endpoint: str = 'http://172.16.1.2:5000/shortener/'
+    # Backend de descubrimiento: 'google' (SERP), 'crawler' (portadas de categoría)
+    # 'sitemap' (sitemaps y news sitemaps) o 'feeds' (RSS/Atom)
+    discovery_backend: str = 'google'
+    use_http_cache: bool = True
+    # Formato de salida: json, json-pretty, json.gz, ndjson o ndjson.gz
+    output_format: str = 'json'
+    # Compacta en segundo plano los archivos horarios de días anteriores
+    compact_store: bool = True
+    # Días de historial compactado usados para deduplicar (0 = solo hora anterior)
+    dedupe_window_days: int = 0
+    # Near-duplicados entre medios: 'off', 'mark' (marca near_duplicate_of)
+    # o 'collapse' (descarta las copias)
+    near_duplicates: str = 'mark'
+    # Antigüedad máxima de la fecha mostrada en la SERP (0 = sin filtro)
+    max_result_age_hours: float = 48.0
+    # Descarga los artículos nuevos para completar content_length, keywords,
+    # popularity y subcategory
+    enrich_articles: bool = False
+    # Calcula keywords y sentiment del lote horario completo (requiere numpy)
+    score_text: bool = False
+    # Duración máxima de una ejecución (menor que el intervalo del cron) y
+    # tiempo reservado al final para guardar y entregar los resultados
+    run_deadline_seconds: float = 50 * 60
+    delivery_reserve_seconds: float = 60.0
+    # Motores de búsqueda en orden de preferencia; cada uno tiene su propio
+    # presupuesto de peticiones y el router cambia de motor ante un bloqueo
+    search_backends: List[str] = field(default_factory=lambda: ['google'])
+    duckduckgo_calls_per_second: float = 0.2
+    # URL base por motor (p.ej. servidores de prueba locales)
+    search_base_urls: Dict[str, str] = field(default_factory=dict)
+    # Segundos que un motor bloqueado queda fuera de la rotación
+    search_cooldown_seconds: float = 900.0
+    # Consulta al shortener qué URLs ya acortó y no las vuelve a enviar
+    shortener_check: bool = True
+    # Intervalo de muestreo de la latencia del event loop
+    loop_lag_interval: float = 0.1
+    # Perfil de CPU y memoria por etapa, guardado junto a la salida
+    profile: bool = False
+    # Graba el tráfico HTTP en un cassette .jsonl.gz o reproduce uno sin
+    # red, con las latencias originales y las esperas entre peticiones
+    # divididas por replay_speed
+    record_traffic: Optional[str] = None
+    replay_traffic: Optional[str] = None
+    replay_speed: float = 1.0
+    # Carpeta de salida y estado; None usa RUTA_SALIDA. Una reproducción
+    # sin carpeta propia trabaja en una temporal (ver isolate_replay)
+    output_dir: Optional[str] = None
+    # Ventana de búsqueda desde el último éxito de cada fuente (tbs=qdr:hN)
+    # en lugar del día completo (after:<hoy>)
+    incremental_window: bool = True
+    # Presupuesto de cada motor compartido por todos los procesos del host
+    # (cron superpuestos, API) en lugar de uno por proceso
+    shared_rate_limit: bool = True
+    # Etapas del pipeline (descubrimiento -> dedupe -> near-duplicados ->
+    # enriquecimiento -> guardado -> entrega) conectadas por colas acotadas
+    pipeline_queue_size: int = 4
+    dedupe_workers: int = 2
+    enrich_workers: int = 2
+    delivery_workers: int = 1
+    # Envía cada lote al shortener apenas se guarda, en lugar de un solo
+    # archivo al final de la ejecución
+    stream_delivery: bool = False
 
 # Constantes en mayúsculas y agrupadas
-GOOGLE_ERROR_TERMS = ['unusual traffic', 'captcha']
 SUCCESS_STATUS_CODES = {200, 202}
-ERROR_429 = "ERROR_429"
 
 # Mejora en el manejo de patrones excluidos
 class PatternMatcher:
@@ -83,23 +149,63 @@ pattern_matcher = PatternMatcher([
 ])
 
 class RateLimiter:
+    # Usa el reloj monotónico del event loop: no depende de cambios de hora
+    # del sistema y permite simular ejecuciones en tiempo virtual
     def __init__(self, calls_per_second: float = 1.0):
         self.calls_per_second = calls_per_second
-        self.last_call_time = 0.0
+        self.last_call_time: Optional[float] = None
         self.lock = asyncio.Lock()
 
     async def wait(self) -> None:
         async with self.lock:
-            current_time = datetime.now().timestamp()
-            time_since_last_call = current_time - self.last_call_time
-            if time_since_last_call < 1.0 / self.calls_per_second:
-                await asyncio.sleep(1.0 / self.calls_per_second - time_since_last_call)
-            self.last_call_time = datetime.now().timestamp()
+            loop = asyncio.get_running_loop()
+            if self.last_call_time is not None:
+                time_since_last_call = loop.time() - self.last_call_time
+                if time_since_last_call < 1.0 / self.calls_per_second:
+                    await asyncio.sleep(1.0 / self.calls_per_second - time_since_last_call)
+            self.last_call_time = loop.time()
+
+    def available_in(self) -> float:
+        """Segundos que faltan para que se permita la próxima llamada."""
+        if self.last_call_time is None:
+            return 0.0
+        elapsed = asyncio.get_running_loop().time() - self.last_call_time
+        return max(1.0 / self.calls_per_second - elapsed, 0.0)
 
 class GoogleScraper:
-    def __init__(self, config: ScraperConfig):
+    def __init__(self, config: ScraperConfig, profiler=None, freshness=None):
         self.config = config
-        self.rate_limiter = RateLimiter(config.calls_per_second)
+        self.profiler = profiler or NULL_PROFILER
+        # Marcas de agua por fuente (FreshnessTracker); sin ellas se busca el día completo
+        self.freshness = freshness
+        self.rate_limiter = self._create_rate_limiter('google', config.calls_per_second)
+        self.router = SearchRouter(
+            [self._create_backend(name) for name in config.search_backends],
+            cooldown=config.search_cooldown_seconds
+        )
+
+    def _create_backend(self, name: str):
+        """Crea un motor de búsqueda con su propio presupuesto de peticiones."""
+        if name not in SEARCH_BACKENDS:
+            raise ValueError(f"Motor de búsqueda desconocido: {name}")
+        rate_limiter = (
+            self.rate_limiter if name == 'google'
+            else self._create_rate_limiter(name, getattr(self.config, f'{name}_calls_per_second'))
+        )
+        return SEARCH_BACKENDS[name](
+            rate_limiter,
+            base_url=self.config.search_base_urls.get(name),
+            delay_range=(self.config.min_delay, self.config.max_delay),
+            profiler=self.profiler
+        )
+
+    def _create_rate_limiter(self, name: str, calls_per_second: float):
+        if not self.config.shared_rate_limit:
+            return RateLimiter(calls_per_second)
+        from app.core.config import settings
+        from app.services.rate_limiter import SharedRateLimiter
+
+        return SharedRateLimiter(settings.RATE_LIMIT_STATE_DIR / f'{name}.rl', calls_per_second)
 
     def get_headers(self) -> Dict[str, str]:
         return {
@@ -109,58 +215,47 @@ class GoogleScraper:
             'Connection': 'keep-alive'
         }
 
-    async def fetch_page(
-        self, 
-        session: ClientSession, 
-        url: str, 
-        headers: Dict[str, str]
-    ) -> Optional[str]:
-        try:
-            await asyncio.sleep(random.uniform(self.config.min_delay, self.config.max_delay))
-            async with session.get(url, headers=headers) as response:
-                if response.status == 429:
-                    logger.warning(f"Google bloqueó el acceso (429) para {url}")
-                    return ERROR_429
-                if response.status != 200:
-                    logger.warning(f"Status code {response.status} para {url}")
-                    return None
-                return await response.text()
-        except Exception as err:
-            logger.error(f"Error al solicitar {url}: {err}")
-            return None
-
-    def extract_links(self, html: str, source: str, category: str, page: int) -> List[str]:
-        soup = BeautifulSoup(html, 'html.parser')
-        results = soup.find_all('div', class_='yuRUbf')
-        links = [result.find('a')['href'] for result in results if result.find('a')]
-        
-        if links:
-            logger.info(
-                f"Encontrados {len(links)} enlaces para {source} - "
-                f"Categoría: {category} (página {page + 1})"
-            )
-        return links
+    @staticmethod
+    def clean_link(link: str) -> Optional[str]:
+        clean_link = re.sub(r"(?:\?.*?utm.*|&.*|#.*)", "", link)
+        return None if pattern_matcher.matches(clean_link) else clean_link
 
     @staticmethod
     def clean_links(links: List[str]) -> List[str]:
-        cleaned = []
-        for link in links:
-            clean_link = re.sub(r"(?:\?.*?utm.*|&.*|#.*)", "", link)
-            if not pattern_matcher.matches(clean_link):
-                cleaned.append(clean_link)
-        return list(set(cleaned))
+        cleaned = [GoogleScraper.clean_link(link) for link in links]
+        return list({link for link in cleaned if link})
+
+    @staticmethod
+    def clean_results(results: List[SerpResult]) -> Dict[str, SerpResult]:
+        """Limpia las URLs y conserva el primer resultado de cada URL limpia."""
+        cleaned: Dict[str, SerpResult] = {}
+        for result in results:
+            clean_link = GoogleScraper.clean_link(result.url)
+            if clean_link and clean_link not in cleaned:
+                cleaned[clean_link] = result
+        return cleaned
 
     async def process_source(
         self,
         session: ClientSession,
         query: Dict[str, str]
-    ) -> List[Dict] | Literal["ERROR_429"]:
+    ) -> RecordBatch | Literal["ERROR_429"]:
         """Procesa una fuente individual."""
-        logger.info(f"Procesando fuente: {query['source']} - Categoría: {query['category']}")
+        started_at = time.time()
+        window_hours = self.freshness.window_hours(query, started_at) if self.freshness else None
+        logger.info(
+            f"Procesando fuente: {query['source']} - Categoría: {query['category']}"
+            f"{f' (últimas {window_hours} h)' if window_hours else ''}"
+        )
         all_links = []
+        # La marca de agua solo avanza si todas las páginas respondieron 200
+        complete = True
         
         # Obtener primera página
-        links = await self.fetch_google_links(session, query)
+        try:
+            links = await self.fetch_google_links(session, query, window_hours=window_hours)
+        except SearchFailed:
+            links, complete = [], False
         
         if links == ERROR_429:
             return ERROR_429
@@ -174,59 +269,78 @@ class GoogleScraper:
                     self.config.min_page_delay,
                     self.config.max_page_delay
                 ))
-                links_page2 = await self.fetch_google_links(session, query, page=1)
-                
-                if links_page2 == ERROR_429:
-                    return ERROR_429
+                # La página 2 se pide al mismo motor que entregó la primera
+                try:
+                    links_page2 = await self.fetch_google_links(
+                        session, query, page=1, window_hours=window_hours,
+                        backend=links[0].engine
+                    )
+                except SearchFailed:
+                    # También cubre un bloqueo de la página 2: se conserva la
+                    # primera y la marca de agua no avanza
+                    links_page2, complete = [], False
                     
                 if links_page2:
                     all_links.extend(links_page2)
         
-        clean_links = self.clean_links(all_links)
-        
-        return [{
-            **query,
-            "url": link,
-            "date": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        } for link in clean_links]
+        # Los resultados con fecha antigua se descartan antes de deduplicar
+        if self.config.max_result_age_hours > 0:
+            fresh_links = filter_stale(all_links, timedelta(hours=self.config.max_result_age_hours))
+            if len(fresh_links) < len(all_links):
+                logger.info(
+                    f"Descartados {len(all_links) - len(fresh_links)} resultados antiguos "
+                    f"para {query['source']}"
+                )
+            all_links = fresh_links
+
+        results = RecordBatch()
+        source_id = results.registry.intern(query)
+        timestamp = datetime.now().timestamp()
+        for url, result in self.clean_results(all_links).items():
+            results.append(
+                source_id, url, timestamp,
+                title=result.title,
+                snippet=result.snippet,
+                position=result.position,
+                published=result.published.strftime(DATE_FORMAT) if result.published else ''
+            )
+        if self.freshness is not None and complete:
+            self.freshness.mark_success(query, started_at)
+        return results
 
     async def fetch_google_links(
         self,
         session: ClientSession,
         query: Dict[str, str],
-        page: int = 0
-    ) -> List[str] | Literal["ERROR_429"]:
-        """Realiza una búsqueda en Google y obtiene los enlaces."""
-        await self.rate_limiter.wait()
-
-        start = page * 10
-        url = (
-            f"https://www.google.cl/search?q=site:{query['site']}"
-            f"+after:{datetime.now().strftime('%Y-%m-%d')}"
-            f"+{query['category'].lower()}"
-            f"{'&start=' + str(start) if start > 0 else ''}"
+        page: int = 0,
+        window_hours: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> List[SerpResult] | Literal["ERROR_429"]:
+        """
+        Realiza la búsqueda en el motor disponible (o en backend, si se
+        indica) y obtiene los resultados. Retorna ERROR_429 solo si todos
+        los motores están bloqueados y lanza SearchFailed si la petición no
+        se completó.
+        """
+        return await self.router.search(
+            session, query, page, self.get_headers, window_hours, backend
         )
-        
-        html = await self.fetch_page(session, url, self.get_headers())
-        
-        if html == ERROR_429:
-            return ERROR_429
-        elif html is None:
-            return []
-            
-        if any(term in html.lower() for term in GOOGLE_ERROR_TERMS):
-            logger.warning(f"Google detectó tráfico inusual para {query['source']}")
-            return ERROR_429
-            
-        return self.extract_links(html, query['source'], query['category'], page)
 
     async def process_sources(
         self,
         session: ClientSession,
-        queries: List[Dict]
-    ) -> List[Dict]:
-        """Procesa todas las fuentes de forma secuencial con rate limiting."""
-        all_results = []
+        queries: List[Dict],
+        on_results: Optional[Callable[[RecordBatch], Awaitable[None]]] = None,
+        deadline: Optional[RunDeadline] = None
+    ) -> RecordBatch:
+        """
+        Procesa todas las fuentes de forma secuencial con rate limiting.
+        Si se indica on_results, cada lote se entrega apenas termina su
+        fuente en lugar de acumularse. Con un plazo, cada fuente recibe una
+        parte equitativa del tiempo restante y se cancela si la excede.
+        """
+        all_results = RecordBatch()
+        pending_sources = len(queries)
         
         # Agrupar consultas por dominio base
         domains = {}
@@ -238,79 +352,117 @@ class GoogleScraper:
         
         for domain, domain_queries in domains.items():
             for query in domain_queries:
-                results = await self.process_source(session, query)
+                if deadline is None:
+                    results = await self.process_source(session, query)
+                elif deadline.expired:
+                    logger.warning(
+                        f"Plazo de ejecución agotado; quedan {pending_sources} fuentes sin procesar"
+                    )
+                    return all_results
+                else:
+                    try:
+                        results = await asyncio.wait_for(
+                            self.process_source(session, query),
+                            timeout=deadline.share(pending_sources)
+                        )
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Tiempo asignado agotado para {query['source']}, se omite")
+                        results = None
+                pending_sources -= 1
                 
                 if isinstance(results, str) and results == ERROR_429:
                     logger.warning(
-                        f"Se detectó bloqueo de Google (429) para {domain}. "
+                        f"Todos los motores de búsqueda bloquearon el acceso para {domain}. "
                         "Guardando resultados obtenidos..."
                     )
                     return all_results
                 
                 if results:
-                    all_results.extend(results)
+                    if on_results is not None:
+                        await on_results(results)
+                    else:
+                        all_results.extend(results)
                 
-            await asyncio.sleep(random.uniform(
+            domain_delay = random.uniform(
                 self.config.min_domain_delay,
                 self.config.max_domain_delay
-            ))
+            )
+            if deadline is not None:
+                await deadline.sleep(domain_delay)
+            else:
+                await asyncio.sleep(domain_delay)
         
         return all_results
 
 class ResultsManager:
-    def __init__(self, output_path: Path):
+    def __init__(self, output_path: Path, output_format: str = 'json'):
         self.output_path = Path(output_path)
+        self.serializer = get_serializer(output_format)
+
+    def _filename(self, timestamp: datetime, serializer: Optional[ResultSerializer] = None) -> str:
+        extension = (serializer or self.serializer).extension
+        return f'linkerer_{timestamp.strftime("%Y%m%d_%H")}{extension}'
 
     async def load_previous_results(self) -> List[Dict]:
         current_hour = datetime.now()
         previous_hour = current_hour - timedelta(hours=1)
         
         # Intentar archivo de hora anterior
-        filename = f'linkerer_{previous_hour.strftime("%Y%m%d_%H")}.json'
-        result = await self._try_load_file(filename)
+        result = await self._try_load_hour(previous_hour)
         if result:
             return result
 
         # Si es madrugada, intentar archivo de 23h del día anterior
         if 0 <= current_hour.hour <= 6:
-            filename = f'linkerer_{(current_hour - timedelta(days=1)).strftime("%Y%m%d_23")}.json'
-            result = await self._try_load_file(filename)
+            result = await self._try_load_hour(
+                (current_hour - timedelta(days=1)).replace(hour=23)
+            )
             if result:
                 return result
 
         return []
 
+    async def _try_load_hour(self, timestamp: datetime) -> Optional[List[Dict]]:
+        # El archivo previo puede haberse escrito con cualquier formato
+        for serializer in [self.serializer, *SERIALIZERS.values()]:
+            result = await self._try_load_file(self._filename(timestamp, serializer))
+            if result:
+                return result
+        return None
+
     async def _try_load_file(self, filename: str) -> Optional[List[Dict]]:
         file_path = self.output_path / filename
         if not file_path.exists():
             return None
         
         try:
-            async with aiofiles.open(file_path, 'r') as f:
-                content = await f.read()
-                return json.loads(content)
+            return await asyncio.to_thread(load_records, file_path)
         except Exception as e:
             logger.error(f"Error al cargar {file_path}: {e}")
             return None
 
     @staticmethod
-    def filter_new_results(new_results: List[Dict], previous_results: List[Dict]) -> List[Dict]:
+    def filter_new_results(new_results: RecordBatch, previous_results: List[Dict]) -> RecordBatch:
         previous_urls = {r['url'] for r in previous_results}
-        return [r for r in new_results if r['url'] not in previous_urls]
+        return new_results.filter(lambda url: url not in previous_urls)
 
-    async def save_results(self, results: List[Dict]) -> Optional[Path]:
+    def open_writer(self) -> ResultWriter:
+        """Abre la salida de la hora actual en el formato configurado."""
+        return ResultWriter(
+            self.output_path / self._filename(datetime.now()),
+            self.serializer
+        )
+
+    async def save_results(self, results: RecordBatch) -> Optional[Path]:
         if not results:
             return None
             
-        timestamp = datetime.now().strftime("%Y%m%d_%H")
-        file_path = self.output_path / f'linkerer_{timestamp}.json'
-        
+        writer = self.open_writer()
         try:
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(results, indent=2, ensure_ascii=False))
-            return file_path
+            await writer.append(results)
+            return await writer.commit()
         except Exception as e:
+            writer.abort()
             logger.error(f"Error al guardar resultados: {e}")
             return None
 
@@ -324,7 +476,9 @@ async def send_to_api(
         return False
         
     try:
-        data = aiohttp.FormData()
+        from aiohttp import FormData
+
+        data = FormData()
         data.add_field('file', 
                       open(file_path, 'rb'),
                       filename=file_path.name)
@@ -350,39 +504,595 @@ async def send_to_api(
         logger.error(f"Error al intentar enviar al shortener: {str(e)}")
         return False
 
-async def main():
-    """Función principal mejorada."""
-    config = ScraperConfig()
-    scraper = GoogleScraper(config)
-    results_manager = ResultsManager(Path(RUTA_SALIDA))
+async def run_backend(
+    session: ClientSession,
+    scraper: GoogleScraper,
+    config: ScraperConfig,
+    on_results: Callable[[RecordBatch], Awaitable[None]],
+    deadline: Optional[RunDeadline] = None,
+    checkpoints: Optional[List[Callable[[], None]]] = None
+) -> None:
+    """
+    Obtiene los enlaces nuevos usando el backend de descubrimiento configurado
+    y entrega a on_results el lote de cada fuente o medio apenas termina,
+    para que un corte por plazo conserve lo ya descubierto. El estado del
+    backend (validadores, marcas de agua) se registra en checkpoints para
+    guardarlo después de confirmar los resultados.
+    """
+    checkpoints = checkpoints if checkpoints is not None else []
+    if config.discovery_backend == 'crawler':
+        from app.services.category_crawler import CategoryCrawler
+
+        crawler = CategoryCrawler(
+            sourcesv1.MEDIA_OUTLETS,
+            output_path(config) / 'crawler_validators.json'
+        )
+        checkpoints.append(crawler.save)
+        await crawler.crawl(session, sourcesv1.CONSULTAS, on_results)
+        return
+
+    if config.discovery_backend == 'sitemap':
+        from app.services.sitemap_ingestor import SitemapIngestor
+
+        ingestor = SitemapIngestor(sourcesv1.MEDIA_OUTLETS, output_path(config))
+        checkpoints.append(ingestor.save)
+        await ingestor.ingest(session, sourcesv1.CONSULTAS, on_results)
+        return
+
+    if config.discovery_backend == 'feeds':
+        from app.services.feed_ingestor import FeedIngestor
+
+        ingestor = FeedIngestor(sourcesv1.MEDIA_OUTLETS, output_path(config))
+        checkpoints.append(ingestor.save)
+        await ingestor.ingest(session, sourcesv1.CONSULTAS, on_results)
+        return
+
+    await scraper.process_sources(session, sourcesv1.CONSULTAS, on_results, deadline)
+
+async def discover_links(
+    session: ClientSession,
+    scraper: GoogleScraper,
+    config: ScraperConfig,
+    on_results: Callable[[RecordBatch], Awaitable[None]],
+    deadline: Optional[RunDeadline] = None,
+    checkpoints: Optional[List[Callable[[], None]]] = None
+) -> None:
+    """
+    Ejecuta el backend de descubrimiento. Los backends que leen los sitios
+    directamente pasan por la caché HTTP persistente; las páginas de
+    resultados de Google no son cacheables y van directo a la sesión.
+    """
+    if config.discovery_backend == 'google' or not config.use_http_cache:
+        return await run_backend(session, scraper, config, on_results, deadline, checkpoints)
 
+    from app.services.http_cache import CachedSession, HttpCacheStore
+
+    cached_session = CachedSession(session, HttpCacheStore(output_path(config) / 'http_cache'))
     try:
-        # Inicializar el cliente HTTP con timeout y reintentos
-        timeout = aiohttp.ClientTimeout(total=30)
-        connector = aiohttp.TCPConnector(ssl=False, limit=10)
-        
-        async with aiohttp.ClientSession(
-            connector=connector,
-            timeout=timeout,
-            raise_for_status=True
-        ) as session:
-            results = await scraper.process_sources(session, CONSULTAS)
+        return await run_backend(cached_session, scraper, config, on_results, deadline, checkpoints)
+    finally:
+        await cached_session.close()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Linkerer: descubrimiento de noticias")
+    parser.add_argument(
+        '--backend',
+        choices=['google', 'crawler', 'sitemap', 'feeds'],
+        default=ScraperConfig.discovery_backend,
+        help="Backend de descubrimiento de enlaces"
+    )
+    parser.add_argument(
+        '--no-http-cache',
+        action='store_true',
+        help="Desactiva la caché HTTP persistente de los backends directos"
+    )
+    parser.add_argument(
+        '--no-compact',
+        action='store_true',
+        help="No compactar los archivos horarios antiguos en esta ejecución"
+    )
+    parser.add_argument(
+        '--dedupe-days',
+        type=int,
+        default=ScraperConfig.dedupe_window_days,
+        help="Días del almacén compactado usados para descartar URLs ya vistas"
+    )
+    parser.add_argument(
+        '--format',
+        choices=list(SERIALIZERS),
+        default=ScraperConfig.output_format,
+        help="Formato del archivo de salida"
+    )
+    parser.add_argument(
+        '--near-duplicates',
+        choices=['off', 'mark', 'collapse'],
+        default=ScraperConfig.near_duplicates,
+        help="Marca o descarta las noticias repetidas entre medios"
+    )
+    parser.add_argument(
+        '--max-age-hours',
+        type=float,
+        default=ScraperConfig.max_result_age_hours,
+        help="Descarta resultados de Google con fecha más antigua (0 = sin filtro)"
+    )
+    parser.add_argument(
+        '--enrich',
+        action='store_true',
+        help="Descarga los artículos nuevos para completar sus metadatos"
+    )
+    parser.add_argument(
+        '--score',
+        action='store_true',
+        help="Calcula keywords y sentiment del lote completo (requiere numpy)"
+    )
+    parser.add_argument(
+        '--deadline-minutes',
+        type=float,
+        default=ScraperConfig.run_deadline_seconds / 60,
+        help="Duración máxima de la ejecución; al agotarse se entregan los resultados parciales"
+    )
+    parser.add_argument(
+        '--search-backends',
+        type=lambda value: [name.strip() for name in value.split(',') if name.strip()],
+        default=['google'],
+        help=f"Motores de búsqueda separados por coma, en orden de preferencia ({', '.join(SEARCH_BACKENDS)})"
+    )
+    parser.add_argument(
+        '--no-shortener-check',
+        action='store_true',
+        help="No consultar al shortener qué URLs ya acortó antes de enviar"
+    )
+    parser.add_argument(
+        '--full-day',
+        action='store_true',
+        help="Busca todo el día (after:<hoy>) en lugar de la ventana desde el último éxito"
+    )
+    parser.add_argument(
+        '--stream-delivery',
+        action='store_true',
+        help="Envía cada lote al shortener apenas se guarda en lugar de un archivo al final"
+    )
+    parser.add_argument(
+        '--pipeline-queue-size',
+        type=int,
+        default=ScraperConfig.pipeline_queue_size,
+        help="Lotes en espera por etapa antes de frenar el descubrimiento"
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help="Simula la ejecución en tiempo virtual y reporta si cabe en la ventana, sin ejecutarla"
+    )
+    parser.add_argument(
+        '--plan-window-minutes',
+        type=float,
+        default=60.0,
+        help="Ventana disponible para la planificación"
+    )
+    parser.add_argument(
+        '--no-shared-rate-limit',
+        action='store_true',
+        help="Usa un presupuesto de peticiones propio del proceso en lugar del compartido del host"
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="Guarda perfiles de CPU y memoria por etapa junto a la salida"
+    )
+    parser.add_argument(
+        '--record',
+        nargs='?',
+        const=str(Path(RUTA_SALIDA) / f'traffic_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jsonl.gz'),
+        default=None,
+        help="Graba las peticiones y respuestas HTTP en un cassette .jsonl.gz"
+    )
+    parser.add_argument(
+        '--replay',
+        default=None,
+        help="Reproduce un cassette grabado sin red, con salida y estado en una carpeta temporal"
+    )
+    parser.add_argument(
+        '--replay-speed',
+        type=float,
+        default=ScraperConfig.replay_speed,
+        help="Divide las latencias grabadas y las esperas entre peticiones (0 = sin esperas)"
+    )
+    parser.add_argument(
+        '--log-level',
+        default=None,
+        help="Nivel de logging (por defecto LOG_LEVEL de la configuración)"
+    )
+    parser.add_argument(
+        '--log-json',
+        action='store_true',
+        help="Escribe los logs en JSON, un registro por línea"
+    )
+    return parser.parse_args()
+
+def output_path(config: ScraperConfig) -> Path:
+    """Carpeta donde la ejecución lee y escribe resultados y estado."""
+    return Path(config.output_dir or RUTA_SALIDA)
+
+def isolate_replay(config: ScraperConfig) -> ScraperConfig:
+    """
+    Aísla una reproducción de la carpeta de producción: salida y estado
+    van a una carpeta temporal, sin limitador compartido ni compactación.
+    Las URLs de la hora anterior, las marcas de agua, las URLs conocidas
+    por el almacén y la caché del shortener se toman del cassette.
+    """
+    if not config.replay_traffic or config.output_dir is not None:
+        return config
+    scratch = tempfile.mkdtemp(prefix='linkerer_replay_')
+    logger.info(f"Reproducción aislada en {scratch}")
+    return replace(
+        config,
+        output_dir=scratch,
+        shared_rate_limit=False,
+        compact_store=False
+    )
+
+def replay_pacing(config: ScraperConfig) -> ScraperConfig:
+    """
+    Acelera con replay_speed las esperas entre peticiones de una
+    reproducción (presupuesto de cada motor y delays entre peticiones,
+    páginas y dominios), igual que las latencias grabadas; con
+    replay_speed=0 no hay esperas.
+    """
+    if not config.replay_traffic:
+        return config
+    speed = config.replay_speed
+
+    def scaled(seconds: float) -> float:
+        return seconds / speed if speed > 0 else 0.0
+
+    def scaled_rate(calls_per_second: float) -> float:
+        return calls_per_second * speed if speed > 0 else float('inf')
+
+    return replace(
+        config,
+        calls_per_second=scaled_rate(config.calls_per_second),
+        duckduckgo_calls_per_second=scaled_rate(config.duckduckgo_calls_per_second),
+        min_delay=scaled(config.min_delay),
+        max_delay=scaled(config.max_delay),
+        min_page_delay=scaled(config.min_page_delay),
+        max_page_delay=scaled(config.max_page_delay),
+        min_domain_delay=scaled(config.min_domain_delay),
+        max_domain_delay=scaled(config.max_domain_delay)
+    )
+
+async def compact_store(output_dir: Path) -> None:
+    """Compacta los archivos horarios antiguos en segmentos diarios."""
+    try:
+        await asyncio.to_thread(SegmentStore(output_dir).compact)
+    except Exception:
+        logger.exception("Error al compactar el almacén de resultados")
+
+@asynccontextmanager
+async def open_session(config: ScraperConfig):
+    """
+    Abre la sesión HTTP de la ejecución: el cliente compartido, el mismo
+    cliente grabando el tráfico, o la reproducción de un cassette.
+    """
+    if config.replay_traffic:
+        from app.services.http_replay import ReplaySession
+
+        async with ReplaySession(Path(config.replay_traffic), config.replay_speed) as session:
+            yield session
+        return
+
+    from app.services.http_client import create_http_client
+
+    # Cliente HTTP compartido (límites por host, caché DNS, keep-alive)
+    async with create_http_client() as client:
+        if not config.record_traffic:
+            yield client
+            return
+        from app.services.http_replay import RecordingSession
+
+        session = RecordingSession(client, Path(config.record_traffic))
+        try:
+            yield session
+        finally:
+            await session.close()
+
+def plan_capacity(config: ScraperConfig, window_minutes: float = 60.0, trials: int = 20) -> str:
+    """
+    Simula la ejecución del catálogo actual con la lógica de planificación
+    real (limitador, esperas, segunda página) en tiempo virtual y reporta si
+    cabe en la ventana.
+
+    Args:
+        config (ScraperConfig): Configuración a evaluar
+        window_minutes (float): Ventana disponible para la ejecución
+        trials (int): Ejecuciones simuladas
+
+    Returns:
+        str: Reporte con duración, peticiones, holgura y recomendaciones
+    """
+    from app.services.capacity_planner import format_report, plan, required_rate
+
+    queries = sourcesv1.CONSULTAS
+    window_seconds = window_minutes * 60
+
+    def plan_for_rate(calls_per_second: float):
+        # El presupuesto compartido usa el reloj real: se simula uno por proceso
+        rated = replace(config, calls_per_second=calls_per_second, shared_rate_limit=False)
+        return plan(lambda: GoogleScraper(rated), queries, window_seconds, trials)
+
+    result = plan_for_rate(config.calls_per_second)
+    rate = None if result.fits else required_rate(plan_for_rate)
+    return format_report(result, config.calls_per_second, rate)
+
+async def main(config: Optional[ScraperConfig] = None):
+    """
+    Función principal mejorada. Toma el lock de ejecución para que una
+    ejecución lenta no se superponga con la del siguiente cron.
+    """
+    config = isolate_replay(config or ScraperConfig())
+    # La carpeta de salida ya no se crea al importar sourcesv1
+    output_path(config).mkdir(parents=True, exist_ok=True)
+    lock = RunLock(output_path(config) / '.linkerer.lock')
+    try:
+        lock.acquire()
+    except RunLockError as e:
+        logger.warning(f"{e}; se omite esta ejecución")
+        return
+    try:
+        await run(config)
+    finally:
+        lock.release()
+
+async def run(config: ScraperConfig) -> None:
+    """Ejecuta descubrimiento, guardado y entrega dentro del plazo configurado."""
+    from app.services.near_duplicates import NearDuplicateDetector
+
+    config = replay_pacing(isolate_replay(config))
+    output_dir = output_path(config)
+
+    profiler = NULL_PROFILER
+    if config.profile:
+        from app.utils.profiling import StageProfiler
+        profiler = StageProfiler(
+            output_dir / f'profile_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+        )
+        profiler.start()
+    lag_monitor = LoopLagMonitor(config.loop_lag_interval)
+    lag_monitor.start()
+    freshness = None
+    if config.incremental_window and config.discovery_backend == 'google':
+        from app.services.freshness import FreshnessTracker
+        freshness = FreshnessTracker(output_dir / 'freshness.json')
+    scraper = GoogleScraper(config, profiler, freshness)
+    results_manager = ResultsManager(output_dir, config.output_format)
+    store = SegmentStore(output_dir) if config.dedupe_window_days > 0 else None
+    compaction = asyncio.create_task(compact_store(output_dir)) if config.compact_store else None
+    detector = NearDuplicateDetector(
+        output_dir / 'near_duplicates.json',
+        config.near_duplicates
+    )
+    enricher = None
+    if config.enrich_articles:
+        from app.services.article_enricher import ArticleEnricher
+        enricher = ArticleEnricher(output_dir / 'enriched_articles.json')
+    scorer = None
+    if config.score_text:
+        from app.services.text_scoring import BatchTextScorer
+        scorer = BatchTextScorer()
+    lookup = None
+    if config.shortener_check:
+        from app.services.shortener_lookup import KnownUrlCache, ShortenerLookup
+        lookup = ShortenerLookup(
+            config.api_endpoint,
+            KnownUrlCache(output_dir / 'shortener_known.json')
+        )
+    deadline = RunDeadline(config.run_deadline_seconds, config.delivery_reserve_seconds)
+    # Estado de descubrimiento (marcas de agua, validadores) que solo se
+    # guarda cuando los resultados ya están confirmados
+    checkpoints: List[Callable[[], None]] = []
+    if freshness is not None:
+        checkpoints.append(freshness.save)
+
+    try:
+        async with open_session(config) as session:
+            if config.replay_traffic:
+                # El estado local que condiciona las peticiones se fija al grabado
+                previous_urls = set(session.meta.get('previous_urls', []))
+                store_known: Set[str] = set(session.meta.get('store_known', []))
+                if freshness is not None:
+                    freshness.marks = dict(session.meta.get('freshness', {}))
+                if lookup is not None:
+                    lookup.cache.add(session.meta.get('shortener_known', []))
+            else:
+                previous_urls = {
+                    r['url'] for r in await results_manager.load_previous_results()
+                }
+                # URLs descartadas por el almacén (se graban en el cassette)
+                store_known = set()
+                if config.record_traffic:
+                    session.record_meta('previous_urls', sorted(previous_urls))
+                    if freshness is not None:
+                        session.record_meta('freshness', freshness.marks)
+                    if lookup is not None:
+                        session.record_meta('shortener_known', lookup.cache.urls())
+            writer = results_manager.open_writer()
+            # Con puntuación de texto el lote se acumula para procesarlo completo
+            pending = RecordBatch()
+            found = 0
+            stream_delivery = config.stream_delivery and scorer is None
+            if config.stream_delivery and scorer is not None:
+                logger.warning(
+                    "La puntuación de texto necesita el lote completo; "
+                    "se entrega un solo archivo al final"
+                )
+            delivery = {"records": 0, "files": 0}
+            # Los lotes ya están en el archivo de la hora: si no se reenvían,
+            # la próxima ejecución los descarta como vistos
+            undelivered = RecordBatch()
+            # Lotes guardados que la etapa deliver aún no procesa
+            unsent: Dict[int, RecordBatch] = {}
+
+            async def dedupe(results: RecordBatch) -> RecordBatch:
+                new_results = results.filter(lambda url: url not in previous_urls)
+                if store is not None and new_results:
+                    if config.replay_traffic:
+                        # El almacén de la carpeta temporal está vacío: se usa
+                        # el resultado grabado para repetir las mismas consultas
+                        known_urls = store_known
+                    else:
+                        known_urls = await asyncio.to_thread(
+                            store.known_urls,
+                            new_results.urls,
+                            start=datetime.now() - timedelta(days=config.dedupe_window_days)
+                        )
+                        if config.record_traffic:
+                            store_known.update(known_urls)
+                    new_results = new_results.filter(lambda url: url not in known_urls)
+                if lookup is not None and new_results:
+                    new_results = await lookup.filter(session, new_results)
+                return new_results
+
+            async def enrich(results: RecordBatch) -> RecordBatch:
+                return await enricher.enrich(session, results)
+
+            async def persist(results: RecordBatch) -> Optional[RecordBatch]:
+                if scorer is not None:
+                    pending.extend(results)
+                    return None
+                with profiler.stage('save_results'):
+                    await writer.append(results)
+                if stream_delivery:
+                    unsent[id(results)] = results
+                return results
+
+            async def deliver_chunk(results: RecordBatch) -> bool:
+                # Mismo formato que el envío de fin de ejecución
+                delivery["files"] += 1
+                chunk = ResultWriter(
+                    output_dir / 'deliveries' /
+                    f'linkerer_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{delivery["files"]:04d}'
+                    f'{results_manager.serializer.extension}',
+                    results_manager.serializer
+                )
+                await chunk.append(results)
+                chunk_file = await chunk.commit()
+                if chunk_file and await send_to_api(session, chunk_file, config):
+                    delivery["records"] += len(results)
+                    return True
+                logger.error(f"No se pudo entregar el lote {chunk.path.name} al shortener")
+                return False
+
+            async def deliver(results: RecordBatch) -> None:
+                if not await deliver_chunk(results):
+                    undelivered.extend(results)
+                unsent.pop(id(results), None)
+
+            stages = [
+                Stage('dedupe', dedupe, config.dedupe_workers, config.pipeline_queue_size),
+                # Las etapas con estado usan un solo worker
+                Stage('near_duplicates', detector.process, 1, config.pipeline_queue_size)
+            ]
+            if enricher is not None:
+                stages.append(Stage('enrich', enrich, config.enrich_workers, config.pipeline_queue_size))
+            stages.append(Stage('persist', persist, 1, config.pipeline_queue_size))
+            if stream_delivery:
+                stages.append(Stage('deliver', deliver, config.delivery_workers, config.pipeline_queue_size))
+            pipeline = Pipeline(stages)
+
+            async def collect(results: RecordBatch) -> None:
+                # Cada lote entra al pipeline apenas termina su fuente; si las
+                # etapas se atrasan, put frena el descubrimiento
+                nonlocal found
+                found += len(results)
+                if results:
+                    await pipeline.put(results)
+
+            pipeline.start()
+            # El estado de descubrimiento solo se guarda si el descubrimiento
+            # terminó: tras un corte por plazo, las páginas ya revalidadas
+            # darían 304 en la próxima ejecución y sus enlaces se perderían
+            discovery_complete = False
+            drained = True
+            try:
+                try:
+                    with profiler.stage('process_sources'):
+                        await asyncio.wait_for(
+                            discover_links(session, scraper, config, collect, deadline, checkpoints),
+                            timeout=deadline.remaining()
+                        )
+                    discovery_complete = True
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Plazo de ejecución agotado tras {deadline.elapsed():.0f}s; "
+                        "se guardan y entregan los resultados parciales"
+                    )
+                # Los lotes ya descubiertos terminan de recorrer las etapas,
+                # dentro de la reserva para guardar y entregar
+                try:
+                    await asyncio.wait_for(pipeline.close(), timeout=deadline.remaining_with_reserve())
+                except asyncio.TimeoutError:
+                    drained = False
+                    pipeline.cancel()
+                    for batch in unsent.values():
+                        undelivered.extend(batch)
+                    logger.warning(
+                        "Reserva de entrega agotada; se confirman los lotes ya guardados "
+                        "y se descarta el resto"
+                    )
+                with profiler.stage('save_results'):
+                    if scorer is not None and pending:
+                        await asyncio.to_thread(scorer.score, pending)
+                        await writer.append(pending)
+            except BaseException:
+                pipeline.cancel()
+                writer.abort()
+                raise
+            if config.record_traffic and store is not None:
+                session.record_meta('store_known', sorted(store_known))
+            if lookup is not None:
+                lookup.save()
             
-            if not results:
+            # Sin resultados nuevos no hay nada que perder al avanzar las
+            # marcas; con resultados se guardan después de confirmar el
+            # archivo. Si el pipeline no alcanzó a vaciarse, hay lotes
+            # descubiertos que no se guardaron y las marcas no avanzan
+            complete = discovery_complete and drained
+            if complete and (not found or not writer.count):
+                for checkpoint in checkpoints:
+                    checkpoint()
+
+            if not found:
+                writer.abort()
                 logger.info("No se encontraron resultados")
                 return
 
-            previous_results = await results_manager.load_previous_results()
-            filtered_results = results_manager.filter_new_results(results, previous_results)
-
-            if not filtered_results:
+            if not writer.count:
+                writer.abort()
                 logger.info("No hay nuevos resultados únicos")
                 return
 
-            if output_file := await results_manager.save_results(filtered_results):
+            with profiler.stage('save_results'):
+                output_file = await writer.commit()
+            detector.save()
+            if output_file and complete:
+                for checkpoint in checkpoints:
+                    checkpoint()
+            if enricher is not None:
+                enricher.save()
+            if output_file and stream_delivery:
+                # Los lotes que fallaron se reintentan juntos en un último envío
+                if undelivered and not await deliver_chunk(undelivered):
+                    logger.error(
+                        f"{len(undelivered)} resultados quedaron sin entregar al shortener "
+                        f"(guardados en {output_file.name})"
+                    )
+                logger.info(
+                    f"Proceso completado. {delivery['records']} nuevos resultados "
+                    f"entregados al shortener en {delivery['files']} envíos"
+                )
+            elif output_file:
                 if await send_to_api(session, output_file, config):
                     logger.info(
-                        f"Proceso completado. {len(filtered_results)} nuevos "
+                        f"Proceso completado. {writer.count} nuevos "
                         "resultados enviados al shortener"
                     )
                 else:
@@ -390,6 +1100,47 @@ async def main():
 
     except Exception as e:
         logger.exception("Error en la ejecución principal")
+    finally:
+        if compaction is not None:
+            await compaction
+        await lag_monitor.stop()
+        logger.info(lag_monitor.format_summary())
+        if config.profile:
+            profiler.write(lag_monitor.summary())
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    # Logging encolado: la escritura a disco ocurre fuera del event loop
+    from app.core.logging import setup_logging
+    from app.core.config import settings
+
+    setup_logging(
+        level=args.log_level or settings.LOG_LEVEL,
+        json_format=args.log_json or settings.LOG_JSON
+    )
+    config = ScraperConfig(
+        discovery_backend=args.backend,
+        use_http_cache=not args.no_http_cache,
+        output_format=args.format,
+        compact_store=not args.no_compact,
+        dedupe_window_days=args.dedupe_days,
+        near_duplicates=args.near_duplicates,
+        max_result_age_hours=args.max_age_hours,
+        enrich_articles=args.enrich,
+        score_text=args.score,
+        run_deadline_seconds=args.deadline_minutes * 60,
+        search_backends=args.search_backends,
+        shortener_check=not args.no_shortener_check,
+        profile=args.profile,
+        record_traffic=args.record,
+        replay_traffic=args.replay,
+        replay_speed=args.replay_speed,
+        incremental_window=not args.full_day,
+        shared_rate_limit=not args.no_shared_rate_limit,
+        stream_delivery=args.stream_delivery,
+        pipeline_queue_size=args.pipeline_queue_size
+    )
+    if args.plan:
+        print(plan_capacity(config, args.plan_window_minutes))
+    else:
+        asyncio.run(main(config))
@@ -1,13 +1,22 @@
 import os
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from enum import Enum
+from collections import defaultdict
 import json
 from pathlib import Path
+from urllib.parse import urlparse
 
-# Configuración de la carpeta de salida
+# Configuración de la carpeta de salida (se crea al escribir, no al importar)
 RUTA_SALIDA = "/home/globoscx/data/linkerer"
-os.makedirs(RUTA_SALIDA, exist_ok=True)
+
+# Catálogo de medios; se puede reemplazar con la variable LINKERER_SOURCES
+RUTA_CATALOGO = Path(os.environ.get(
+    "LINKERER_SOURCES", Path(__file__).resolve().parent / "sources.json"
+))
+# Versión del formato compilado; la clave de la caché también incluye este
+# módulo, por lo que un cambio de código invalida las cachés existentes
+CATALOG_CACHE_VERSION = 2
 
 # Definir los User-Agents
 USER_AGENTS = [
@@ -32,314 +41,296 @@ class MediaOutlet:
     update_frequency: str
     base_url: str
     category_paths: Dict[NewsCategory, str]
+    # Selector CSS para extraer artículos desde la portada de cada categoría.
+    # Si es None se usan todos los enlaces bajo la ruta de la categoría.
+    link_selector: Optional[str] = None
+    # Sitemaps explícitos; si está vacío se buscan en robots.txt o /sitemap.xml
+    sitemap_urls: List[str] = field(default_factory=list)
+    # Feeds RSS/Atom explícitos; si está vacío se autodescubren
+    feed_urls: List[str] = field(default_factory=list)
 
-# Definir los medios y sus rutas por categoría
-MEDIA_OUTLETS = {
-    "latercera": MediaOutlet(
-        name="La Tercera",
-        diminutive="LT",
-        holding="COPESA",
-        update_frequency="hourly",
-        base_url="https://www.latercera.com",
-        category_paths={
-            NewsCategory.NACIONAL: "/nacional/noticia/",
-            NewsCategory.DEPORTES: "/el-deportivo/noticia/",
-        }
-    ),
-    "biobio": MediaOutlet(
-        name="Radio BioBio",
-        diminutive="RBB",
-        holding="Bío-Bío Comunicaciones",
-        update_frequency="hourly",
-        base_url="https://www.biobiochile.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/noticias/nacional/",
-            NewsCategory.DEPORTES: "/noticias/deportes/",
-        }
-    ),
-    "emol": MediaOutlet(
-        name="EMOL",
-        diminutive="EMOL",
-        holding="El Mercurio S.A.P.",
-        update_frequency="hourly",
-        base_url="https://www.emol.com",
-        category_paths={
-            NewsCategory.NACIONAL: "/noticias/Nacional/",
-            NewsCategory.DEPORTES: "/noticias/Deportes/",
-        }
-    ),
-    "eldesconcierto": MediaOutlet(
-        name="El Desconcierto",
-        diminutive="ELDS",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://www.eldesconcierto.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/nacional/",
-        }
-    ),
-    "eldinamo": MediaOutlet(
-        name="El Dinamo",
-        diminutive="ELDI",
-        holding="Independiente*",
-        update_frequency="daily",
-        base_url="https://www.eldinamo.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/pais/",
-            NewsCategory.DEPORTES: "/deportes/",
-        }
-    ),
-    "elciudadano": MediaOutlet(
-        name="El Ciudadano",
-        diminutive="ELCI",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://www.elciudadano.com",
-        category_paths={
-            NewsCategory.NACIONAL: "/actualidad/",
-        }
-    ),
-    "cambio21": MediaOutlet(
-        name="Cambio21",
-        diminutive="C21",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://cambio21.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/politica",
-        }
-    ),
-    "df": MediaOutlet(
-        name="Diario Financiero",
-        diminutive="DF",
-        holding="Grupo Claro",
-        update_frequency="daily",
-        base_url="https://www.df.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/mercados/",
-        }
-    ),
-    "chilevision": MediaOutlet(
-        name="Chilevision",
-        diminutive="CHV",
-        holding="Paramount Global",
-        update_frequency="hourly",
-        base_url="https://www.chilevision.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/noticias/nacional/",
-            NewsCategory.DEPORTES: "/chv-deportes/noticias/",
-        }
-    ),
-    "24horas": MediaOutlet(
-        name="24 Horas",
-        diminutive="24H",
-        holding="TVN",
-        update_frequency="hourly",
-        base_url="https://www.24horas.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/actualidad/nacional/",
-            NewsCategory.DEPORTES: "/deportes/",
-        }
-    ),
-    "cooperativa": MediaOutlet(
-        name="Cooperativa",
-        diminutive="Coop",
-        holding="Independiente",
-        update_frequency="hourly",
-        base_url="https://www.cooperativa.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/noticias/pais/",
-        }
-    ),
-    "cnnchile": MediaOutlet(
-        name="CNN Chile",
-        diminutive="CNN",
-        holding="CNN",
-        update_frequency="hourly",
-        base_url="https://www.cnnchile.com",
-        category_paths={
-            NewsCategory.NACIONAL: "/pais/",
-            NewsCategory.DEPORTES: "/deportes/",
-        }
-    ),
-    "t13": MediaOutlet(
-        name="Teletrece",
-        diminutive="T13",
-        holding="TV Medios",
-        update_frequency="hourly",
-        base_url="https://www.t13.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/noticia/nacional/",
-        }
-    ),
-    "elmostrador": MediaOutlet(
-        name="El Mostrador",
-        diminutive="ELMO",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://www.elmostrador.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/noticias/pais/",
-        }
-    ),
-    "publimetro": MediaOutlet(
-        name="Publimetro",
-        diminutive="PM",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://www.publimetro.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/noticias/",
-            NewsCategory.DEPORTES: "/deportes/",
-        }
-    ),
-    "meganoticias": MediaOutlet(
-        name="Meganoticias",
-        diminutive="MEGA",
-        holding="Megamedia",
-        update_frequency="daily",
-        base_url="https://www.meganoticias.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/nacional/",
-            NewsCategory.DEPORTES: "/deportes/",
-        }
-    ),
-    "adn": MediaOutlet(
-        name="ADN",
-        diminutive="ADN",
-        holding="Ibero Americana Radio Chile",
-        update_frequency="hourly",
-        base_url="https://www.adnradio.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/noticias/",
-        }
-    ),
-    "exante": MediaOutlet(
-        name="EX-ANTE",
-        diminutive="EX",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://www.ex-ante.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/",
-        }
-    ),
-    "alaire": MediaOutlet(
-        name="Al Aire Libre",
-        diminutive="AAL",
-        holding="Compañía Chilena de Comunicaciones",
-        update_frequency="daily",
-        base_url="https://www.alairelibre.cl",
-        category_paths={
-            NewsCategory.DEPORTES: "/noticias/deportes/",
-        }
-    ),
-    "ellibero": MediaOutlet(
-        name="El Libero",
-        diminutive="LIBERO",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://ellibero.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/actualidad/",
-        }
-    ),
-    "puranoticia": MediaOutlet(
-        name="Puranoticia",
-        diminutive="Puranoticia",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://puranoticia.pnt.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/nacional/",
-        }
-    ),
-    "diariousach": MediaOutlet(
-        name="Diario USACH",
-        diminutive="USACH",
-        holding="Independiente",
-        update_frequency="daily",
-        base_url="https://www.diariousach.cl",
-        category_paths={
-            NewsCategory.NACIONAL: "/actualidad/nacional",
-        }
-    ),
-}
+def build_consulta(outlet: MediaOutlet, category: NewsCategory) -> Dict:
+    """
+    Construye la consulta (metadatos de fuente) de un medio para una categoría.
+    Todos los backends de descubrimiento emiten registros con esta forma.
+    """
+    return {
+        "category": category.value.capitalize(),
+        "site": outlet.base_url + outlet.category_paths[category],
+        "source": f"{outlet.name}{' ' + category.value.capitalize() if category != NewsCategory.NACIONAL else ''}",
+        "diminutive": outlet.diminutive,
+        "content_length": "",
+        "sentiment": "",
+        "keywords": "",
+        "popularity": "",
+        "subcategory": "",
+        "holding": outlet.holding,
+        "update_frequency": outlet.update_frequency,
+        "content_type": "article"
+    }
 
-def generate_consultas(categories: List[NewsCategory] = None) -> List[Dict]:
+def generate_consultas(
+    categories: List[NewsCategory] = None,
+    media_outlets: Optional[Dict[str, MediaOutlet]] = None
+) -> List[Dict]:
     """
     Genera la lista de consultas basada en los medios y categorías especificadas.
     """
     if categories is None:
         categories = list(NewsCategory)
+    if media_outlets is None:
+        media_outlets = get_catalog().outlets
 
     consultas = []
-    for outlet in MEDIA_OUTLETS.values():
+    for outlet in media_outlets.values():
         for category in categories:
             if category in outlet.category_paths:
-                consultas.append({
-                    "category": category.value.capitalize(),
-                    "site": outlet.base_url + outlet.category_paths[category],
-                    "source": f"{outlet.name}{' ' + category.value.capitalize() if category != NewsCategory.NACIONAL else ''}",
-                    "diminutive": outlet.diminutive,
-                    "content_length": "",
-                    "sentiment": "",
-                    "keywords": "",
-                    "popularity": "",
-                    "subcategory": "",
-                    "holding": outlet.holding,
-                    "update_frequency": outlet.update_frequency,
-                    "content_type": "article"
-                })
+                consultas.append(build_consulta(outlet, category))
     
     return consultas
 
+class CatalogError(ValueError):
+    """El catálogo de medios no es válido."""
+
+def validate_outlet(key: str, data: Dict) -> List[str]:
+    """
+    Valida la definición de un medio del catálogo.
+
+    Args:
+        key (str): Identificador del medio
+        data (Dict): Definición del medio
+
+    Returns:
+        List[str]: Errores encontrados (vacía si es válido)
+    """
+    errors = []
+    for name in ("name", "diminutive", "holding", "update_frequency", "base_url", "category_paths"):
+        if not data.get(name):
+            errors.append(f"{key}: campo {name} vacío")
+    if not str(data.get("base_url", "")).startswith("https://"):
+        errors.append(f"{key}: base_url debe comenzar con https://")
+    if data.get("update_frequency") not in ("hourly", "daily"):
+        errors.append(f"{key}: update_frequency debe ser 'hourly' o 'daily'")
+    categories = {category.value for category in NewsCategory}
+    for category, path in (data.get("category_paths") or {}).items():
+        if category not in categories:
+            errors.append(f"{key}: categoría desconocida '{category}'")
+        if not str(path).startswith("/"):
+            errors.append(f"{key}: la ruta de {category} debe comenzar con /")
+    return errors
+
+class SourceCatalog:
+    """
+    Catálogo compilado de medios: los MediaOutlet validados, sus consultas
+    y los índices por categoría, holding, frecuencia y dominio. Se construye
+    una sola vez desde el archivo de datos y se guarda compilado junto a
+    él, de modo que las ejecuciones siguientes solo leen la caché.
+    """
+    INDEXES = ("by_category", "by_holding", "by_frequency", "by_domain")
+
+    def __init__(self, outlets: Dict[str, MediaOutlet], compiled: Optional[Dict] = None):
+        """
+        Args:
+            outlets (Dict[str, MediaOutlet]): Medios validados
+            compiled (Dict, optional): Consultas e índices ya calculados (caché)
+        """
+        self.outlets = outlets
+        if compiled is not None:
+            self.consultas = compiled["consultas"]
+            for name in self.INDEXES:
+                setattr(self, name, compiled[name])
+            self.holding_names = compiled["holding_names"]
+            return
+        self.consultas = generate_consultas(media_outlets=outlets)
+        self.by_category: Dict[str, List[int]] = defaultdict(list)
+        self.by_holding: Dict[str, List[int]] = defaultdict(list)
+        self.by_frequency: Dict[str, List[int]] = defaultdict(list)
+        self.by_domain: Dict[str, List[int]] = defaultdict(list)
+        self.holding_names: Dict[str, str] = {}
+        for index, consulta in enumerate(self.consultas):
+            holding = consulta["holding"].lower()
+            self.by_category[consulta["category"].lower()].append(index)
+            self.by_holding[holding].append(index)
+            self.holding_names.setdefault(holding, consulta["holding"])
+            self.by_frequency[consulta["update_frequency"]].append(index)
+            self.by_domain[urlparse(consulta["site"]).netloc].append(index)
+        for index in (self.by_category, self.by_holding, self.by_frequency, self.by_domain):
+            index.default_factory = None
+
+    @staticmethod
+    def _build_outlet(outlet: Dict) -> MediaOutlet:
+        return MediaOutlet(
+            name=outlet["name"],
+            diminutive=outlet["diminutive"],
+            holding=outlet["holding"],
+            update_frequency=outlet["update_frequency"],
+            base_url=outlet["base_url"],
+            category_paths={
+                NewsCategory(category): category_path
+                for category, category_path in outlet["category_paths"].items()
+            },
+            link_selector=outlet.get("link_selector"),
+            sitemap_urls=outlet.get("sitemap_urls", []),
+            feed_urls=outlet.get("feed_urls", [])
+        )
+
+    def to_compiled(self) -> Dict:
+        """Forma compilada (solo tipos JSON) del catálogo ya validado."""
+        outlets = {}
+        for key, outlet in self.outlets.items():
+            data = asdict(outlet)
+            data["category_paths"] = {
+                category.value: path for category, path in outlet.category_paths.items()
+            }
+            outlets[key] = data
+        return {
+            "outlets": outlets,
+            "consultas": self.consultas,
+            "holding_names": self.holding_names,
+            **{name: dict(getattr(self, name)) for name in self.INDEXES}
+        }
+
+    @classmethod
+    def from_compiled(cls, compiled: Dict) -> "SourceCatalog":
+        """Reconstruye el catálogo desde su forma compilada, sin revalidar."""
+        outlets = {
+            key: cls._build_outlet(outlet) for key, outlet in compiled["outlets"].items()
+        }
+        return cls(outlets, compiled)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SourceCatalog":
+        """
+        Carga y valida el catálogo desde un archivo JSON.
+
+        Raises:
+            CatalogError: Si alguna definición no es válida
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        errors = []
+        outlets = {}
+        for key, outlet in data.get("outlets", {}).items():
+            outlet_errors = validate_outlet(key, outlet)
+            if outlet_errors:
+                errors.extend(outlet_errors)
+                continue
+            outlets[key] = cls._build_outlet(outlet)
+        if errors:
+            raise CatalogError(f"Catálogo {path} inválido: " + "; ".join(errors))
+        return cls(outlets)
+
+    @classmethod
+    def load(cls, path: Path = RUTA_CATALOGO) -> "SourceCatalog":
+        """
+        Retorna el catálogo compilado, reconstruyéndolo solo si el archivo
+        de datos o este módulo cambiaron desde la última compilación. La
+        caché es JSON (no pickle): leerla nunca ejecuta código.
+
+        Args:
+            path (Path): Archivo JSON del catálogo
+
+        Returns:
+            SourceCatalog: Catálogo validado e indexado
+        """
+        path = Path(path)
+        stat = path.stat()
+        code = Path(__file__).stat()
+        key = [
+            CATALOG_CACHE_VERSION, str(path), stat.st_mtime_ns, stat.st_size,
+            code.st_mtime_ns, code.st_size
+        ]
+        cache_path = path.parent / "__pycache__" / f"{path.stem}.catalog.json"
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["key"] == key:
+                return cls.from_compiled(cached["catalog"])
+        except Exception:
+            pass
+
+        catalog = cls.from_file(path)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "catalog": catalog.to_compiled()}, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Sin permisos de escritura se usa el catálogo sin caché
+            pass
+        return catalog
+
+    def select(self, indexes: List[int]) -> List[Dict]:
+        return [self.consultas[index] for index in indexes]
+
+    def sources_for_domain(self, domain: str) -> List[Dict]:
+        """Consultas de un dominio (p.ej. www.latercera.com)."""
+        return self.select(self.by_domain.get(domain.lower(), []))
+
+_catalog: Optional[SourceCatalog] = None
+
+def get_catalog() -> SourceCatalog:
+    """Retorna el catálogo de medios, cargándolo en el primer uso."""
+    global _catalog
+    if _catalog is None:
+        _catalog = SourceCatalog.load(RUTA_CATALOGO)
+    return _catalog
+
 class NewsSourceManager:
-    def __init__(self, media_outlets: Dict[str, MediaOutlet]):
-        self.media_outlets = media_outlets
-        self.consultas = generate_consultas()
+    def __init__(self, catalog: Optional[SourceCatalog] = None):
+        self.catalog = catalog or get_catalog()
+        self.media_outlets = self.catalog.outlets
+        self.consultas = self.catalog.consultas
         self.path = Path(RUTA_SALIDA)
 
     def get_sources_by_category(self, category: NewsCategory) -> List[Dict]:
         """Obtiene fuentes filtradas por categoría."""
-        return [source for source in self.consultas 
-                if source["category"].lower() == category.value.lower()]
+        return self.catalog.select(self.catalog.by_category.get(category.value.lower(), []))
 
     def get_hourly_sources(self) -> List[Dict]:
         """Obtiene las fuentes que necesitan actualización horaria."""
-        return [source for source in self.consultas 
-                if source["update_frequency"] == "hourly"]
+        return self.catalog.select(self.catalog.by_frequency.get("hourly", []))
 
     def get_independent_sources(self) -> List[Dict]:
         """Obtiene las fuentes independientes."""
-        return [source for source in self.consultas 
-                if "independiente" in source["holding"].lower()]
+        return [
+            consulta
+            for holding, indexes in self.catalog.by_holding.items()
+            if "independiente" in holding
+            for consulta in self.catalog.select(indexes)
+        ]
 
     def get_sources_by_holding(self, holding: str) -> List[Dict]:
         """Obtiene fuentes filtradas por holding."""
-        return [source for source in self.consultas 
-                if source["holding"].lower() == holding.lower()]
+        return self.catalog.select(self.catalog.by_holding.get(holding.lower(), []))
+
+    def get_sources_by_domain(self, domain: str) -> List[Dict]:
+        """Obtiene fuentes filtradas por dominio (p.ej. www.latercera.com)."""
+        return self.catalog.sources_for_domain(domain)
 
     def get_source_stats(self) -> Dict:
         """Obtiene estadísticas detalladas de las fuentes."""
-        categories = set(source["category"] for source in self.consultas)
-        holdings = set(source["holding"] for source in self.consultas)
-        
+        catalog = self.catalog
         return {
             "total_sources": len(self.consultas),
             "categories": {
-                category: len(self.get_sources_by_category(NewsCategory(category.lower())))
-                for category in categories
+                category.capitalize(): len(indexes)
+                for category, indexes in catalog.by_category.items()
             },
             "update_frequency": {
-                "hourly": len(self.get_hourly_sources()),
-                "daily": len([s for s in self.consultas if s["update_frequency"] == "daily"])
+                "hourly": len(catalog.by_frequency.get("hourly", [])),
+                "daily": len(catalog.by_frequency.get("daily", []))
             },
             "holdings": {
-                holding: len(self.get_sources_by_holding(holding))
-                for holding in holdings if holding
+                catalog.holding_names[holding]: len(indexes)
+                for holding, indexes in catalog.by_holding.items() if holding
             },
-            "independent_sources": len(self.get_independent_sources())
+            "independent_sources": sum(
+                len(indexes) for holding, indexes in catalog.by_holding.items()
+                if "independiente" in holding
+            )
         }
 
     def validate_sources(self) -> List[Dict]:
@@ -376,8 +367,15 @@ class NewsSourceManager:
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(stats, f, indent=2, ensure_ascii=False)
 
-# Generar las consultas finales
-CONSULTAS = generate_consultas()
-
-# Crear una instancia global del manager
-source_manager = NewsSourceManager(MEDIA_OUTLETS)
+def __getattr__(name: str):
+    # MEDIA_OUTLETS, CONSULTAS y source_manager se resuelven en el primer
+    # acceso, de modo que importar este módulo no lee archivos
+    if name == "MEDIA_OUTLETS":
+        return get_catalog().outlets
+    if name == "CONSULTAS":
+        return get_catalog().consultas
+    if name == "source_manager":
+        manager = NewsSourceManager(get_catalog())
+        globals()["source_manager"] = manager
+        return manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,10 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.import_profile import DEFAULT_STARTUP_BUDGET_MS, check_budget
+
+def test_cold_start_within_budget():
+    """El arranque en frío de 'import linkerer' no supera el presupuesto."""
+    assert check_budget(DEFAULT_STARTUP_BUDGET_MS, 'import linkerer', runs=3)
@@ -0,0 +1,145 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.search_backends import (
+    ERROR_429, DuckDuckGoBackend, GoogleBackend, SearchFailed, SearchRouter
+)
+
+QUERY = {'source': 'Prueba', 'site': 'https://example.cl/', 'category': 'Nacional'}
+
+class NoLimit:
+    """Presupuesto sin esperas para las pruebas."""
+    async def wait(self) -> None:
+        pass
+
+    def available_in(self) -> float:
+        return 0.0
+
+def google_page(count: int, offset: int) -> str:
+    results = ''.join(
+        f'<div class="g"><div class="yuRUbf"><a href="https://example.cl/g{offset + i}">'
+        f'<h3>Google {offset + i}</h3></a></div></div>'
+        for i in range(count)
+    )
+    return f'<html><body>{results}</body></html>'
+
+def duckduckgo_page(count: int) -> str:
+    results = ''.join(
+        f'<div class="result"><a class="result__a" href="https://example.cl/d{i}">DDG {i}</a></div>'
+        for i in range(count)
+    )
+    return f'<html><body>{results}</body></html>'
+
+async def run_with_stub(google_status, scenario, duckduckgo_status=200):
+    """
+    Levanta un servidor local que imita a Google y DuckDuckGo y ejecuta
+    scenario(router, session). google_status(page) define el status de
+    Google para cada página (200 entrega 10 resultados).
+    """
+    requests = []
+
+    async def google(request):
+        page = int(request.query.get('start', 0)) // 10
+        requests.append(('google', page))
+        status = google_status(page)
+        if status != 200:
+            return web.Response(status=status)
+        return web.Response(text=google_page(10, page * 10), content_type='text/html')
+
+    async def duckduckgo(request):
+        requests.append(('duckduckgo', 0))
+        if duckduckgo_status != 200:
+            return web.Response(status=duckduckgo_status)
+        return web.Response(text=duckduckgo_page(3), content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/search', google)
+    app.router.add_get('/html/', duckduckgo)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    base_url = 'http://127.0.0.1:%d' % runner.addresses[0][1]
+    router = SearchRouter([
+        GoogleBackend(NoLimit(), base_url=base_url),
+        DuckDuckGoBackend(NoLimit(), base_url=base_url),
+    ])
+    try:
+        async with aiohttp.ClientSession() as session:
+            return await scenario(router, session), requests
+    finally:
+        await runner.cleanup()
+
+def test_prefers_first_engine():
+    async def scenario(router, session):
+        return await router.search(session, QUERY)
+
+    results, requests = asyncio.run(run_with_stub(lambda page: 200, scenario))
+    assert len(results) == 10
+    assert {result.engine for result in results} == {'google'}
+    assert requests == [('google', 0)]
+
+def test_block_fails_over_to_next_engine():
+    async def scenario(router, session):
+        first = await router.search(session, QUERY)
+        # Google queda en pausa: la siguiente búsqueda va directo a DuckDuckGo
+        second = await router.search(session, QUERY)
+        return first, second, router.stats
+
+    (first, second, stats), requests = asyncio.run(run_with_stub(lambda page: 429, scenario))
+    assert [result.engine for result in first] == ['duckduckgo'] * 3
+    assert len(second) == 3
+    assert requests == [('google', 0), ('duckduckgo', 0), ('duckduckgo', 0)]
+    assert stats['google']['blocked'] == 1
+
+def test_all_engines_blocked_returns_error_429():
+    async def scenario(router, session):
+        return await router.search(session, QUERY)
+
+    results, requests = asyncio.run(run_with_stub(lambda page: 429, scenario, duckduckgo_status=202))
+    assert results == ERROR_429
+    assert requests == [('google', 0), ('duckduckgo', 0)]
+
+def test_page_two_is_pinned_to_first_engine():
+    async def scenario(router, session):
+        return await router.search(session, QUERY, page=1, backend='google')
+
+    results, requests = asyncio.run(run_with_stub(lambda page: 200, scenario))
+    assert [result.position for result in results][:1] == [11]
+    assert requests == [('google', 1)]
+
+def test_blocked_page_two_keeps_the_run_going():
+    async def scenario(router, session):
+        first = await router.search(session, QUERY)
+        with pytest.raises(SearchFailed):
+            await router.search(session, QUERY, page=1, backend='google')
+        # Con el motor ya en pausa el resultado es el mismo
+        with pytest.raises(SearchFailed):
+            await router.search(session, QUERY, page=1, backend='google')
+        # La primera página sigue disponible en el otro motor
+        return first, await router.search(session, QUERY)
+
+    (first, after), requests = asyncio.run(
+        run_with_stub(lambda page: 429 if page else 200, scenario)
+    )
+    assert len(first) == 10
+    assert [result.engine for result in after] == ['duckduckgo'] * 3
+    assert requests == [('google', 0), ('google', 1), ('duckduckgo', 0)]
+
+def test_failed_fetch_is_not_a_block():
+    async def scenario(router, session):
+        with pytest.raises(SearchFailed):
+            await router.search(session, QUERY)
+        return router.stats
+
+    stats, requests = asyncio.run(run_with_stub(lambda page: 500, scenario))
+    assert stats['google']['failed'] == 1
+    assert stats['google']['blocked'] == 0
+    assert requests == [('google', 0)]
@@ -0,0 +1,95 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.shortener_lookup import KnownUrlCache, ShortenerLookup
+from app.services.shortener_stub import ShortenerStub
+from app.utils.records import RecordBatch
+
+SOURCE = {'source': 'Prueba', 'site': 'https://example.cl/', 'category': 'Nacional'}
+
+def make_batch(urls):
+    batch = RecordBatch()
+    source_id = batch.registry.intern(SOURCE)
+    for url in urls:
+        batch.append(source_id, url)
+    return batch
+
+async def run_with_stub(stub, scenario):
+    """Levanta stub en un puerto libre y ejecuta scenario(api_url, session)."""
+    runner = web.AppRunner(stub.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    api_url = 'http://127.0.0.1:%d/shortener/' % runner.addresses[0][1]
+    try:
+        async with aiohttp.ClientSession() as session:
+            return await scenario(api_url, session)
+    finally:
+        await runner.cleanup()
+
+def test_known_urls_are_dropped():
+    stub = ShortenerStub(known_urls=['https://example.cl/a', 'https://example.cl/c'])
+
+    async def scenario(api_url, session):
+        lookup = ShortenerLookup(api_url, KnownUrlCache())
+        batch = make_batch(['https://example.cl/a', 'https://example.cl/b', 'https://example.cl/c'])
+        return await lookup.filter(session, batch), lookup
+
+    filtered, lookup = asyncio.run(run_with_stub(stub, scenario))
+    assert filtered.urls == ['https://example.cl/b']
+    assert lookup.dropped == 2
+    assert stub.exists_requests == 1
+
+def test_cache_avoids_repeated_queries(tmp_path):
+    stub = ShortenerStub(known_urls=['https://example.cl/a'])
+    cache_path = tmp_path / 'shortener_known.json'
+
+    async def scenario(api_url, session):
+        lookup = ShortenerLookup(api_url, KnownUrlCache(cache_path))
+        await lookup.filter(session, make_batch(['https://example.cl/a', 'https://example.cl/b']))
+        # La URL conocida se responde desde la LRU; solo la nueva se consulta
+        second = await lookup.filter(session, make_batch(['https://example.cl/a', 'https://example.cl/b']))
+        lookup.save()
+        # La caché persiste entre ejecuciones
+        reloaded = ShortenerLookup(api_url, KnownUrlCache(cache_path))
+        third = await reloaded.filter(session, make_batch(['https://example.cl/a']))
+        return lookup, second, third
+
+    lookup, second, third = asyncio.run(run_with_stub(stub, scenario))
+    assert second.urls == ['https://example.cl/b']
+    assert third.urls == []
+    assert lookup.queried == 3
+    assert stub.exists_requests == 2
+
+def test_cache_keeps_only_most_recent_urls():
+    cache = KnownUrlCache(max_size=2)
+    cache.add(['https://example.cl/a', 'https://example.cl/b'])
+    assert 'https://example.cl/a' in cache
+    cache.add(['https://example.cl/c'])
+    assert cache.urls() == ['https://example.cl/a', 'https://example.cl/c']
+
+def test_missing_endpoint_disables_the_check():
+    # El stub expone el API en otra ruta: /shortener/exists responde 404
+    stub = ShortenerStub(known_urls=['https://example.cl/a'], prefix='/otro')
+
+    async def scenario(api_url, session):
+        lookup = ShortenerLookup(api_url, KnownUrlCache(), batch_size=1)
+        batch = make_batch(['https://example.cl/a', 'https://example.cl/b'])
+        first = await lookup.filter(session, batch)
+        second = await lookup.filter(session, batch)
+        return first, second, lookup
+
+    first, second, lookup = asyncio.run(run_with_stub(stub, scenario))
+    assert not lookup.enabled
+    # Sin consulta no se pierde ningún resultado
+    assert first.urls == ['https://example.cl/a', 'https://example.cl/b']
+    assert second.urls == first.urls
+    # Solo se intentó el primer lote: después del 404 no se consulta más
+    assert lookup.queried == 1
+    assert stub.exists_requests == 0